@@ -6,19 +6,37 @@ Rich, Elegant, and Modern UI with Advanced AI Recommendations
 import os
 import gc
 import json
+import hashlib
 import logging
 import warnings
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, g, Response
 import pandas as pd
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.decomposition import TruncatedSVD
 from datetime import datetime
 import threading
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+import random
 import time
 
+from utils.snapshot import ModelSnapshot
+from utils.filter_index import CatalogFilterIndex
+from utils.scoring import l2_normalize_rows, cosine_scores, cosine_scores_batch, top_k_indices
+from utils.ann_index import IVFIndex
+from utils.memory import (resident_memory_mb, frame_memory_mb, array_memory_mb, memory_sharing_mb,
+                          reset_peak_memory, peak_memory_mb)
+from utils.serialize import CatalogSerializer, FastJSONProvider, catalog_ids
+from utils.cache import create_cache, make_cache_key
+from utils.query_embedding import QueryEmbedder
+from utils.trending import TrendingRankings
+from utils.search_index import InvertedIndex
+from utils.autocomplete import TitleAutocomplete
+from utils.fuzzy import FuzzyTitleMatcher
+from utils.drift import CatalogDrift
+from utils.quantization import QuantizedEmbeddings
+from utils.neighbors import ItemNeighbors
+from utils.metrics import REGISTRY, STAGE_SECONDS, StageTimer, CONTENT_TYPE as METRICS_CONTENT_TYPE
+
 # Suppress warnings for cleaner output
 warnings.filterwarnings('ignore')
 
@@ -31,11 +49,71 @@ app = Flask(__name__)
 app.config['SECRET_KEY'] = 'nextflix-ai-ultra-modern-2024'
 app.config['JSON_SORT_KEYS'] = False
 app.config['JSONIFY_PRETTYPRINT_REGULAR'] = False
+app.json = FastJSONProvider(app)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 class UltraModernRecommendationEngine:
     """Ultra Modern AI Recommendation Engine with Rich Performance"""
     
-    def __init__(self):
+    # Optimized parameters for large datasets
+    TFIDF_PARAMS = {
+        'max_features': 5000,  # Reduced for better performance
+        'stop_words': 'english',
+        'ngram_range': (1, 2),
+        'min_df': 3,  # Increased to reduce noise
+        'max_df': 0.7  # Reduced to filter common words
+    }
+    # Smaller components for better performance
+    SVD_COMPONENTS = {'movie': 300, 'tv': 200}
+    SVD_RANDOM_STATE = 42
+    MAX_ITEMS = 10000  # Optimized for performance while maintaining quality
+    # Raw columns needed to build the ML content string, dropped after fitting
+    CONTENT_SOURCE_COLUMNS = ['overview', 'genres', 'spoken_languages', 'production_countries']
+    CSV_CHUNK_SIZE = 50000
+    # Explicit dtypes for streamed CSV columns, so chunks never fall back to type inference
+    CSV_DTYPES = {
+        'id': 'Int64', 'title': str, 'name': str, 'overview': str, 'genres': str,
+        'spoken_languages': str, 'production_countries': str, 'original_language': 'category',
+        'runtime': np.float32, 'certification': str, 'vote_average': np.float64,
+        'vote_count': np.float64, 'popularity': np.float64, 'release_date': str,
+        'first_air_date': str, 'poster_path': str
+    }
+    DATE_FORMAT = '%Y-%m-%d'  # TMDB release and first-air dates
+    # Sampled mode prefers titles at or above these ratings
+    QUALITY_MIN_VOTE_AVERAGE = 6.0
+    QUALITY_MIN_VOTE_COUNT = 20
+    # BM25 field weights for full-text search
+    SEARCH_FIELDS = {'title': 3.0, 'name': 3.0, 'overview': 1.0, 'genres': 1.5}
+    FUZZY_MIN_RESULTS = 3  # Fewer exact hits than this adds typo-tolerant title matches
+    # Approximate search retrieves a similarity pool that is re-ranked with the rich scores
+    ANN_CANDIDATES = 200
+    ANN_MIN_FILTERED = 5000  # Smaller filtered sets are scored exactly
+    # Int8 scores select this many candidates for exact float re-ranking
+    RERANK_CANDIDATES = 200
+    # Seconds a multi-content-type request waits before returning partial results
+    REQUEST_DEADLINE = float(os.environ.get('NEXTFLIX_REQUEST_DEADLINE', '5.0'))
+    # Threads running per-content-type pipelines for all concurrent requests of one process;
+    # sized for two pipelines per request thread plus pipelines abandoned at the deadline
+    PIPELINE_THREADS = int(os.environ.get('NEXTFLIX_PIPELINE_THREADS', '32'))
+    # Readiness: clients are asked to retry after this many seconds while loading
+    RETRY_AFTER = 5
+    LOAD_RETRY_INTERVAL = 60  # Seconds before a failed load is attempted again
+    LOAD_MAX_ATTEMPTS = 3  # Loads attempted before the engine stays failed until restarted
+    COLD_START_PICKS = 60  # Random-pick pool size in the cold-start payload
+    # Upper bound on the similarity block scored at once by the batch API (elements)
+    BATCH_BLOCK_SIZE = 16 * 1024 * 1024
+    # "More like this" neighbours precomputed per title and stored with the snapshot
+    SIMILAR_NEIGHBORS = int(os.environ.get('NEXTFLIX_SIMILAR_NEIGHBORS', '32'))
+    # Catalog columns read back from the snapshot for serving
+    CATALOG_COLUMNS = [
+        'id', 'title', 'name', 'overview', 'genres', 'original_language', 'runtime',
+        'certification', 'rating', 'vote_average', 'vote_count', 'popularity',
+        'release_date', 'first_air_date', 'release_year', 'poster_path'
+    ]
+    
+    def __init__(self, snapshot_dir=None, data_dir=None):
+        self.data_dir = data_dir or os.environ.get('NEXTFLIX_DATA_DIR', os.path.join(BASE_DIR, 'data'))
         self.movies_df = None
         self.tv_df = None
         self.movie_tfidf_matrix = None
@@ -44,14 +122,144 @@ class UltraModernRecommendationEngine:
         self.tv_vectorizer = None
         self.movie_svd = None
         self.tv_svd = None
+        # Serving-time query projection; scikit-learn is only imported to fit
+        self.query_embedders = {}
         self.is_loaded = False
         self.load_lock = threading.Lock()
-        self.cache = {}
+        # NEXTFLIX_CACHE_BACKEND=sqlite shares results between all workers on the host
+        self.cache = create_cache(
+            backend=os.environ.get('NEXTFLIX_CACHE_BACKEND', 'memory'),
+            path=os.environ.get('NEXTFLIX_CACHE_PATH', os.path.join(BASE_DIR, 'data', 'cache', 'results.sqlite3')),
+            max_entries=int(os.environ.get('NEXTFLIX_CACHE_ENTRIES', '1000')),
+            max_bytes=int(os.environ.get('NEXTFLIX_CACHE_MB', '64')) * 1024 * 1024,
+            ttl=int(os.environ.get('NEXTFLIX_CACHE_TTL', '1800'))  # 30 minutes cache
+        )
         self.last_cleanup = time.time()
         self.executor = ThreadPoolExecutor(max_workers=4)
+        # Request pipelines get their own pool, so they never queue behind loading work or a small pool
+        self.pipeline_executor = ThreadPoolExecutor(max_workers=self.PIPELINE_THREADS, thread_name_prefix='pipeline')
+        self.snapshot = ModelSnapshot(
+            snapshot_dir or os.environ.get('NEXTFLIX_SNAPSHOT_DIR', os.path.join(BASE_DIR, 'data', 'snapshot'))
+        )
+        self.model_fingerprint = None
+        self.model_sources = None
+        self.filter_indexes = {}
+        self.item_embeddings = {}
+        self.serializers = {}
+        self.ann_indexes = {}
+        self.neighbors = {}
+        self.trending = {}
+        self.quality_boosts = {}
+        self.search_indexes = {}
+        self.autocomplete = {}
+        self.fuzzy_matchers = {}
+        self.ann_enabled = os.environ.get('NEXTFLIX_ANN', '0') == '1'
+        self.ann_n_probe = int(os.environ.get('NEXTFLIX_ANN_NPROBE', '8'))
+        # Serving embedding storage: float64, float32 or int8 codes with float re-ranking
+        self.embedding_precision = os.environ.get('NEXTFLIX_EMBEDDING_PRECISION', 'float32')
+        # Full-catalog mode keeps every row instead of sampling MAX_ITEMS
+        self.full_catalog = os.environ.get('NEXTFLIX_FULL_CATALOG', '0') == '1'
+        self.load_stats = {}
+        # Incremental ingest: appends are serialized and bump the catalog version
+        self.ingest_lock = threading.Lock()
+        self.catalog_version = 0
+        # Content hash of the served catalog; workers share the cache but each ingests on its own
+        self.catalog_digest = None
+        self.drift = {}
+        # Staged readiness, driven by a single background loader thread
+        self.loader_lock = threading.Lock()
+        self.loader_thread = None
+        self.load_progress = {'state': 'idle', 'stage': None, 'stages': {}, 'error': None, 'failed_at': None,
+                              'attempts': 0}
+        # Neighbour lists missing from an older snapshot are built by their own thread, after readiness
+        self.neighbor_thread = None
+        self.neighbor_progress = {'state': 'idle', 'error': None, 'failed_at': None}
+        # Small real-data payload served before the model is ready
+        self.cold_start = self.snapshot.load_cold_start()
+        # Under a preloading server the model is loaded once and workers are forked from it
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
         
         logger.info("🎬 Ultra Modern Recommendation Engine initialized")
 
+    def _reset_after_fork(self):
+        """Replace the threads and locks a forked worker inherits but cannot use"""
+        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.pipeline_executor = ThreadPoolExecutor(max_workers=self.PIPELINE_THREADS, thread_name_prefix='pipeline')
+        self.load_lock = threading.Lock()
+        self.loader_lock = threading.Lock()
+        self.ingest_lock = threading.Lock()
+        self.loader_thread = None
+        self.neighbor_thread = None
+        if self.neighbor_progress['state'] == 'building':
+            # The builder did not survive the fork; the next /api/similar request restarts it
+            self.neighbor_progress['state'] = 'idle'
+
+    def start_background_load(self):
+        """Start the single background loader unless it is running, done or backing off"""
+        with self.loader_lock:
+            if self.is_loaded or (self.loader_thread is not None and self.loader_thread.is_alive()):
+                return False
+            if self.load_progress['state'] == 'failed' and self.reload_in() != 0:
+                return False
+            self.loader_thread = threading.Thread(target=self._background_load, name='nextflix-loader', daemon=True)
+            self.loader_thread.start()
+            return True
+
+    def _background_load(self):
+        try:
+            logger.info("🔄 Loading recommendation engine in background...")
+            self.load_data_optimized()
+            logger.info("✅ Recommendation engine loaded successfully!")
+        except Exception as e:
+            logger.warning(f"⚠️ Background load failed, serving the cold-start payload: {str(e)}")
+
+    @contextmanager
+    def _load_stage(self, name):
+        """Record the duration, peak RSS and throughput of one loading stage for readiness reporting"""
+        self.load_progress['stage'] = name
+        stats = {}
+        reset_peak_memory()
+        start_time = time.time()
+        logger.info(f"⏳ Loading stage: {name}")
+        # The stage sets stats['rows'] to the rows it processed
+        yield stats
+        elapsed = time.time() - start_time
+        stats['seconds'] = round(elapsed, 3)
+        stats['peak_rss_mb'] = round(peak_memory_mb() or 0, 1)
+        if 'rows' in stats:
+            stats['rows_per_sec'] = round(stats['rows'] / elapsed) if elapsed > 0 else None
+        self.load_progress['stages'][name] = stats
+        logger.info(f"⏱️ Stage {name} took {stats['seconds']}s, peak RSS {stats['peak_rss_mb']} MB"
+                    + (f", {stats['rows_per_sec']} rows/s" if stats.get('rows_per_sec') else ''))
+
+    def readiness(self):
+        """Current load state, stage and per-stage timings"""
+        progress = dict(self.load_progress, stages=dict(self.load_progress['stages']))
+        progress['ready'] = self.is_loaded
+        progress['cold_start_available'] = self.cold_start is not None
+        progress['neighbors'] = dict(self.neighbor_progress)
+        if progress['state'] == 'failed':
+            # None once the engine has given up; a restart is needed
+            progress['reload_in'] = self.reload_in()
+        return progress
+
+    def reload_in(self):
+        """Seconds until a failed load may be retried, or None once every attempt has failed"""
+        if self.load_progress['attempts'] >= self.LOAD_MAX_ATTEMPTS:
+            return None
+        failed_at = self.load_progress['failed_at']
+        if failed_at is None:
+            return 0
+        return max(0, int(self.LOAD_RETRY_INTERVAL - (time.time() - failed_at)))
+
+    def retry_after(self):
+        """Seconds a client should wait before retrying a request that needs the model, None if it never will load"""
+        if self.load_progress['state'] != 'failed':
+            return self.RETRY_AFTER
+        reload_in = self.reload_in()
+        return None if reload_in is None else max(self.RETRY_AFTER, reload_in)
+
     def memory_cleanup(self):
         """Intelligent memory cleanup for optimal performance"""
         current_time = time.time()
@@ -59,14 +267,12 @@ class UltraModernRecommendationEngine:
             gc.collect()
             self.last_cleanup = current_time
             
-            # Clear old cache entries
-            if len(self.cache) > 1000:
-                sorted_cache = sorted(self.cache.items(), key=lambda x: x[1].get('timestamp', 0))
-                self.cache = dict(sorted_cache[-500:])
+            # The cache bounds itself; only expired entries need sweeping
+            self.cache.purge_expired()
             
             logger.info("✨ Memory optimization completed")
 
-    def load_data_optimized(self):
+    def load_data_optimized(self, use_snapshot=True):
         """Load and preprocess data with ultra performance optimization"""
         if self.is_loaded:
             return
@@ -78,46 +284,47 @@ class UltraModernRecommendationEngine:
             try:
                 logger.info("🚀 Loading datasets with performance optimization...")
                 start_time = time.time()
+                self.load_progress.update(state='loading', stage=None, stages={}, error=None,
+                                          attempts=self.load_progress['attempts'] + 1)
                 
-                # Load datasets with fallback paths
-                datasets_found = False
-                base_dir = os.path.dirname(os.path.abspath(__file__))
-                possible_paths = [
-                    (os.path.join(base_dir, 'data', 'TMDB_all_movies.csv'), 
-                     os.path.join(base_dir, 'data', 'TMDB_tv_dataset_v3.csv')),
-                    (os.path.join(base_dir, 'data', 'tmdb_movies_dataset.csv'), 
-                     os.path.join(base_dir, 'data', 'tmdb_tv_series_dataset.csv')),
-                    (os.path.join(base_dir, 'data', 'movies.csv'), 
-                     os.path.join(base_dir, 'data', 'tv_shows.csv'))
-                ]
+                dataset_paths = self._find_dataset_paths()
                 
-                for movies_path, tv_path in possible_paths:
-                    if os.path.exists(movies_path) and os.path.exists(tv_path):
-                        self.movies_df = pd.read_csv(movies_path, low_memory=False)
-                        self.tv_df = pd.read_csv(tv_path, low_memory=False)
-                        datasets_found = True
-                        logger.info(f"📊 Loaded datasets from {movies_path} and {tv_path}")
-                        break
+                if dataset_paths is not None:
+                    self.model_sources = self.snapshot.describe_sources(dataset_paths)
+                    self.model_fingerprint = self.snapshot.fingerprint(self.model_sources, self._model_params())
                 
-                if not datasets_found:
+                if use_snapshot and self.model_fingerprint and self.snapshot.is_valid(self.model_fingerprint):
+                    with self._load_stage('snapshot') as stage:
+                        self._load_snapshot()
+                        stage['rows'] = len(self.movies_df) + len(self.tv_df)
+                elif use_snapshot and dataset_paths is None and self.snapshot.current_dir():
+                    logger.warning("⚠️ Dataset files not found, serving the last published model snapshot")
+                    with self._load_stage('snapshot') as stage:
+                        self._load_snapshot()
+                        stage['rows'] = len(self.movies_df) + len(self.tv_df)
+                elif dataset_paths is None:
                     raise FileNotFoundError("Dataset files not found. Please run download_data.py first.")
+                else:
+                    self._fit_model(*dataset_paths)
                 
-                logger.info(f"🎯 Loaded {len(self.movies_df)} movies and {len(self.tv_df)} TV shows")
-                
-                # Optimize datasets in parallel
-                movie_future = self.executor.submit(self._optimize_dataset, self.movies_df, 'movie')
-                tv_future = self.executor.submit(self._optimize_dataset, self.tv_df, 'tv')
-                
-                self.movies_df = movie_future.result()
-                self.tv_df = tv_future.result()
+                with self._load_stage('indexes') as stage:
+                    self._build_serving_indexes()
+                    stage['rows'] = len(self.movies_df) + len(self.tv_df)
+                self.catalog_digest = self._catalog_digest()
                 
-                # Create TF-IDF matrices with optimization
-                self._create_tfidf_matrices()
+                # Written by build_snapshot.py; an O(N^2) build never holds up readiness
+                if self.has_neighbors():
+                    self.neighbor_progress.update(state='ready', error=None, failed_at=None)
+                else:
+                    logger.warning("⚠️ Model has no neighbour lists, /api/similar is unavailable until they are "
+                                   "built in the background - rebuild the snapshot with build_snapshot.py")
+                self._report_memory()
                 
-                # SVD dimensionality reduction for faster similarity computation
-                self._apply_svd_reduction()
+                if self.cold_start is None:
+                    self.save_cold_start()
                 
                 self.is_loaded = True
+                self.load_progress.update(state='ready', stage=None, failed_at=None)
                 load_time = time.time() - start_time
                 logger.info(f"⚡ Dataset loading completed in {load_time:.2f} seconds")
                 
@@ -125,23 +332,541 @@ class UltraModernRecommendationEngine:
                 self.memory_cleanup()
                 
             except Exception as e:
+                self.load_progress.update(state='failed', error=str(e), failed_at=time.time())
                 logger.error(f"❌ Error loading data: {str(e)}")
                 raise
 
-    def _optimize_dataset(self, df, content_type):
-        """Optimize dataset for rich performance with intelligent sampling"""
-        df = df.copy()
+    def warm_start_available(self):
+        """Whether load_data_optimized would restore a published snapshot rather than fit from the datasets"""
+        dataset_paths = self._find_dataset_paths()
+        if dataset_paths is None:
+            return self.snapshot.current_dir() is not None
+        sources = self.snapshot.describe_sources(dataset_paths)
+        return self.snapshot.is_valid(self.snapshot.fingerprint(sources, self._model_params()))
+
+    def _find_dataset_paths(self):
+        """Locate the movie and TV datasets using fallback paths"""
+        possible_paths = [
+            (os.path.join(self.data_dir, 'TMDB_all_movies.csv'), 
+             os.path.join(self.data_dir, 'TMDB_tv_dataset_v3.csv')),
+            (os.path.join(self.data_dir, 'tmdb_movies_dataset.csv'), 
+             os.path.join(self.data_dir, 'tmdb_tv_series_dataset.csv')),
+            (os.path.join(self.data_dir, 'movies.csv'), 
+             os.path.join(self.data_dir, 'tv_shows.csv'))
+        ]
+        
+        for movies_path, tv_path in possible_paths:
+            if os.path.exists(movies_path) and os.path.exists(tv_path):
+                return movies_path, tv_path
+        return None
+
+    def _model_params(self):
+        """Parameters that invalidate the model snapshot when changed"""
+        return {
+            'tfidf': self.TFIDF_PARAMS,
+            'svd_components': self.SVD_COMPONENTS,
+            'svd_random_state': self.SVD_RANDOM_STATE,
+            'max_items': self.MAX_ITEMS,
+            'full_catalog': self.full_catalog,
+            'similar_neighbors': self.SIMILAR_NEIGHBORS
+        }
+
+    def _fit_model(self, movies_path, tv_path):
+        """Parse the datasets and fit TF-IDF + SVD from scratch"""
+        # Stream both datasets in chunks, never holding the raw frames
+        with self._load_stage('parse') as stage:
+            movie_future = self.executor.submit(self._stream_dataset, movies_path, 'movie')
+            tv_future = self.executor.submit(self._stream_dataset, tv_path, 'tv')
+            movie_stream = movie_future.result()
+            tv_stream = tv_future.result()
+            stage['rows'] = movie_stream[2] + tv_stream[2]
+        logger.info(f"🎯 Read {movie_stream[2]} movies and {tv_stream[2]} TV shows")
+        
+        # Optimize datasets in parallel
+        with self._load_stage('optimize') as stage:
+            movie_future = self.executor.submit(self._optimize_dataset, *movie_stream, 'movie')
+            tv_future = self.executor.submit(self._optimize_dataset, *tv_stream, 'tv')
+            del movie_stream, tv_stream
+            self.movies_df = movie_future.result()
+            self.tv_df = tv_future.result()
+            stage['rows'] = len(self.movies_df) + len(self.tv_df)
+        logger.info(f"📊 Loaded datasets from {movies_path} and {tv_path}")
+        
+        # Create TF-IDF matrices with optimization
+        with self._load_stage('tfidf'):
+            self._create_tfidf_matrices()
+        
+        # SVD dimensionality reduction for faster similarity computation
+        with self._load_stage('svd'):
+            self._apply_svd_reduction()
+        
+        # Export the fitted models as plain arrays and release the sklearn objects
+        self.query_embedders = {
+            'movie': QueryEmbedder.from_model(self.movie_vectorizer, self.movie_svd),
+            'tv': QueryEmbedder.from_model(self.tv_vectorizer, self.tv_svd)
+        }
+        self.movie_vectorizer = self.tv_vectorizer = None
+        self.movie_svd = self.tv_svd = None
         
-        # Intelligent optimization for large datasets
-        max_items = 10000  # Optimized for performance while maintaining quality
-        if len(df) > max_items:
-            logger.info(f"🎯 Optimizing {max_items} premium items from {len(df)} total {content_type}s")
+        # The content string and its raw sources are only needed for fitting
+        self.movies_df = self._serving_frame(self.movies_df)
+        self.tv_df = self._serving_frame(self.tv_df)
+
+    def _serving_frame(self, df):
+        """Keep only the catalog columns used to serve requests"""
+        return df[[col for col in df.columns if col in self.CATALOG_COLUMNS]]
+
+    def _report_memory(self):
+        """Record and log resident memory and model sizes after loading"""
+        self.load_stats = {
+            'full_catalog': self.full_catalog,
+            'items': {'movie': len(self.movies_df), 'tv': len(self.tv_df)},
+            'rss_mb': round(resident_memory_mb() or 0, 1),
+            'catalog_mb': {
+                'movie': round(frame_memory_mb(self.movies_df), 1),
+                'tv': round(frame_memory_mb(self.tv_df), 1)
+            },
+            'matrix_mb': {
+                'movie': round(array_memory_mb(self.movie_tfidf_matrix) + array_memory_mb(self.item_embeddings.get('movie')), 1),
+                'tv': round(array_memory_mb(self.tv_tfidf_matrix) + array_memory_mb(self.item_embeddings.get('tv')), 1)
+            }
+        }
+        logger.info(f"🧮 Resident memory {self.load_stats['rss_mb']} MB - "
+                    f"catalogs {self.load_stats['catalog_mb']} MB, matrices {self.load_stats['matrix_mb']} MB")
+
+    def save_snapshot(self):
+        """Write the fitted model to a versioned on-disk snapshot"""
+        if not self.is_loaded:
+            raise RuntimeError("Engine must be loaded before a snapshot can be written")
+        if self.model_fingerprint is None:
+            raise RuntimeError("Snapshots can only be built from the source datasets")
+        
+        # Always persist the ANN index so it can be switched on without a rebuild
+        for content_type in ('movie', 'tv'):
+            if content_type not in self.ann_indexes:
+                self.ann_indexes[content_type] = IVFIndex.build(
+                    self.item_embeddings[content_type], n_probe=self.ann_n_probe
+                )
+        # Snapshots always carry the neighbour lists, so servers never build them at startup
+        if not self.has_neighbors():
+            self._build_neighbors()
+            self.neighbor_progress.update(state='ready', error=None, failed_at=None)
+        
+        frames = {
+            'movie_catalog': self.movies_df,
+            'tv_catalog': self.tv_df
+        }
+        arrays = {
+            'movie_matrix': self.movie_tfidf_matrix,
+            'tv_matrix': self.tv_tfidf_matrix,
+            **self.query_embedders['movie'].to_arrays('movie'),
+            **self.query_embedders['tv'].to_arrays('tv'),
+            **self.ann_indexes['movie'].to_arrays('movie'),
+            **self.ann_indexes['tv'].to_arrays('tv'),
+            **self.neighbors['movie'].to_arrays('movie'),
+            **self.neighbors['tv'].to_arrays('tv')
+        }
+        # Float32 embeddings and their int8 codes are both stored, so any precision can be served
+        for content_type in ('movie', 'tv'):
+            embeddings = self.item_embeddings[content_type]
+            if isinstance(embeddings, QuantizedEmbeddings):
+                arrays[f'{content_type}_embeddings'] = embeddings.float_rows()
+                arrays.update(embeddings.to_arrays(content_type))
+            else:
+                arrays[f'{content_type}_embeddings'] = np.asarray(embeddings, dtype=np.float32)
+                arrays.update(QuantizedEmbeddings.quantize(arrays[f'{content_type}_embeddings']).to_arrays(content_type))
+        meta = {
+            **self.query_embedders['movie'].to_meta('movie'),
+            **self.query_embedders['tv'].to_meta('tv'),
+            'drift': {content_type: drift.to_meta() for content_type, drift in self.drift.items()}
+        }
+        path = self.snapshot.save(
+            self.model_fingerprint, self.model_sources, self._model_params(), frames, arrays, meta
+        )
+        self.save_cold_start()
+        return path
+
+    def save_cold_start(self):
+        """Write trending and random-pick records for serving before the model is ready"""
+        rng = np.random.default_rng(self.SVD_RANDOM_STATE)
+        payload = {'fingerprint': self.model_fingerprint, 'created_at': datetime.now().isoformat()}
+        for content_type in ('movie', 'tv'):
+            picks = self._quality_positions(content_type)
+            if len(picks) > self.COLD_START_PICKS:
+                picks = np.sort(rng.choice(picks, size=self.COLD_START_PICKS, replace=False))
+            payload[content_type] = {
+                'trending': self.trending[content_type].records(TrendingRankings.DEFAULT_LIMIT),
+                'picks': self.serializers[content_type].records(picks)
+            }
+        self.snapshot.save_cold_start(payload)
+        self.cold_start = payload
+        logger.info(f"🧊 Cold-start payload written to {self.snapshot.cold_start_path}")
+
+    def _load_snapshot(self):
+        """Restore the fitted model from the published snapshot"""
+        snapshot = self.snapshot.load(mmap=True, columns={
+            'movie_catalog': self.CATALOG_COLUMNS,
+            'tv_catalog': self.CATALOG_COLUMNS
+        })
+        frames, arrays, meta = snapshot['frames'], snapshot['arrays'], snapshot['meta']
+        
+        self.movies_df = frames['movie_catalog']
+        self.tv_df = frames['tv_catalog']
+        self.movie_tfidf_matrix = arrays['movie_matrix']
+        self.tv_tfidf_matrix = arrays['tv_matrix']
+        self.query_embedders = {
+            content_type: QueryEmbedder.from_arrays(arrays, meta, content_type)
+            for content_type in ('movie', 'tv')
+        }
+        self.item_embeddings = {
+            content_type: self._serving_embeddings(content_type, arrays)
+            for content_type in ('movie', 'tv') if f'{content_type}_embeddings' in arrays
+        }
+        self.ann_indexes = {}
+        for content_type, embeddings in self.item_embeddings.items():
+            ann_index = IVFIndex.from_arrays(embeddings, arrays, content_type, n_probe=self.ann_n_probe)
+            if ann_index is not None:
+                self.ann_indexes[content_type] = ann_index
+        self.neighbors = {}
+        for content_type, df in (('movie', self.movies_df), ('tv', self.tv_df)):
+            neighbors = ItemNeighbors.from_arrays(arrays, content_type, catalog_ids(df))
+            if neighbors is not None:
+                self.neighbors[content_type] = neighbors
+        # Titles ingested before the snapshot was written keep counting towards a refit
+        self.drift = {
+            content_type: CatalogDrift.from_meta(state) for content_type, state in meta.get('drift', {}).items()
+        }
+        
+        logger.info(f"💾 Restored model snapshot {snapshot['manifest']['fingerprint'][:16]} - "
+                    f"Movies: {self.movie_tfidf_matrix.shape}, TV: {self.tv_tfidf_matrix.shape}")
+
+    def _build_serving_indexes(self):
+        """Build the in-memory indexes used to answer requests"""
+        # L2-normalized item vectors, so cosine scoring is a single dot product
+        if 'movie' not in self.item_embeddings:
+            self.item_embeddings['movie'] = self._serving_embeddings('movie')
+        if 'tv' not in self.item_embeddings:
+            self.item_embeddings['tv'] = self._serving_embeddings('tv')
+        
+        if self.ann_enabled:
+            for content_type, embeddings in self.item_embeddings.items():
+                if content_type not in self.ann_indexes:
+                    self.ann_indexes[content_type] = IVFIndex.build(embeddings, n_probe=self.ann_n_probe)
+        
+        self.filter_indexes = {
+            'movie': CatalogFilterIndex(self.movies_df),
+            'tv': CatalogFilterIndex(self.tv_df)
+        }
+        self.serializers = {
+            'movie': CatalogSerializer(self.movies_df),
+            'tv': CatalogSerializer(self.tv_df)
+        }
+        self.quality_boosts = {
+            'movie': self._quality_boost(self.movies_df),
+            'tv': self._quality_boost(self.tv_df)
+        }
+        self.trending = {
+            'movie': TrendingRankings.build(self.movies_df, self.serializers['movie'], self.filter_indexes['movie']),
+            'tv': TrendingRankings.build(self.tv_df, self.serializers['tv'], self.filter_indexes['tv'])
+        }
+        self.search_indexes = {
+            'movie': InvertedIndex(self.movies_df, self._search_fields(self.movies_df, 'movie')),
+            'tv': InvertedIndex(self.tv_df, self._search_fields(self.tv_df, 'tv'))
+        }
+        self.autocomplete = {}
+        self.fuzzy_matchers = {}
+        for content_type, df in (('movie', self.movies_df), ('tv', self.tv_df)):
+            titles, priority = self.serializers[content_type].titles, self._title_priority(df)
+            self.autocomplete[content_type] = TitleAutocomplete(titles, priority)
+            self.fuzzy_matchers[content_type] = FuzzyTitleMatcher(titles, priority)
+        logger.info("🗂️ Filter, trending, search and title indexes built for movies and TV shows")
+
+    def has_neighbors(self):
+        return 'movie' in self.neighbors and 'tv' in self.neighbors
+
+    def start_neighbor_build(self):
+        """Start building missing neighbour lists in the background unless running, done or backing off"""
+        with self.loader_lock:
+            if not self.is_loaded or self.has_neighbors():
+                return False
+            if self.neighbor_thread is not None and self.neighbor_thread.is_alive():
+                return False
+            failed_at = self.neighbor_progress['failed_at']
+            if failed_at is not None and time.time() - failed_at < self.LOAD_RETRY_INTERVAL:
+                return False
+            self.neighbor_progress.update(state='building', error=None)
+            self.neighbor_thread = threading.Thread(target=self._background_neighbors, name='nextflix-neighbors',
+                                                    daemon=True)
+            self.neighbor_thread.start()
+            return True
+
+    def _background_neighbors(self):
+        try:
+            start_time = time.time()
+            self._build_neighbors()
+            self.neighbor_progress.update(state='ready', failed_at=None)
+            logger.info(f"✅ Neighbour lists built in background in {time.time() - start_time:.2f} seconds")
+        except Exception as e:
+            self.neighbor_progress.update(state='failed', error=str(e), failed_at=time.time())
+            logger.error(f"❌ Error building neighbour lists: {str(e)}")
+
+    def _build_neighbors(self):
+        """Compute the "more like this" lists missing from the loaded model"""
+        for content_type in ('movie', 'tv'):
+            if content_type in self.neighbors:
+                continue
+            # Built outside the ingest lock over the rows present now; rows ingested meanwhile are merged in after
+            ids = self.serializers[content_type].ids
+            neighbors = ItemNeighbors.build(self.item_embeddings[content_type], ids, self.SIMILAR_NEIGHBORS)
+            with self.ingest_lock:
+                serializer = self.serializers[content_type]
+                if len(serializer.ids) > len(ids):
+                    neighbors = neighbors.extended(self.item_embeddings[content_type], len(ids), serializer.ids)
+                self.neighbors[content_type] = neighbors
+
+    def _serving_embeddings(self, content_type, arrays=None):
+        """Unit-length item vectors at the configured precision, reusing snapshot arrays when possible"""
+        matrix = self.movie_tfidf_matrix if content_type == 'movie' else self.tv_tfidf_matrix
+        if self.embedding_precision == 'float64':
+            return l2_normalize_rows(matrix, dtype=np.float64)
+        stored = arrays.get(f'{content_type}_embeddings') if arrays is not None else None
+        embeddings = stored if stored is not None else l2_normalize_rows(matrix)
+        if self.embedding_precision != 'int8':
+            return embeddings
+        # The float rows stay memory-mapped when restored; only re-ranked rows are read
+        quantized = QuantizedEmbeddings.from_arrays(arrays, content_type, embeddings) if arrays is not None else None
+        return quantized if quantized is not None else QuantizedEmbeddings.quantize(embeddings)
+
+    def _title_priority(self, df):
+        """Popularity used to pre-rank autocomplete suggestions"""
+        col = 'popularity' if 'popularity' in df.columns else 'vote_count'
+        return pd.to_numeric(df[col], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+
+    def _search_fields(self, df, content_type):
+        """Search field weights, indexing only one title column per catalog"""
+        title_col = 'title' if content_type == 'movie' else 'name'
+        if title_col not in df.columns:
+            title_col = 'title' if 'title' in df.columns else 'name'
+        return {
+            col: weight for col, weight in self.SEARCH_FIELDS.items()
+            if col not in ('title', 'name') or col == title_col
+        }
+
+    def ingest_titles(self, content_type, records):
+        """
+        Append new titles to the loaded catalog without refitting.
+
+        Titles are folded into the fitted SVD space with the exported query
+        embedder, and every serving index is extended rather than rebuilt.
+        The new structures are published only once complete, with the indexes
+        that hand out row positions last, so concurrent requests never see a
+        row the catalog does not hold yet. Returns a summary with drift metrics.
+        """
+        if not self.is_loaded:
+            raise RuntimeError("Engine must be loaded before titles can be ingested")
+        key = 'movie' if content_type == 'movie' else 'tv'
+        
+        with self.ingest_lock:
+            start_time = time.time()
+            df = self.movies_df if key == 'movie' else self.tv_df
+            matrix = self.movie_tfidf_matrix if key == 'movie' else self.tv_tfidf_matrix
+            
+            new_df = pd.DataFrame.from_records(records)
+            if 'id' not in new_df.columns:
+                raise ValueError("Every ingested title needs an 'id'")
+            # Skip titles already in the catalog or repeated within the batch
+            ids = pd.to_numeric(new_df['id'], errors='coerce')
+            skip = ids.isna().to_numpy() | ids.duplicated().to_numpy() | np.isin(ids.to_numpy(), self.serializers[key].ids)
+            new_df = new_df[~skip].reset_index(drop=True)
+            summary = {'content_type': key, 'added': len(new_df), 'skipped': int(skip.sum())}
+            if new_df.empty:
+                return dict(summary, catalog_size=len(df), elapsed_ms=0.0, drift=self.drift_report().get(key))
             
-            # Smart curation: prioritize high-quality content
-            df_quality = df[
-                (df['vote_average'].fillna(0) >= 6.0) & 
-                (df['vote_count'].fillna(0) >= 20)
-            ].copy()
+            # Fold the new content strings into the fitted model
+            new_df = self._prepare_dataset(new_df, key)
+            embedder = self.query_embedders[key]
+            contents = new_df['content'].tolist()
+            folded = embedder.transform_many(contents).astype(matrix.dtype, copy=False)
+            coverage = [embedder.coverage(text) for text in contents]
+            
+            start = len(df)
+            combined = self._append_rows(df, self._serving_frame(new_df))
+            new_rows = combined.iloc[start:]
+            embeddings = self.item_embeddings[key]
+            if isinstance(embeddings, QuantizedEmbeddings):
+                embeddings = embeddings.extended(l2_normalize_rows(folded))
+            else:
+                embeddings = np.vstack([embeddings, l2_normalize_rows(folded, dtype=embeddings.dtype)])
+            serializer = self.serializers[key].extended(new_rows)
+            filter_index = self.filter_indexes[key].extended(new_rows)
+            priority = self._title_priority(combined)
+            new_titles = serializer.titles[start:]
+            indexes = {
+                'search_indexes': self.search_indexes[key].extended(new_rows),
+                'autocomplete': self.autocomplete[key].extended(new_titles, priority),
+                'fuzzy_matchers': self.fuzzy_matchers[key].extended(new_titles, priority),
+                'trending': self.trending[key].extended(combined, serializer, filter_index, start)
+            }
+            if key in self.ann_indexes:
+                indexes['ann_indexes'] = self.ann_indexes[key].extended(embeddings, start)
+            if key in self.neighbors:
+                indexes['neighbors'] = self.neighbors[key].extended(embeddings, start, serializer.ids)
+            drift = self.drift.get(key) or CatalogDrift.from_matrix(matrix)
+            drift.record(folded, coverage)
+            
+            # Publish row-indexed data first, then the indexes that return row positions
+            if key == 'movie':
+                self.movie_tfidf_matrix = np.vstack([matrix, folded])
+                self.movies_df = combined
+            else:
+                self.tv_tfidf_matrix = np.vstack([matrix, folded])
+                self.tv_df = combined
+            self.item_embeddings[key] = embeddings
+            self.serializers[key] = serializer
+            self.quality_boosts[key] = np.concatenate([self.quality_boosts[key], self._quality_boost(new_rows)])
+            for name, index in indexes.items():
+                getattr(self, name)[key] = index
+            self.filter_indexes[key] = filter_index
+            self.drift[key] = drift
+            self.catalog_digest = self._catalog_digest(key, new_rows)
+            self.catalog_version += 1
+            
+            elapsed_ms = (time.time() - start_time) * 1000
+            logger.info(f"📥 Ingested {len(new_df)} {key} titles in {elapsed_ms:.1f} ms - catalog now {len(combined)} items")
+            if drift.refit_recommended:
+                logger.warning(f"⚠️ {key} catalog has drifted from the fitted model, schedule a full refit")
+            return dict(summary, catalog_size=len(combined), elapsed_ms=round(elapsed_ms, 1), drift=drift.report())
+
+    def _catalog_digest(self, content_type=None, new_rows=None):
+        """
+        Cache-key hash of the served catalog: its ids at load, chained with the content of each ingest.
+
+        Equal digests mean equal catalogs, so workers that ingested different
+        titles never read each other's entries from the shared cache.
+        """
+        if new_rows is None:
+            digest = hashlib.sha256()
+            for key in ('movie', 'tv'):
+                digest.update(np.ascontiguousarray(self.serializers[key].ids, dtype=np.int64).tobytes() + b'|')
+        else:
+            digest = hashlib.sha256(f'{self.catalog_digest}|{content_type}|'.encode())
+            digest.update(pd.util.hash_pandas_object(new_rows, index=False).to_numpy().tobytes())
+        return digest.hexdigest()[:16]
+
+    def _append_rows(self, df, new_df):
+        """Concatenate ingested rows onto a catalog, keeping its columns and compact dtypes"""
+        new_df = new_df.reindex(columns=df.columns)
+        for col, dtype in df.dtypes.items():
+            if isinstance(dtype, pd.CategoricalDtype):
+                continue
+            if not pd.api.types.is_numeric_dtype(dtype):
+                new_df[col] = new_df[col].fillna('')
+                continue
+            # Fields a record leaves out get the defaults _prepare_dataset gives the fitted catalog, never NaN scores
+            values = pd.to_numeric(new_df[col], errors='coerce').fillna(0)
+            if pd.api.types.is_integer_dtype(dtype):
+                # Compacted integer columns are widened rather than wrapped; concat promotes the catalog column
+                dtype = self._integer_dtype_for(col, dtype, values)
+            new_df[col] = values.astype(dtype)
+        combined = pd.concat([df, new_df], ignore_index=True)
+        for col, dtype in df.dtypes.items():
+            if isinstance(dtype, pd.CategoricalDtype):
+                combined[col] = combined[col].astype('category')
+        return combined
+
+    def _integer_dtype_for(self, col, dtype, values):
+        """Integer dtype wide enough for both a catalog column and the ingested values"""
+        if values.empty:
+            return dtype
+        if not np.isfinite(values.to_numpy(dtype=np.float64)).all():
+            raise ValueError(f"Values of '{col}' must be finite")
+        low, high = int(values.min()), int(values.max())
+        int64 = np.iinfo(np.int64)
+        if low < int64.min or high > int64.max:
+            raise ValueError(f"Values of '{col}' are out of the 64-bit integer range")
+        numpy_dtype = getattr(dtype, 'numpy_dtype', dtype)
+        info = np.iinfo(numpy_dtype)
+        if info.min <= low and high <= info.max:
+            return dtype
+        # Only numpy dtypes are narrower than 64 bits here; nullable Int64 always fits
+        for candidate in (np.int16, np.int32, np.int64):
+            wider = np.iinfo(candidate)
+            if np.dtype(candidate).itemsize > info.bits // 8 and wider.min <= low and high <= wider.max:
+                return np.dtype(candidate)
+        return np.dtype(np.int64)
+
+    def drift_report(self):
+        """Drift of ingested titles from the fitted model, per content type"""
+        return {content_type: drift.report() for content_type, drift in self.drift.items()}
+
+    def metric_families(self):
+        """Engine gauges and counters for /metrics, sampled only when scraped"""
+        families = [('nextflix_engine_ready', 'gauge', 'Whether the model is loaded and serving',
+                     [({}, int(self.is_loaded))])]
+        
+        stages = self.load_progress['stages']
+        for field, name, documentation in (
+            ('seconds', 'nextflix_load_stage_seconds', 'Duration of each stage of the last model load'),
+            ('peak_rss_mb', 'nextflix_load_stage_peak_rss_bytes', 'Peak resident memory during each load stage'),
+            ('rows_per_sec', 'nextflix_load_stage_rows_per_second', 'Rows processed per second by each load stage')
+        ):
+            scale = 1024 * 1024 if field == 'peak_rss_mb' else 1
+            samples = [({'stage': stage}, round(stats[field] * scale, 3)) for stage, stats in stages.items() if stats.get(field)]
+            families.append((name, 'gauge', documentation, samples))
+        
+        if self.is_loaded:
+            families.append(('nextflix_catalog_items', 'gauge', 'Titles in each catalog', [
+                ({'content_type': 'movie'}, len(self.movies_df)), ({'content_type': 'tv'}, len(self.tv_df))
+            ]))
+            families.append(('nextflix_catalog_version', 'gauge', 'Incremental ingests applied since load',
+                             [({}, self.catalog_version)]))
+            matrices = []
+            for key, matrix in (('movie', self.movie_tfidf_matrix), ('tv', self.tv_tfidf_matrix)):
+                matrices.append(({'content_type': key, 'matrix': 'reduced'}, getattr(matrix, 'nbytes', 0)))
+                embeddings = self.item_embeddings.get(key)
+                matrices.append(({'content_type': key, 'matrix': 'embeddings'}, getattr(embeddings, 'nbytes', 0)))
+                neighbors = self.neighbors.get(key)
+                matrices.append(({'content_type': key, 'matrix': 'neighbors'}, getattr(neighbors, 'nbytes', 0)))
+            families.append(('nextflix_matrix_bytes', 'gauge', 'Memory held by item matrices', matrices))
+        
+        rss = resident_memory_mb()
+        if rss is not None:
+            families.append(('nextflix_resident_memory_bytes', 'gauge', 'Resident memory of this process',
+                             [({}, int(rss * 1024 * 1024))]))
+        
+        cache = self.cache.stats()
+        labels = {'backend': cache['backend']}
+        for field, name, metric_type, documentation in (
+            ('hits', 'hits_total', 'counter', 'Result cache hits'),
+            ('misses', 'misses_total', 'counter', 'Result cache misses'),
+            ('evictions', 'evictions_total', 'counter', 'Result cache evictions'),
+            ('entries', 'entries', 'gauge', 'Entries in the result cache'),
+            ('bytes', 'bytes', 'gauge', 'Estimated size of the result cache'),
+            ('hit_rate', 'hit_ratio', 'gauge', 'Share of result cache lookups that hit')
+        ):
+            if cache.get(field) is not None:
+                families.append((f'nextflix_cache_{name}', metric_type, documentation, [(labels, cache[field])]))
+        return families
+
+    def _optimize_dataset(self, quality, others, rows_read, content_type):
+        """Optimize dataset for rich performance with intelligent sampling"""
+        if self.full_catalog:
+            # Full-catalog chunks were prepared as they streamed in
+            df = pd.concat(quality, ignore_index=True)
+            del quality
+            if 'original_language' in df.columns:
+                # Chunk-level categories differ, so re-encode once over the full column
+                df['original_language'] = df['original_language'].astype('category')
+            logger.info(f"✅ Streamed full {content_type} catalog: {len(df)} items ready")
+            return df
+        
+        # Intelligent optimization for large datasets. Retained rows keep their
+        # row number in the file as index, so this samples exactly as if the
+        # whole file had been read at once.
+        max_items = self.MAX_ITEMS
+        df_quality = pd.concat(quality)
+        if rows_read > max_items:
+            logger.info(f"🎯 Optimizing {max_items} premium items from {rows_read} total {content_type}s")
             
             if len(df_quality) > max_items:
                 # Use top-rated quality content
@@ -149,7 +874,7 @@ class UltraModernRecommendationEngine:
             elif len(df_quality) > 0:
                 # Use all high-quality + curate from remaining
                 remaining_needed = max_items - len(df_quality)
-                df_remaining = df[~df.index.isin(df_quality.index)]
+                df_remaining = pd.concat(others)
                 if len(df_remaining) > remaining_needed:
                     df_remaining_sample = df_remaining.sample(n=remaining_needed, random_state=42)
                     df = pd.concat([df_quality, df_remaining_sample])
@@ -157,7 +882,69 @@ class UltraModernRecommendationEngine:
                     df = pd.concat([df_quality, df_remaining])
             else:
                 # Fallback: curated selection
-                df = df.sample(n=max_items, random_state=42)
+                df = pd.concat(others).sample(n=max_items, random_state=42)
+        else:
+            # Small datasets are kept whole, in file order
+            df = pd.concat(quality + others).sort_index().reset_index(drop=True)
+        
+        df = self._compact_dtypes(self._prepare_dataset(df, content_type))
+        
+        logger.info(f"✅ Optimized {content_type} dataset: {len(df)} premium items ready")
+        return df
+
+    def _stream_dataset(self, path, content_type):
+        """
+        Read a dataset in chunks, projecting the needed columns with explicit dtypes.
+
+        Full-catalog mode prepares each chunk as it arrives. Otherwise chunks are
+        split into quality rows and the rest, and the rest is only retained until
+        more than MAX_ITEMS quality rows have been seen, as sampling never needs
+        it after that. Peak memory follows the chunk size plus the retained rows.
+        Returns (quality_chunks, other_chunks, rows_read).
+        """
+        needed = set(self.CATALOG_COLUMNS + self.CONTENT_SOURCE_COLUMNS)
+        usecols = [col for col in pd.read_csv(path, nrows=0).columns if col in needed]
+        dtype = {col: self.CSV_DTYPES[col] for col in usecols if col in self.CSV_DTYPES}
+        
+        quality, others = [], []
+        rows_read = quality_rows = 0
+        for chunk in pd.read_csv(path, chunksize=self.CSV_CHUNK_SIZE, usecols=usecols, dtype=dtype):
+            rows_read += len(chunk)
+            if self.full_catalog:
+                quality.append(self._compact_dtypes(self._prepare_dataset(chunk, content_type)))
+                continue
+            
+            is_quality = (
+                (chunk['vote_average'].fillna(0) >= self.QUALITY_MIN_VOTE_AVERAGE) &
+                (chunk['vote_count'].fillna(0) >= self.QUALITY_MIN_VOTE_COUNT)
+            )
+            quality.append(chunk[is_quality])
+            quality_rows += int(is_quality.sum())
+            if quality_rows <= self.MAX_ITEMS:
+                others.append(chunk[~is_quality])
+            else:
+                others = []
+        
+        if not quality:
+            quality.append(pd.DataFrame(columns=usecols))
+        return quality, others, rows_read
+
+    def _compact_dtypes(self, df):
+        """Downcast prepared columns to compact dtypes: vote counts, runtimes, release years and languages"""
+        if 'vote_count' in df.columns:
+            df['vote_count'] = df['vote_count'].astype(np.int32)
+        if 'runtime' in df.columns:
+            df['runtime'] = pd.to_numeric(df['runtime'], errors='coerce').astype(np.float32)
+        if 'original_language' in df.columns:
+            df['original_language'] = df['original_language'].astype('category')
+        df['release_year'] = df['release_year'].astype(np.int16)
+        return df
+
+    def _prepare_dataset(self, df, content_type):
+        """Fill missing values, build the ML content string and normalize columns"""
+        for col in self.CONTENT_SOURCE_COLUMNS:
+            if col not in df.columns:
+                df[col] = ''
         
         # Fill missing values efficiently
         df['overview'] = df['overview'].fillna('')
@@ -176,7 +963,7 @@ class UltraModernRecommendationEngine:
         # Parse release dates efficiently
         date_col = 'release_date' if content_type == 'movie' else 'first_air_date'
         if date_col in df.columns:
-            df['release_year'] = pd.to_datetime(df[date_col], errors='coerce').dt.year
+            df['release_year'] = pd.to_datetime(df[date_col], format=self.DATE_FORMAT, errors='coerce').dt.year
             df['release_year'] = df['release_year'].fillna(2000).astype(int)
         else:
             df['release_year'] = 2000
@@ -186,21 +973,14 @@ class UltraModernRecommendationEngine:
             if col in df.columns:
                 df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
         
-        logger.info(f"✅ Optimized {content_type} dataset: {len(df)} premium items ready")
         return df
 
     def _create_tfidf_matrices(self):
         """Create optimized TF-IDF matrices for rich recommendations"""
         logger.info("🧠 Creating TF-IDF matrices for content analysis...")
+        from sklearn.feature_extraction.text import TfidfVectorizer
         
-        # Optimized parameters for large datasets
-        tfidf_params = {
-            'max_features': 5000,  # Reduced for better performance
-            'stop_words': 'english',
-            'ngram_range': (1, 2),
-            'min_df': 3,  # Increased to reduce noise
-            'max_df': 0.7  # Reduced to filter common words
-        }
+        tfidf_params = dict(self.TFIDF_PARAMS, dtype=self._matrix_dtype())
         
         try:
             # Create movie TF-IDF matrix
@@ -218,24 +998,28 @@ class UltraModernRecommendationEngine:
             logger.error(f"❌ Error creating TF-IDF matrices: {str(e)}")
             raise
 
+    def _matrix_dtype(self):
+        """Float precision of the reduced item matrices"""
+        return np.float32 if self.full_catalog else np.float64
+
     def _apply_svd_reduction(self):
         """Apply SVD for dimensionality reduction and faster computation"""
         logger.info("🔬 Applying SVD dimensionality reduction...")
+        from sklearn.decomposition import TruncatedSVD
         
         try:
-            # Smaller components for better performance
-            n_components_movies = min(300, min(self.movie_tfidf_matrix.shape) - 1)
-            n_components_tv = min(200, min(self.tv_tfidf_matrix.shape) - 1)
+            n_components_movies = min(self.SVD_COMPONENTS['movie'], min(self.movie_tfidf_matrix.shape) - 1)
+            n_components_tv = min(self.SVD_COMPONENTS['tv'], min(self.tv_tfidf_matrix.shape) - 1)
             
             # Movie SVD
             logger.info(f"📽️ Reducing movie matrix to {n_components_movies} components...")
-            self.movie_svd = TruncatedSVD(n_components=n_components_movies, random_state=42)
-            self.movie_tfidf_matrix = self.movie_svd.fit_transform(self.movie_tfidf_matrix)
+            self.movie_svd = TruncatedSVD(n_components=n_components_movies, random_state=self.SVD_RANDOM_STATE)
+            self.movie_tfidf_matrix = self.movie_svd.fit_transform(self.movie_tfidf_matrix).astype(self._matrix_dtype(), copy=False)
             
             # TV SVD
             logger.info(f"📺 Reducing TV matrix to {n_components_tv} components...")
-            self.tv_svd = TruncatedSVD(n_components=n_components_tv, random_state=42)
-            self.tv_tfidf_matrix = self.tv_svd.fit_transform(self.tv_tfidf_matrix)
+            self.tv_svd = TruncatedSVD(n_components=n_components_tv, random_state=self.SVD_RANDOM_STATE)
+            self.tv_tfidf_matrix = self.tv_svd.fit_transform(self.tv_tfidf_matrix).astype(self._matrix_dtype(), copy=False)
             
             logger.info(f"✅ SVD reduction completed - Movies: {self.movie_tfidf_matrix.shape}, TV: {self.tv_tfidf_matrix.shape}")
         except Exception as e:
@@ -249,42 +1033,34 @@ class UltraModernRecommendationEngine:
             
             # Cache key for this request
             cache_key = self._generate_cache_key(preferences)
-            if cache_key in self.cache:
-                cached_result = self.cache[cache_key]
-                if time.time() - cached_result.get('timestamp', 0) < 1800:  # 30 minutes cache
-                    logger.info("⚡ Returning cached recommendations")
-                    return cached_result['data']
+            cached_result = self.cache.get(cache_key)
+            if cached_result is not None:
+                logger.info("⚡ Returning cached recommendations")
+                return cached_result
             
             content_type = preferences.get('content_type', 'movie')
             
-            # Get appropriate dataset and matrices
-            if content_type == 'movie':
-                df = self.movies_df
-                tfidf_matrix = self.movie_tfidf_matrix
-                vectorizer = self.movie_vectorizer
-                svd = self.movie_svd
-            else:
-                df = self.tv_df
-                tfidf_matrix = self.tv_tfidf_matrix
-                vectorizer = self.tv_vectorizer
-                svd = self.tv_svd
+            # Get appropriate dataset
+            df = self.movies_df if content_type == 'movie' else self.tv_df
             
             # Advanced filtering
-            filtered_df = self._apply_advanced_filters(df, preferences)
+            timer = StageTimer(STAGE_SECONDS, 'single')
+            positions = self._apply_advanced_filters(content_type, preferences)
+            timer.mark('filter')
             
-            if len(filtered_df) == 0:
+            if len(positions) == 0:
                 return []
             
             # Rich content-based recommendations
+            index_key = 'movie' if content_type == 'movie' else 'tv'
+            ann_index = self.ann_indexes.get(index_key) if self.ann_enabled else None
             recommendations = self._get_content_based_recommendations(
-                filtered_df, tfidf_matrix, vectorizer, svd, preferences
+                df, positions, self.item_embeddings[index_key], self.query_embedders[index_key], preferences,
+                self.serializers[index_key], ann_index, timer
             )
             
             # Cache the result
-            self.cache[cache_key] = {
-                'data': recommendations,
-                'timestamp': time.time()
-            }
+            self.cache.set(cache_key, recommendations)
             
             return recommendations
             
@@ -292,71 +1068,210 @@ class UltraModernRecommendationEngine:
             logger.error(f"❌ Error getting recommendations: {str(e)}")
             return []
 
+    def get_recommendations_concurrently(self, preferences_by_type, deadline=None):
+        """
+        Run one recommendation pipeline per content type on the pipeline pool.
+
+        NumPy releases the GIL while scoring, so the pipelines overlap and the
+        latency is that of the slowest one. Pipelines still running at the
+        deadline are abandoned, not cancelled: a started pipeline cannot be
+        interrupted, so it runs to completion and keeps its pool thread until
+        then, and its result is discarded. Returns (results, timed_out content
+        types).
+        """
+        futures = {
+            content_type: self.pipeline_executor.submit(self.get_recommendations, preferences)
+            for content_type, preferences in preferences_by_type.items()
+        }
+        wait(futures.values(), timeout=self.REQUEST_DEADLINE if deadline is None else deadline)
+        
+        results = {}
+        timed_out = []
+        for content_type, future in futures.items():
+            if future.done():
+                results[content_type] = future.result()
+            else:
+                results[content_type] = []
+                timed_out.append(content_type)
+        if timed_out:
+            logger.warning(f"⏱️ Recommendation deadline exceeded for {', '.join(timed_out)}")
+        return results, timed_out
+
     def _generate_cache_key(self, preferences):
-        """Generate efficient cache key"""
+        """Generate a stable cache key covering every preference that shapes results"""
         key_data = {
+            'model': self.model_fingerprint,
+            'catalog': self.catalog_digest,
             'content_type': preferences.get('content_type', ''),
-            'genres': sorted(preferences.get('genres', [])),
+            # Genre order shapes the query string and its bigrams, so it is part of the key
+            'genres': list(preferences.get('genres', [])),
             'languages': sorted(preferences.get('languages', [])),
             'runtime': preferences.get('runtime', ''),
             'content_rating': preferences.get('content_rating', ''),
             'era_preference': preferences.get('era_preference', ''),
+            'mood': preferences.get('mood', ''),
             'min_rating': preferences.get('min_rating', 0),
             'result_count': preferences.get('result_count', 10)
         }
-        return str(hash(str(sorted(key_data.items()))))
+        return make_cache_key('recommendations', key_data)
+
+    def _filter_signature(self, preferences):
+        """Key shared by preference sets that select the same rows with the same boosts"""
+        return make_cache_key('filters', {
+            'content_type': 'movie' if preferences.get('content_type', 'movie') == 'movie' else 'tv',
+            'genres': sorted(preferences.get('genres', [])),
+            'languages': sorted(preferences.get('languages', [])),
+            'runtime': preferences.get('runtime', ''),
+            'content_rating': preferences.get('content_rating', ''),
+            'era_preference': preferences.get('era_preference', ''),
+            'min_rating': preferences.get('min_rating', 0)
+        })
+
+    def get_batch_recommendations(self, preferences_list):
+        """
+        Recommendations for many preference sets at once, in input order.
+
+        Preference sets are grouped by content type and filter signature, so
+        each group is filtered once, and all of a group's queries are scored
+        with one matrix-matrix product (exact scoring, no ANN).
+        """
+        self.memory_cleanup()
+        results = [None] * len(preferences_list)
+        cache_keys = [self._generate_cache_key(preferences) for preferences in preferences_list]
+        
+        # Repeated preference sets are scored once and share the result
+        first_index = {}
+        duplicates = []
+        groups = {}
+        query_vectors = {}
+        for i, preferences in enumerate(preferences_list):
+            if cache_keys[i] in first_index:
+                duplicates.append((i, first_index[cache_keys[i]]))
+                continue
+            first_index[cache_keys[i]] = i
+            cached_result = self.cache.get(cache_keys[i])
+            if cached_result is not None:
+                results[i] = cached_result
+            else:
+                groups.setdefault(self._filter_signature(preferences), []).append(i)
+        
+        for members in groups.values():
+            try:
+                self._score_batch_group(preferences_list, members, results, query_vectors)
+            except Exception as e:
+                logger.error(f"❌ Error scoring recommendation batch group: {str(e)}")
+                for i in members:
+                    results[i] = []
+            for i in members:
+                if results[i]:
+                    self.cache.set(cache_keys[i], results[i])
+        
+        for i, first in duplicates:
+            results[i] = results[first]
+        return results
+
+    def _batch_query_vector(self, query_vectors, key, preferences):
+        """Query embedding, computed once per distinct query string in a batch"""
+        query = self._create_user_query(preferences)
+        if (key, query) not in query_vectors:
+            query_vectors[(key, query)] = self.query_embedders[key].transform(query)
+        return query_vectors[(key, query)]
 
-    def _apply_advanced_filters(self, df, preferences):
-        """Apply rich filtering system"""
-        filtered_df = df.copy()
+    def _score_batch_group(self, preferences_list, members, results, query_vectors):
+        """Score every preference set of one filter group and store their results"""
+        group_preferences = preferences_list[members[0]]
+        content_type = group_preferences.get('content_type', 'movie')
+        key = 'movie' if content_type == 'movie' else 'tv'
+        df = self.movies_df if key == 'movie' else self.tv_df
+        
+        timer = StageTimer(STAGE_SECONDS, 'batch')
+        positions = self._apply_advanced_filters(content_type, group_preferences)
+        timer.mark('filter')
+        if len(positions) == 0:
+            for i in members:
+                results[i] = []
+            return
+        
+        embeddings = self.item_embeddings[key]
+        serializer = self.serializers[key]
+        # Popularity, rating and era boosts depend only on the filter signature
+        boosts = self._calculate_rich_scores(df, positions, np.zeros(len(positions), dtype=embeddings.dtype),
+                                             group_preferences)
+        timer.mark('scoring')
+        
+        # Score the group in query blocks to bound the size of the similarity matrix
+        block = max(1, self.BATCH_BLOCK_SIZE // max(len(positions), 1))
+        for start in range(0, len(members), block):
+            block_members = members[start:start + block]
+            queries = np.vstack([
+                self._batch_query_vector(query_vectors, key, preferences_list[i]) for i in block_members
+            ])
+            timer.mark('embed')
+            quantized = isinstance(embeddings, QuantizedEmbeddings)
+            if quantized:
+                scores = embeddings.scores_batch(positions, queries) + boosts
+            else:
+                scores = cosine_scores_batch(embeddings, positions, queries) + boosts
+            timer.mark('similarity')
+            for row, i in enumerate(block_members):
+                result_count = min(preferences_list[i].get('result_count', 10), len(positions))
+                row_positions, row_scores = positions, scores[row]
+                if quantized:
+                    # Rescore the best int8 candidates exactly
+                    keep = top_k_indices(row_scores, max(self.RERANK_CANDIDATES, result_count * 4))
+                    row_positions = positions[keep]
+                    row_scores = embeddings.rerank(row_positions, queries[row]) + boosts[keep]
+                    timer.mark('rerank')
+                top_indices = top_k_indices(row_scores, result_count)
+                timer.mark('topk')
+                results[i] = serializer.records(
+                    row_positions[top_indices], overview_length=300, scores=row_scores[top_indices], detailed=True
+                )
+                timer.mark('serialize')
+
+    def _apply_advanced_filters(self, content_type, preferences):
+        """Apply rich filtering system, returning matching catalog row positions"""
+        filter_index = self.filter_indexes['movie' if content_type == 'movie' else 'tv']
+        equals = {}
+        ranges = {}
         
         # Genre filtering
         genres = preferences.get('genres', [])
-        if genres:
-            genre_pattern = '|'.join(genres)
-            genre_mask = filtered_df['genres'].str.contains(genre_pattern, case=False, na=False)
-            filtered_df = filtered_df[genre_mask]
         
         # Language filtering
         languages = preferences.get('languages', [])
         if languages and 'any' not in [l.lower() for l in languages]:
-            if 'original_language' in filtered_df.columns:
+            if filter_index.has_column('original_language'):
                 language_codes = {
                     'english': 'en', 'spanish': 'es', 'french': 'fr', 'german': 'de',
                     'italian': 'it', 'japanese': 'ja', 'korean': 'ko', 'hindi': 'hi'
                 }
-                lang_codes = [language_codes.get(lang.lower(), lang.lower()) for lang in languages]
-                lang_mask = filtered_df['original_language'].isin(lang_codes)
-                filtered_df = filtered_df[lang_mask]
+                equals['original_language'] = [language_codes.get(lang.lower(), lang.lower()) for lang in languages]
         
         # Runtime filtering
         runtime = preferences.get('runtime', '')
-        if runtime and runtime != 'any' and 'runtime' in filtered_df.columns:
+        if runtime and runtime != 'any' and filter_index.has_column('runtime'):
             runtime_filters = {
                 'quick': (0, 90),
                 'standard': (90, 150),
                 'epic': (150, 999)
             }
             if runtime in runtime_filters:
-                min_runtime, max_runtime = runtime_filters[runtime]
-                filtered_df = filtered_df[
-                    (filtered_df['runtime'] >= min_runtime) & 
-                    (filtered_df['runtime'] <= max_runtime)
-                ]
+                ranges['runtime'] = runtime_filters[runtime]
         
         # Content rating filtering
         content_rating = preferences.get('content_rating', '')
         if content_rating and content_rating != 'any':
             # Map ratings to appropriate columns or values
-            if 'certification' in filtered_df.columns:
-                filtered_df = filtered_df[filtered_df['certification'] == content_rating]
-            elif 'rating' in filtered_df.columns:
-                filtered_df = filtered_df[filtered_df['rating'] == content_rating]
+            if filter_index.has_column('certification'):
+                equals['certification'] = [content_rating]
+            elif filter_index.has_column('rating'):
+                equals['rating'] = [content_rating]
         
         # Rating filtering
         min_rating = preferences.get('min_rating', 0)
         if min_rating > 0:
-            filtered_df = filtered_df[filtered_df['vote_average'] >= min_rating]
+            ranges['vote_average'] = (min_rating, None)
         
         # Era filtering
         era = preferences.get('era_preference', '')
@@ -371,61 +1286,57 @@ class UltraModernRecommendationEngine:
             }
             
             if era in year_ranges:
-                start_year, end_year = year_ranges[era]
-                filtered_df = filtered_df[
-                    (filtered_df['release_year'] >= start_year) & 
-                    (filtered_df['release_year'] <= end_year)
-                ]
-        
-        # Quality filtering
-        if 'vote_count' in filtered_df.columns:
-            filtered_df = filtered_df[filtered_df['vote_count'] >= 10]
+                ranges['release_year'] = year_ranges[era]
         
-        return filtered_df.reset_index(drop=True)
+        # Quality filtering (vote_count >= 10) is part of the index base set
+        return filter_index.query(genres=genres, equals=equals, ranges=ranges)
 
-    def _get_content_based_recommendations(self, filtered_df, tfidf_matrix, vectorizer, svd, preferences):
-        """Get rich content-based recommendations"""
+    def _get_content_based_recommendations(self, df, positions, embeddings, query_embedder, preferences,
+                                           serializer, ann_index=None, timer=None):
+        """Get rich content-based recommendations for the given catalog row positions"""
         try:
+            timer = timer or StageTimer(STAGE_SECONDS, 'single')
             # Create user preference vector
             user_query = self._create_user_query(preferences)
-            user_vector = vectorizer.transform([user_query])
-            user_vector = svd.transform(user_vector)
+            user_vector = query_embedder.transform(user_query)
+            timer.mark('embed')
             
-            # Get indices of filtered items
-            filtered_indices = filtered_df.index.tolist()
+            result_count = preferences.get('result_count', 10)
             
-            # Compute similarities
-            filtered_tfidf = tfidf_matrix[filtered_indices]
-            similarities = cosine_similarity(user_vector, filtered_tfidf).flatten()
+            if ann_index is not None and len(positions) > self.ANN_MIN_FILTERED:
+                # Approximate filtered search for a candidate pool to re-rank
+                positions, similarities = ann_index.search(
+                    user_vector, max(self.ANN_CANDIDATES, result_count * 10), allowed=positions
+                )
+            elif isinstance(embeddings, QuantizedEmbeddings):
+                similarities = embeddings.scores(positions, user_vector)
+            else:
+                # Compute similarities against pre-normalized item embeddings
+                similarities = cosine_scores(embeddings, positions, user_vector)
+            timer.mark('similarity')
+            
+            if isinstance(embeddings, QuantizedEmbeddings):
+                # Keep the best candidates under int8 scores and rescore them exactly
+                scores = self._calculate_rich_scores(df, positions, similarities, preferences)
+                keep = top_k_indices(scores, max(self.RERANK_CANDIDATES, result_count * 4))
+                positions = positions[keep]
+                similarities = embeddings.rerank(positions, user_vector)
+                timer.mark('rerank')
             
             # Rich scoring with multiple factors
-            scores = self._calculate_rich_scores(filtered_df, similarities, preferences)
+            scores = self._calculate_rich_scores(df, positions, similarities, preferences)
+            timer.mark('scoring')
             
             # Get top recommendations
-            result_count = min(preferences.get('result_count', 10), len(filtered_df))
-            top_indices = scores.argsort()[-result_count:][::-1]
+            result_count = min(result_count, len(positions))
+            top_indices = top_k_indices(scores, result_count)
+            timer.mark('topk')
             
-            recommendations = []
-            for idx in top_indices:
-                item = filtered_df.iloc[idx]
-                
-                # Handle different title columns
-                title = item.get('title', item.get('name', 'Unknown'))
-                
-                rec = {
-                    'id': int(item.get('id', 0)),
-                    'title': str(title),
-                    'overview': str(item.get('overview', ''))[:300],
-                    'vote_average': float(item.get('vote_average', 0)),
-                    'release_date': str(item.get('release_date', item.get('first_air_date', ''))),
-                    'poster_path': str(item.get('poster_path', '')),
-                    'genres': str(item.get('genres', '')),
-                    'popularity': float(item.get('popularity', 0)),
-                    'score': float(scores[idx])
-                }
-                recommendations.append(rec)
-            
-            return recommendations
+            records = serializer.records(
+                positions[top_indices], overview_length=300, scores=scores[top_indices], detailed=True
+            )
+            timer.mark('serialize')
+            return records
             
         except Exception as e:
             logger.error(f"❌ Error in content-based recommendations: {str(e)}")
@@ -458,32 +1369,38 @@ class UltraModernRecommendationEngine:
         
         return ' '.join(query_parts)
 
-    def _calculate_rich_scores(self, df, similarities, preferences):
+    def _calculate_rich_scores(self, df, positions, similarities, preferences):
         """Calculate rich scores with multiple factors"""
         scores = similarities.copy()
         
+        # Popularity, rating and vote-count boosts are precomputed per catalog
+        scores += self.quality_boosts['movie' if preferences.get('content_type', 'movie') == 'movie' else 'tv'][positions]
+        
+        # Era preference boost
+        era = preferences.get('era_preference', '')
+        if era == '2020s':
+            recent_boost = (df['release_year'].values[positions] >= 2020).astype(float) * 0.1
+            scores += recent_boost
+        
+        return scores
+
+    def _quality_boost(self, df):
+        """Preference-independent boost of every catalog row"""
+        boost = np.zeros(len(df))
+        
         # Boost popular items
         if 'popularity' in df.columns:
-            popularity_boost = np.log1p(df['popularity'].values) * 0.1
-            scores += popularity_boost
+            boost += np.log1p(df['popularity'].to_numpy(dtype=np.float64)) * 0.1
         
         # Boost highly rated items
         if 'vote_average' in df.columns:
-            rating_boost = (df['vote_average'].values / 10.0) * 0.15
-            scores += rating_boost
+            boost += (df['vote_average'].to_numpy(dtype=np.float64) / 10.0) * 0.15
         
         # Boost items with more votes (reliability)
         if 'vote_count' in df.columns:
-            vote_boost = np.log1p(df['vote_count'].values) * 0.05
-            scores += vote_boost
-        
-        # Era preference boost
-        era = preferences.get('era_preference', '')
-        if era == '2020s':
-            recent_boost = (df['release_year'] >= 2020).astype(float) * 0.1
-            scores += recent_boost
+            boost += np.log1p(df['vote_count'].to_numpy(dtype=np.float64)) * 0.05
         
-        return scores
+        return boost
 
     def get_random_recommendations(self, content_type='movie', limit=20):
         """Get random high-quality recommendations"""
@@ -492,109 +1409,132 @@ class UltraModernRecommendationEngine:
                 # Return fallback data if engine not loaded
                 return self._get_fallback_recommendations(content_type, limit)
             
-            # Get the appropriate dataset
-            df = self.movies_df if content_type == 'movie' else self.tv_df
-            
             # Filter for high quality content
-            quality_df = df[
-                (df['vote_average'] >= 6.0) & 
-                (df['vote_count'] >= 50)
-            ].copy()
+            quality_positions = self._quality_positions(content_type)
             
             # Sample random recommendations
-            if len(quality_df) > limit:
-                recommendations = quality_df.sample(n=limit)
-            else:
-                recommendations = quality_df
-            
-            # Format the results
-            results = []
-            title_col = 'title' if content_type == 'movie' else 'name'
-            
-            for _, item in recommendations.iterrows():
-                result = {
-                    'id': int(item.get('id', 0)),
-                    'title': str(item.get(title_col, 'Unknown')),
-                    'overview': str(item.get('overview', ''))[:200],
-                    'vote_average': float(item.get('vote_average', 0)),
-                    'release_date': str(item.get('release_date', item.get('first_air_date', ''))),
-                    'poster_path': str(item.get('poster_path', ''))
-                }
-                results.append(result)
+            if len(quality_positions) > limit:
+                quality_positions = np.random.choice(quality_positions, size=limit, replace=False)
             
-            return results
+            serializer = self.serializers['movie' if content_type == 'movie' else 'tv']
+            return serializer.records(quality_positions)
             
         except Exception as e:
             logger.error(f"Error getting random recommendations: {str(e)}")
             return self._get_fallback_recommendations(content_type, limit)
 
-    def _get_fallback_recommendations(self, content_type, limit):
-        """Generate fallback recommendations when data loading fails"""
-        content_name = 'Movie' if content_type == 'movie' else 'TV Show'
-        genres = ['Action', 'Comedy', 'Drama', 'Thriller', 'Romance', 'Sci-Fi', 'Horror', 'Adventure', 'Animation', 'Documentary']
-        
-        fallback_data = []
-        for i in range(limit):
-            genre = genres[i % len(genres)]
-            fallback_data.append({
-                'id': 1000 + i,
-                'title': f'Popular {content_name} - {genre} #{i+1}',
-                'overview': f'A highly rated {content_name.lower()} from the {genre} genre. This content is popular among viewers and offers great entertainment value.',
-                'vote_average': round(7.0 + (i % 3) * 0.5, 1),
-                'release_date': f'202{3 - (i % 4)}-{(i % 12) + 1:02d}-01',
-                'poster_path': ''
-            })
-        
-        return fallback_data
+    def _quality_positions(self, content_type):
+        """Row positions of well-rated titles with enough votes"""
+        df = self.movies_df if content_type == 'movie' else self.tv_df
+        return np.flatnonzero(
+            (df['vote_average'].to_numpy() >= 6.0) & 
+            (df['vote_count'].to_numpy() >= 50)
+        )
+
+    def _get_fallback_recommendations(self, content_type, limit, kind='picks'):
+        """Real titles from the cold-start payload, or [] if it has not been built"""
+        if not self.cold_start:
+            return []
+        items = self.cold_start.get('movie' if content_type == 'movie' else 'tv', {}).get(kind, [])
+        if kind == 'picks':
+            return random.sample(items, min(limit, len(items)))
+        return items[:limit]
+
+    def autocomplete_titles(self, prefix, content_type='both', limit=8):
+        """Most popular titles starting with the prefix, across the requested catalogs"""
+        content_types = ['movie', 'tv'] if content_type == 'both' else ['movie' if content_type == 'movie' else 'tv']
+        suggestions = []
+        for key in content_types:
+            serializer = self.serializers[key]
+            positions = self.autocomplete[key].lookup(prefix, limit)
+            suggestions.extend(
+                {'id': item_id, 'title': title, 'content_type': key, '_popularity': popularity}
+                for item_id, title, popularity in zip(
+                    serializer.ids[positions].tolist(), serializer.titles[positions].tolist(),
+                    serializer.popularity[positions].tolist()
+                )
+            )
+        if len(content_types) > 1:
+            suggestions.sort(key=lambda suggestion: suggestion['_popularity'], reverse=True)
+        for suggestion in suggestions:
+            del suggestion['_popularity']
+        return suggestions[:limit]
+
+    def search_content(self, query, content_type='movie', limit=20):
+        """BM25-ranked full-text search over titles, overviews and genres"""
+        key = 'movie' if content_type == 'movie' else 'tv'
+        positions, _ = self.search_indexes[key].search(query, limit)
+        if len(positions) < self.FUZZY_MIN_RESULTS:
+            # Likely a misspelled title: append typo-tolerant matches after the exact hits
+            fuzzy = self.fuzzy_matchers[key].match(query, limit)
+            positions = np.concatenate([positions, fuzzy[~np.isin(fuzzy, positions)]])[:limit]
+        return self.serializers[key].records(positions)
+
+    def get_similar_titles(self, content_type, title_id, limit=12):
+        """Titles most similar to a title, from its precomputed neighbour list; None for unknown ids"""
+        key = 'movie' if content_type == 'movie' else 'tv'
+        timer = StageTimer(STAGE_SECONDS, 'similar')
+        neighbors = self.neighbors[key]
+        position = neighbors.position(title_id)
+        if position is None:
+            return None
+        positions, scores = neighbors.similar(position, limit)
+        timer.mark('lookup')
+        records = self.serializers[key].records(positions, scores=scores)
+        timer.mark('serialize')
+        return records
 
-    def get_trending_content(self, content_type='movie', limit=24):
+    def get_trending_content(self, content_type='movie', limit=24, genre=None):
         """Get trending/popular content"""
         try:
             if not self.is_loaded:
-                # Return fallback data if engine not loaded
-                return self._get_fallback_recommendations(content_type, limit)
-            
-            # Get the appropriate dataset
-            df = self.movies_df if content_type == 'movie' else self.tv_df
-            
-            # Sort by popularity and rating
-            trending_df = df[
-                (df['vote_average'] >= 5.0) & 
-                (df['vote_count'] >= 100)
-            ].copy()
-            
-            # Create a trending score combining vote average and vote count
-            trending_df['trending_score'] = (
-                trending_df['vote_average'] * 0.7 + 
-                np.log1p(trending_df['vote_count']) * 0.3
-            )
-            
-            # Sort by trending score and get top results
-            trending_content = trending_df.nlargest(limit, 'trending_score')
-            
-            # Format the results
-            results = []
-            title_col = 'title' if content_type == 'movie' else 'name'
-            
-            for _, item in trending_content.iterrows():
-                result = {
-                    'id': int(item.get('id', 0)),
-                    'title': str(item.get(title_col, 'Unknown')),
-                    'overview': str(item.get('overview', ''))[:200],
-                    'vote_average': float(item.get('vote_average', 0)),
-                    'release_date': str(item.get('release_date', item.get('first_air_date', ''))),
-                    'poster_path': str(item.get('poster_path', ''))
-                }
-                results.append(result)
+                # Serve the cold-start ranking until the engine is loaded
+                return self._get_fallback_recommendations(content_type, limit, kind='trending')
             
-            return results
+            # Rankings are materialized at load time
+            return self.trending['movie' if content_type == 'movie' else 'tv'].records(limit, genre)
             
         except Exception as e:
             logger.error(f"Error getting trending content: {str(e)}")
-            return self._get_fallback_recommendations(content_type, limit)
+            return self._get_fallback_recommendations(content_type, limit, kind='trending')
 
 # Initialize the ultra modern recommendation engine
 recommendation_engine = UltraModernRecommendationEngine()
+REGISTRY.register_collector(recommendation_engine.metric_families)
+REQUEST_SECONDS = REGISTRY.histogram('nextflix_request_seconds', 'End-to-end request latency', ('endpoint',))
+MAX_BATCH_SIZE = 5000
+MAX_INGEST_SIZE = 10000
+
+def not_ready_response(**extra):
+    """503 with a Retry-After hint while the engine loads, or the load error once it has failed"""
+    recommendation_engine.start_background_load()
+    readiness = recommendation_engine.readiness()
+    if readiness['state'] == 'failed':
+        reload_in = readiness['reload_in']
+        body = {
+            'error': f"Engine failed to load: {readiness['error']}",
+            'failed_at': readiness['failed_at'],
+            'reload_scheduled': reload_in is not None
+        }
+    else:
+        body = {'error': 'Engine is still loading, retry shortly'}
+    response = jsonify({**body, 'success': False, 'readiness': readiness, **extra})
+    response.status_code = 503
+    # No Retry-After once every load attempt has failed: retrying cannot succeed before a restart
+    retry_after = recommendation_engine.retry_after()
+    if retry_after is not None:
+        response.headers['Retry-After'] = str(retry_after)
+    return response
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def observe_request_latency(response):
+    if 'request_start' in g:
+        REQUEST_SECONDS.observe(time.perf_counter() - g.request_start, request.endpoint or 'unmatched')
+    return response
 
 @app.route('/')
 def index():
@@ -622,11 +1562,28 @@ def health_check():
             'version': '2.0.0-ultra-modern'
         }
         
+        if recommendation_engine.load_stats:
+            status['memory'] = recommendation_engine.load_stats
+        # Per-process view: with a preloading master most of the model is shared between workers
+        status['process'] = {'pid': os.getpid(), **(memory_sharing_mb() or {})}
+        status['cache'] = recommendation_engine.cache.stats()
+        if recommendation_engine.drift:
+            status['drift'] = recommendation_engine.drift_report()
+        
         if not recommendation_engine.is_loaded:
-            # Load data in background
-            threading.Thread(target=recommendation_engine.load_data_optimized, daemon=True).start()
+            # Only ever one loader thread, however often this is polled
+            recommendation_engine.start_background_load()
             status['message'] = 'Loading rich datasets in background...'
         
+        readiness = status['readiness'] = recommendation_engine.readiness()
+        if readiness['state'] == 'failed':
+            # A dead loader is reported so orchestrators can restart the process
+            status.update(status='unhealthy', error=readiness['error'], failed_at=readiness['failed_at'],
+                          message='Model load failed' + (
+                              f", retrying in {readiness['reload_in']}s" if readiness['reload_in'] is not None
+                              else ', no further attempts until restart'))
+            return jsonify(status), 503
+        
         return jsonify(status)
     except Exception as e:
         return jsonify({
@@ -635,14 +1592,25 @@ def health_check():
             'timestamp': datetime.now().isoformat()
         }), 500
 
+@app.route('/metrics')
+def metrics():
+    """Stage latencies, cache ratios, catalog sizes and load stages in Prometheus text format"""
+    return Response(REGISTRY.render(), content_type=METRICS_CONTENT_TYPE)
+
+@app.route('/ready')
+def ready_check():
+    """Readiness probe: 200 once the model is loaded, 503 with load progress before"""
+    if not recommendation_engine.is_loaded:
+        return not_ready_response()
+    return jsonify({'success': True, 'readiness': recommendation_engine.readiness()})
+
 @app.route('/recommendations', methods=['POST'])
 @app.route('/recommend', methods=['POST'])
 def get_recommendations():
     """Ultra-fast rich recommendation endpoint"""
     try:
-        # Load engine if not loaded
         if not recommendation_engine.is_loaded:
-            recommendation_engine.load_data_optimized()
+            return not_ready_response(recommendations=[], count=0)
         
         # Get preferences
         preferences = request.get_json()
@@ -680,13 +1648,52 @@ def get_recommendations():
             'success': False
         }), 500
 
+@app.route('/recommend/batch', methods=['POST'])
+def get_batch_recommendations():
+    """Recommendations for many preference sets in one call, for internal clients"""
+    try:
+        if not recommendation_engine.is_loaded:
+            return not_ready_response(results=[], count=0)
+        
+        payload = request.get_json(silent=True) or {}
+        preferences_list = payload.get('preferences')
+        if not isinstance(preferences_list, list) or not preferences_list:
+            return jsonify({'error': 'A non-empty "preferences" list is required', 'success': False}), 400
+        if len(preferences_list) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'At most {MAX_BATCH_SIZE} preference sets per batch', 'success': False}), 400
+        
+        # Same defaults as the single recommendation endpoint
+        for preferences in preferences_list:
+            preferences.setdefault('content_type', 'movie')
+            preferences.setdefault('genres', ['action'])
+            preferences.setdefault('min_rating', 0)
+            preferences.setdefault('result_count', 10)
+        
+        start_time = time.time()
+        batch_results = recommendation_engine.get_batch_recommendations(preferences_list)
+        processing_time = time.time() - start_time
+        
+        logger.info(f"✨ Generated recommendations for {len(batch_results)} preference sets in {processing_time:.3f}s")
+        return jsonify({
+            'results': [
+                {'recommendations': recommendations, 'count': len(recommendations)}
+                for recommendations in batch_results
+            ],
+            'count': len(batch_results),
+            'processing_time': f"{processing_time:.3f}s",
+            'success': True
+        })
+        
+    except Exception as e:
+        logger.error(f"❌ Error in batch recommendation endpoint: {str(e)}")
+        return jsonify({'error': str(e), 'results': [], 'count': 0, 'success': False}), 500
+
 @app.route('/api/recommendations')
 def get_recommendations_api():
     """API endpoint for the new recommendations page"""
     try:
-        # Load engine if not loaded
         if not recommendation_engine.is_loaded:
-            recommendation_engine.load_data_optimized()
+            return not_ready_response(results={})
         
         # Parse URL parameters
         content_types = request.args.get('content_types', 'movie').split(',')
@@ -697,13 +1704,13 @@ def get_recommendations_api():
         years = request.args.get('years', '')
         min_rating = float(request.args.get('rating', 0))
         
-        results = {}
+        preferences_by_type = {}
         
         for content_type in content_types:
             content_type = content_type.strip()
             
             # Build preferences for this content type
-            preferences = {
+            preferences_by_type[content_type] = {
                 'content_type': content_type,
                 'genres': [g.strip() for g in genres if g.strip()],
                 'languages': [l.strip() for l in languages if l.strip()],
@@ -713,16 +1720,18 @@ def get_recommendations_api():
                 'min_rating': min_rating,
                 'result_count': 20
             }
-            
-            # Get recommendations
-            recommendations = recommendation_engine.get_recommendations(preferences)
-            results[content_type] = recommendations
         
-        return jsonify({
+        # Get recommendations for all content types concurrently
+        results, timed_out = recommendation_engine.get_recommendations_concurrently(preferences_by_type)
+        
+        response = {
             'success': True,
             'results': results,
             'total_count': sum(len(recs) for recs in results.values())
-        })
+        }
+        if timed_out:
+            response['timed_out'] = timed_out
+        return jsonify(response)
         
     except Exception as e:
         logger.error(f"❌ Error in recommendations API: {str(e)}")
@@ -732,46 +1741,117 @@ def get_recommendations_api():
             'results': {}
         }), 500
 
+@app.route('/api/similar/<content_type>/<int:title_id>')
+def api_similar(content_type, title_id):
+    """More-like-this titles for a detail page, read from the precomputed neighbour lists"""
+    try:
+        if content_type not in ['movie', 'tv']:
+            return jsonify({
+                'success': False,
+                'error': 'Invalid content type. Must be "movie" or "tv"'
+            }), 400
+        if not recommendation_engine.is_loaded:
+            return not_ready_response(similar=[], count=0)
+        if not recommendation_engine.has_neighbors():
+            recommendation_engine.start_neighbor_build()
+            progress = recommendation_engine.neighbor_progress
+            response = jsonify({
+                'success': False,
+                'error': ('Similar titles failed to build: ' + progress['error'] if progress['state'] == 'failed'
+                          else 'Similar titles are still being built, retry shortly'),
+                'neighbors': dict(progress),
+                'similar': [],
+                'count': 0
+            })
+            response.status_code = 503
+            retry_after = recommendation_engine.RETRY_AFTER
+            if progress['state'] == 'failed':
+                retry_after = max(retry_after, int(progress['failed_at'] + recommendation_engine.LOAD_RETRY_INTERVAL
+                                                   - time.time()))
+            response.headers['Retry-After'] = str(retry_after)
+            return response
+        
+        # Unparseable limits fall back to the default instead of failing the request
+        limit = max(1, min(request.args.get('limit', 12, type=int), recommendation_engine.SIMILAR_NEIGHBORS))
+        similar = recommendation_engine.get_similar_titles(content_type, title_id, limit)
+        if similar is None:
+            return jsonify({
+                'success': False,
+                'error': f'Unknown {content_type} id {title_id}',
+                'similar': [],
+                'count': 0
+            }), 404
+        
+        return jsonify({
+            'success': True,
+            'id': title_id,
+            'similar': similar,
+            'count': len(similar)
+        })
+        
+    except Exception as e:
+        logger.error(f"❌ Error in similar titles endpoint: {str(e)}")
+        return jsonify({'success': False, 'error': str(e), 'similar': [], 'count': 0}), 500
+
+@app.route('/catalog/ingest', methods=['POST'])
+def ingest_catalog():
+    """
+    Append new titles to the live catalog without a refit; ingest_titles.py also persists them.
+
+    Only the worker serving the request takes the titles. Cache keys carry a
+    hash of each worker's catalog, so workers never serve each other's
+    results; ingest_titles.py and a restart bring every worker to one catalog.
+    """
+    try:
+        if not recommendation_engine.is_loaded:
+            return not_ready_response()
+        
+        payload = request.get_json(silent=True) or {}
+        content_type = payload.get('content_type', 'movie')
+        items = payload.get('items')
+        if content_type not in ['movie', 'tv']:
+            return jsonify({'error': 'Invalid content type. Must be "movie" or "tv"', 'success': False}), 400
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': 'A non-empty "items" list is required', 'success': False}), 400
+        if len(items) > MAX_INGEST_SIZE:
+            return jsonify({'error': f'At most {MAX_INGEST_SIZE} titles per request', 'success': False}), 400
+        
+        summary = recommendation_engine.ingest_titles(content_type, items)
+        return jsonify({'success': True, **summary})
+        
+    except ValueError as e:
+        return jsonify({'error': str(e), 'success': False}), 400
+    except Exception as e:
+        logger.error(f"❌ Error in ingest endpoint: {str(e)}")
+        return jsonify({'error': str(e), 'success': False}), 500
+
 @app.route('/search')
 def search():
     """Rich search endpoint with intelligent filtering"""
     try:
         if not recommendation_engine.is_loaded:
-            return jsonify({'error': 'Engine not loaded yet'}), 503
+            return not_ready_response(results=[], count=0)
         
         query = request.args.get('q', '').strip()
         content_type = request.args.get('type', 'movie')
-        limit = min(int(request.args.get('limit', 20)), 50)
+        limit = max(1, min(request.args.get('limit', 20, type=int), 50))
         
         if not query:
             return jsonify({'results': [], 'count': 0})
         
-        # Get appropriate dataset
-        df = recommendation_engine.movies_df if content_type == 'movie' else recommendation_engine.tv_df
-        
-        # Rich search in title and overview
-        title_col = 'title' if content_type == 'movie' else 'name'
-        if title_col not in df.columns:
-            title_col = 'title' if 'title' in df.columns else 'name'
-        
-        mask = (
-            df[title_col].str.contains(query, case=False, na=False) |
-            df['overview'].str.contains(query, case=False, na=False)
-        )
+        # Matching is case-insensitive, so the key folds case too
+        cache_key = make_cache_key('search', {
+            'model': recommendation_engine.model_fingerprint,
+            'catalog': recommendation_engine.catalog_digest,
+            'query': query.lower(), 'content_type': content_type, 'limit': limit
+        })
+        search_results = recommendation_engine.cache.get(cache_key)
+        if search_results is not None:
+            return jsonify({'results': search_results, 'count': len(search_results), 'query': query})
         
-        results = df[mask].head(limit)
-        
-        search_results = []
-        for _, item in results.iterrows():
-            result = {
-                'id': int(item.get('id', 0)),
-                'title': str(item.get(title_col, 'Unknown')),
-                'overview': str(item.get('overview', ''))[:200],
-                'vote_average': float(item.get('vote_average', 0)),
-                'release_date': str(item.get('release_date', item.get('first_air_date', ''))),
-                'poster_path': str(item.get('poster_path', ''))
-            }
-            search_results.append(result)
+        # Rich search in title, overview and genres
+        search_results = recommendation_engine.search_content(query, content_type, limit)
+        recommendation_engine.cache.set(cache_key, search_results)
         
         return jsonify({
             'results': search_results,
@@ -783,17 +1863,33 @@ def search():
         logger.error(f"❌ Error in search endpoint: {str(e)}")
         return jsonify({'error': str(e), 'results': [], 'count': 0}), 500
 
+@app.route('/autocomplete')
+def autocomplete():
+    """Typeahead suggestions for a title prefix, cheap enough to call per keystroke"""
+    try:
+        if not recommendation_engine.is_loaded:
+            return not_ready_response(suggestions=[])
+        
+        prefix = request.args.get('q', '')
+        content_type = request.args.get('type', 'both')
+        limit = max(1, min(request.args.get('limit', 8, type=int), 10))
+        
+        suggestions = recommendation_engine.autocomplete_titles(prefix, content_type, limit)
+        return jsonify({'query': prefix, 'suggestions': suggestions})
+        
+    except Exception as e:
+        logger.error(f"❌ Error in autocomplete endpoint: {str(e)}")
+        return jsonify({'error': str(e), 'suggestions': []}), 500
+
 @app.route('/surprise_me')
 def surprise_me():
     """Get random surprise recommendations"""
     try:
-        # Ensure engine is loaded
         if not recommendation_engine.is_loaded:
-            recommendation_engine.load_data_optimized()
+            # Random picks from the cold-start payload until the model is ready
+            return cold_start_surprise()
         
         # Generate random preferences for surprise mode
-        import random
-        
         surprise_preferences = {
             'content_type': random.choice(['movie', 'tv']),
             'genres': random.sample(['action', 'comedy', 'drama', 'horror', 'romance', 'sci-fi', 'thriller'], 2),
@@ -819,23 +1915,20 @@ def surprise_me():
     
     except Exception as e:
         logger.error(f"❌ Error in surprise endpoint: {str(e)}")
-        # Return fallback surprise recommendations
-        fallback_surprise = [
-            {
-                'id': i,
-                'title': f'Surprise Movie {i+1}',
-                'overview': 'A surprising movie pick just for you!',
-                'vote_average': 7.5 + (i * 0.2),
-                'release_date': '2023-06-01',
-                'poster_path': ''
-            } for i in range(8)
-        ]
-        
-        return jsonify({
-            'success': True,
-            'recommendations': fallback_surprise,
-            'preferences': {'content_type': 'movie', 'mood': 'surprise'}
-        })
+        return cold_start_surprise()
+
+def cold_start_surprise():
+    """Surprise picks from the cold-start payload, or 503 if none was built"""
+    content_type = random.choice(['movie', 'tv'])
+    recommendations = recommendation_engine._get_fallback_recommendations(content_type, 8)
+    if not recommendations:
+        return not_ready_response(recommendations=[])
+    return jsonify({
+        'success': True,
+        'recommendations': recommendations,
+        'preferences': {'content_type': content_type, 'mood': 'surprise'},
+        'cold_start': True
+    })
 
 # Legacy endpoint for backward compatibility
 @app.route('/get_recommendations', methods=['POST'])
@@ -864,40 +1957,35 @@ def api_recommendations(content_type):
                 'error': 'Invalid content type. Must be "movie" or "tv"'
             }), 400
         
-        # Ensure engine is loaded
-        if not recommendation_engine.is_loaded:
-            recommendation_engine.load_data_optimized()
+        # Random picks come from the cold-start payload until the engine is loaded
+        cold_start = not recommendation_engine.is_loaded
+        if cold_start:
+            recommendation_engine.start_background_load()
         
         recommendations = recommendation_engine.get_random_recommendations(
             content_type=content_type, 
             limit=20
         )
+        if cold_start and not recommendations:
+            return not_ready_response(recommendations=[], count=0)
         
-        return jsonify({
+        response = {
             'success': True,
             'recommendations': recommendations,
             'count': len(recommendations)
-        })
+        }
+        if cold_start:
+            response['cold_start'] = True
+        return jsonify(response)
         
     except Exception as e:
         logger.error(f"Error in API recommendations: {str(e)}")
-        # Return fallback data instead of error
-        fallback_data = [
-            {
-                'id': i,
-                'title': f'Popular {content_type.title()} {i+1}',
-                'overview': f'A great {content_type} that you might enjoy watching.',
-                'vote_average': 7.5 + (i * 0.1),
-                'release_date': '2023-01-01',
-                'poster_path': ''
-            } for i in range(10)
-        ]
-        
         return jsonify({
-            'success': True,
-            'recommendations': fallback_data,
-            'count': len(fallback_data)
-        })
+            'success': False,
+            'error': str(e),
+            'recommendations': [],
+            'count': 0
+        }), 500
 
 @app.route('/api/trending/<content_type>')
 def api_trending(content_type):
@@ -909,41 +1997,35 @@ def api_trending(content_type):
                 'error': 'Invalid content type. Must be "movie" or "tv"'
             }), 400
         
-        # Ensure engine is loaded
-        if not recommendation_engine.is_loaded:
-            recommendation_engine.load_data_optimized()
+        genre = request.args.get('genre')
+        if recommendation_engine.is_loaded:
+            # Serve the pre-serialized ranking without re-encoding it
+            content, count = recommendation_engine.trending[content_type].payload(24, genre)
+            return app.response_class(
+                f'{{"success":true,"content":{content},"count":{count}}}', mimetype='application/json'
+            )
         
-        # Get top-rated content as "trending"
-        trending = recommendation_engine.get_trending_content(
-            content_type=content_type,
-            limit=24
-        )
+        # Overall cold-start ranking until the engine is loaded; genre rankings need the model
+        recommendation_engine.start_background_load()
+        trending = [] if genre else recommendation_engine.get_trending_content(content_type=content_type, limit=24)
+        if not trending:
+            return not_ready_response(content=[], count=0)
         
         return jsonify({
             'success': True,
             'content': trending,
-            'count': len(trending)
+            'count': len(trending),
+            'cold_start': True
         })
         
     except Exception as e:
         logger.error(f"Error in API trending: {str(e)}")
-        # Return fallback trending data
-        fallback_trending = [
-            {
-                'id': i,
-                'title': f'Trending {content_type.title()} {i+1}',
-                'overview': f'A trending {content_type} that\'s popular right now.',
-                'vote_average': 8.0 + (i * 0.1),
-                'release_date': '2024-01-01',
-                'poster_path': ''
-            } for i in range(12)
-        ]
-        
         return jsonify({
-            'success': True,
-            'content': fallback_trending,
-            'count': len(fallback_trending)
-        })
+            'success': False,
+            'error': str(e),
+            'content': [],
+            'count': 0
+        }), 500
 
 if __name__ == '__main__':
     # Ultra modern configuration
@@ -963,17 +2045,8 @@ if __name__ == '__main__':
     # Start the Flask app first, then load data in background
     logger.info("🚀 Starting application server...")
     
-    def load_data_background():
-        """Load recommendation engine in background"""
-        try:
-            logger.info("🔄 Loading recommendation engine in background...")
-            recommendation_engine.load_data_optimized()
-            logger.info("✅ Recommendation engine loaded successfully!")
-        except Exception as e:
-            logger.warning(f"⚠️ Engine will use fallback data: {str(e)}")
-    
-    # Start background loading
-    threading.Thread(target=load_data_background, daemon=True).start()
+    # Start background loading; cold-start data is served meanwhile
+    recommendation_engine.start_background_load()
     
     try:
         app.run(
@@ -0,0 +1,271 @@
+"""
+NextFlix AI - Benchmark Suite
+Times loading, recommendations, search and trending on a synthetic TMDB-like catalog and reports JSON
+
+    python benchmark.py --movies 100000 --tv 50000 --output results.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import logging
+import platform
+import tempfile
+import contextlib
+import subprocess
+
+import numpy as np
+import pandas as pd
+
+from utils.synthetic import SyntheticCatalog
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Representative preference mixes, from a bare request to every filter at once
+APP_PREFERENCES = {
+    'movie_genre': {'content_type': 'movie', 'genres': ['action']},
+    'movie_genres_mood': {'content_type': 'movie', 'genres': ['comedy', 'romance'], 'mood': 'happy'},
+    'movie_all_filters': {
+        'content_type': 'movie', 'genres': ['drama'], 'languages': ['english'], 'runtime': 'standard',
+        'min_rating': 7, 'era_preference': '2010s', 'mood': 'sad'
+    },
+    'movie_no_preferences': {'content_type': 'movie'},
+    'tv_genres_mood': {'content_type': 'tv', 'genres': ['crime', 'mystery'], 'mood': 'mysterious'},
+    'tv_language': {'content_type': 'tv', 'languages': ['japanese', 'korean'], 'era_preference': '2000s'}
+}
+LEGACY_PREFERENCES = {
+    'both_genre': {'content_type': 'both', 'genres': ['Action']},
+    'movies_filtered': {'content_type': 'movies', 'genres': ['Drama'], 'language': 'en', 'recency': 'New'},
+    'series_short': {'content_type': 'series', 'genres': ['Comedy'], 'time_availability': '<30 min'},
+    'both_favorites': {'content_type': 'both', 'favorites': 'detective murder investigation'}
+}
+# Common words, rare topic words, a multi-word query and a misspelling answered by fuzzy matching
+SEARCH_QUERIES = ['love', 'wedding', 'detective murder', 'haunted house', 'spaceship alien', 'misadventur']
+TRENDING_GENRES = [None, 'drama', 'comedy']
+# Batch preference sets are drawn from these, so filter groups and exact repeats recur as in real traffic
+BATCH_GENRES = ['action', 'comedy', 'drama', 'horror', 'romance', 'sci-fi', 'thriller']
+BATCH_MOODS = ['', 'happy', 'sad', 'excited', 'relaxed', 'mysterious']
+BATCH_ERAS = ['', '', '2010s', '2000s']
+
+
+def measure(fn, repeat, before=None):
+    """Latency of repeated calls in milliseconds; before() runs untimed ahead of each call"""
+    timings = []
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        start_time = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start_time) * 1000)
+    timings = np.array(timings)
+    return {
+        'runs': repeat,
+        'mean_ms': round(float(timings.mean()), 3),
+        'p50_ms': round(float(np.percentile(timings, 50)), 3),
+        'p95_ms': round(float(np.percentile(timings, 95)), 3),
+        'min_ms': round(float(timings.min()), 3)
+    }
+
+
+def timed(fn):
+    """Result of one call and its duration in seconds"""
+    start_time = time.perf_counter()
+    result = fn()
+    return result, round(time.perf_counter() - start_time, 3)
+
+
+def batch_preferences(n, seed):
+    """Random preference sets with the defaults the batch endpoint applies"""
+    rng = np.random.default_rng(seed)
+    return [{
+        'content_type': str(rng.choice(['movie', 'tv'])),
+        'genres': [str(genre) for genre in rng.choice(BATCH_GENRES, size=rng.integers(1, 3), replace=False)],
+        'mood': str(rng.choice(BATCH_MOODS)),
+        'era_preference': str(rng.choice(BATCH_ERAS)),
+        'min_rating': int(rng.choice([0, 0, 6, 7])),
+        'result_count': 10
+    } for _ in range(n)]
+
+
+def bench_batch(engine, batch_size, repeat, seed):
+    """One batch call against looping get_recommendations over the same preference sets"""
+    preferences_list = batch_preferences(batch_size, seed)
+    batch = engine.get_batch_recommendations(preferences_list)
+    loop = [engine.get_recommendations(dict(preferences)) for preferences in preferences_list]
+    report = {
+        'preference_sets': batch_size,
+        'distinct_filters': len({engine._filter_signature(preferences) for preferences in preferences_list}),
+        'mismatches': sum(
+            [record['id'] for record in a] != [record['id'] for record in b] for a, b in zip(batch, loop)
+        ),
+        'batch': measure(lambda: engine.get_batch_recommendations(preferences_list), repeat, engine.cache.clear),
+        'loop': measure(lambda: [engine.get_recommendations(dict(preferences)) for preferences in preferences_list],
+                        repeat, engine.cache.clear)
+    }
+    report['speedup'] = round(report['loop']['mean_ms'] / report['batch']['mean_ms'], 2)
+    return report
+
+
+def bench_app(data_dir, repeat, full_catalog, batch_size=2000, batch_repeat=3, seed=42):
+    """Benchmark the UltraModernRecommendationEngine served by app.py"""
+    snapshot_dir = tempfile.mkdtemp(prefix='nextflix-benchmark-snapshot-')
+    # The engine reads its configuration from the environment when app is imported
+    os.environ.update({
+        'NEXTFLIX_DATA_DIR': data_dir,
+        'NEXTFLIX_SNAPSHOT_DIR': snapshot_dir,
+        'NEXTFLIX_CACHE_BACKEND': 'memory',
+        'NEXTFLIX_FULL_CATALOG': '1' if full_catalog else '0'
+    })
+    import app as nextflix
+    engine = nextflix.recommendation_engine
+    report = {}
+    try:
+        _, fit_seconds = timed(lambda: engine.load_data_optimized(use_snapshot=False))
+        report['load'] = {
+            'fit_s': fit_seconds,
+            'stages': engine.readiness()['stages'],
+            'memory': engine.load_stats
+        }
+        _, save_seconds = timed(engine.save_snapshot)
+        warm = nextflix.UltraModernRecommendationEngine(snapshot_dir=snapshot_dir, data_dir=data_dir)
+        _, snapshot_seconds = timed(warm.load_data_optimized)
+        report['load'].update(snapshot_save_s=save_seconds, snapshot_load_s=snapshot_seconds)
+        del warm
+
+        # Every timed call starts from an empty result cache
+        report['get_recommendations'] = {}
+        for name, preferences in APP_PREFERENCES.items():
+            results = engine.get_recommendations(dict(preferences))
+            report['get_recommendations'][name] = dict(
+                measure(lambda: engine.get_recommendations(dict(preferences)), repeat, engine.cache.clear),
+                results=len(results)
+            )
+
+        # Sets repeat within the batch, so the loop is timed with its result cache on as well
+        report['get_batch_recommendations'] = bench_batch(engine, batch_size, batch_repeat, seed)
+        
+        client = nextflix.app.test_client()
+        report['search'] = {}
+        for content_type in ('movie', 'tv'):
+            for query in SEARCH_QUERIES:
+                params = {'q': query, 'type': content_type}
+                response = client.get('/search', query_string=params)
+                if response.status_code != 200:
+                    raise RuntimeError(f"/search returned {response.status_code}: {response.get_data(as_text=True)}")
+                report['search'][f'{content_type}:{query}'] = dict(
+                    measure(lambda: client.get('/search', query_string=params), repeat, engine.cache.clear),
+                    results=response.get_json()['count']
+                )
+
+        report['get_trending_content'] = {}
+        for content_type in ('movie', 'tv'):
+            for genre in TRENDING_GENRES:
+                results = engine.get_trending_content(content_type, genre=genre)
+                report['get_trending_content'][f'{content_type}:{genre or "all"}'] = dict(
+                    measure(lambda: engine.get_trending_content(content_type, genre=genre), repeat),
+                    results=len(results)
+                )
+    finally:
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+    return report
+
+
+def bench_legacy(movies_path, tv_path, repeat):
+    """Benchmark the RecommendationEngine in recommend.py"""
+    from recommend import RecommendationEngine
+    engine = RecommendationEngine(movies_path, tv_path)
+    report = {}
+    # recommend.py reports progress on stdout, which carries the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        _, load_seconds = timed(engine.load_and_preprocess_data)
+        report['load'] = {'load_s': load_seconds, 'items': {'movie': len(engine.movies_df), 'tv': len(engine.series_df)}}
+
+        report['get_recommendations'] = {}
+        for name, preferences in LEGACY_PREFERENCES.items():
+            results = engine.get_recommendations(preferences)
+            report['get_recommendations'][name] = dict(
+                measure(lambda: engine.get_recommendations(preferences), repeat), results=len(results)
+            )
+
+        report['search_content'] = {}
+        for query in SEARCH_QUERIES:
+            results = engine.search_content(query)
+            report['search_content'][query] = dict(
+                measure(lambda: engine.search_content(query), repeat), results=len(results)
+            )
+
+        report['get_trending_content'] = {}
+        for content_type in ('movies', 'series', 'both'):
+            results = engine.get_trending_content(content_type)
+            report['get_trending_content'][content_type] = dict(
+                measure(lambda: engine.get_trending_content(content_type), repeat), results=len(results)
+            )
+    return report
+
+
+def environment():
+    """Code version and platform details needed to compare runs"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=BASE_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark NextFlix engines on a synthetic TMDB-like catalog')
+    parser.add_argument('--movies', type=int, default=10000, help='Synthetic movie rows')
+    parser.add_argument('--tv', type=int, default=5000, help='Synthetic TV rows')
+    parser.add_argument('--seed', type=int, default=42, help='Catalog generator seed')
+    parser.add_argument('--repeat', type=int, default=20, help='Timed calls per query')
+    parser.add_argument('--data-dir', help='Where to write the catalog (reused when it matches); '
+                                           'defaults to a directory under the system temp dir')
+    parser.add_argument('--batch-size', type=int, default=2000, help='Preference sets per batch call')
+    parser.add_argument('--batch-repeat', type=int, default=3, help='Timed batch calls (and loops)')
+    parser.add_argument('--full-catalog', action='store_true', help='Benchmark app.py in full-catalog mode')
+    parser.add_argument('--skip-legacy', action='store_true', help='Do not benchmark recommend.py')
+    parser.add_argument('--output', help='Also write the JSON report to this path')
+    args = parser.parse_args()
+
+    catalog = SyntheticCatalog(args.movies, args.tv, args.seed)
+    data_dir = args.data_dir or os.path.join(
+        tempfile.gettempdir(), f'nextflix-benchmark-{args.movies}-{args.tv}-{args.seed}'
+    )
+    (movies_path, tv_path), generate_seconds = timed(lambda: catalog.write(data_dir))
+    logger.info(f"🧪 Synthetic catalog ready in {data_dir} ({generate_seconds:.2f}s)")
+
+    report = {
+        'environment': environment(),
+        'catalog': dict(catalog.params(), data_dir=data_dir),
+        'config': {'repeat': args.repeat, 'full_catalog': args.full_catalog,
+                   'batch_size': args.batch_size, 'batch_repeat': args.batch_repeat},
+        'app': bench_app(data_dir, args.repeat, args.full_catalog, args.batch_size, args.batch_repeat, args.seed)
+    }
+    if not args.skip_legacy:
+        report['recommend'] = bench_legacy(movies_path, tv_path, args.repeat)
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        logger.info(f"📊 Benchmark report written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+NextFlix AI - Embedding Precision Evaluation
+Reports recall@k, memory and query latency of float32 and int8 item embeddings against float64
+"""
+
+import sys
+import json
+import time
+import argparse
+import logging
+
+import numpy as np
+
+from app import recommendation_engine
+from utils.scoring import l2_normalize_rows, l2_normalize_vector, top_k_indices
+from utils.quantization import QuantizedEmbeddings
+
+logger = logging.getLogger(__name__)
+
+GENRES = ['action', 'comedy', 'drama', 'horror', 'romance', 'sci-fi', 'thriller', 'documentary', 'animation']
+MOODS = ['', 'happy', 'sad', 'excited', 'relaxed', 'adventurous', 'romantic', 'mysterious', 'funny']
+
+
+def build_queries(engine, content_type, matrix, n_items, rng):
+    """Preference queries for every genre and mood, plus rows of random catalog items"""
+    embedder = engine.query_embedders[content_type]
+    queries = [
+        embedder.transform(engine._create_user_query({'genres': [genre], 'mood': mood}))[0]
+        for genre in GENRES for mood in MOODS
+    ]
+    rows = rng.choice(len(matrix), size=min(n_items, len(matrix)), replace=False)
+    queries.extend(np.asarray(matrix[rows], dtype=np.float64))
+    return [query for query in queries if np.any(query)]
+
+
+def timed_top_k(score_fn, queries, k):
+    """Top-k positions for every query and the mean latency in milliseconds"""
+    start_time = time.perf_counter()
+    results = [score_fn(query, k) for query in queries]
+    return results, (time.perf_counter() - start_time) * 1000 / max(len(queries), 1)
+
+
+def recall(exact, approx):
+    return float(np.mean([len(np.intersect1d(e, a)) / max(len(e), 1) for e, a in zip(exact, approx)]))
+
+
+def evaluate(engine, content_type, ks, candidate_pools, n_items, rng):
+    matrix = engine.movie_tfidf_matrix if content_type == 'movie' else engine.tv_tfidf_matrix
+    baseline = l2_normalize_rows(matrix, dtype=np.float64)
+    float32 = l2_normalize_rows(matrix, dtype=np.float32)
+    int8 = QuantizedEmbeddings.quantize(float32)
+    everything = np.arange(len(baseline))
+    queries = build_queries(engine, content_type, matrix, n_items, rng)
+
+    def exact(embeddings):
+        return lambda query, k: top_k_indices(embeddings @ l2_normalize_vector(query, dtype=embeddings.dtype), k)
+
+    def quantized(pool):
+        def search(query, k):
+            top = top_k_indices(int8.scores(everything, query), max(k, pool))
+            if pool:
+                top = top[top_k_indices(int8.rerank(top, query), k)]
+            return top[:k]
+        return search
+
+    variants = {'float32': (exact(float32), float32.nbytes)}
+    variants['int8'] = (quantized(0), int8.nbytes)
+    for pool in candidate_pools:
+        variants[f'int8_rerank_{pool}'] = (quantized(pool), int8.nbytes)
+
+    report = {
+        'items': len(baseline),
+        'dimensions': baseline.shape[1],
+        'queries': len(queries),
+        'float64': {'memory_mb': round(baseline.nbytes / 2**20, 2)}
+    }
+    for k in ks:
+        truth, latency = timed_top_k(exact(baseline), queries, k)
+        report['float64'][f'latency_ms@{k}'] = round(latency, 3)
+        for name, (search, nbytes) in variants.items():
+            results, latency = timed_top_k(search, queries, k)
+            entry = report.setdefault(name, {'memory_mb': round(nbytes / 2**20, 2)})
+            entry[f'recall@{k}'] = round(recall(truth, results), 4)
+            entry[f'latency_ms@{k}'] = round(latency, 3)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Evaluate reduced-precision item embeddings against float64')
+    parser.add_argument('--k', type=int, nargs='+', default=[10, 50], help='Cut-offs for recall@k')
+    parser.add_argument('--candidates', type=int, nargs='+', default=[50, 200, 1000],
+                        help='Int8 candidate pool sizes re-ranked with float rows')
+    parser.add_argument('--items', type=int, default=200, help='Random catalog items used as queries')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Also write the JSON report to this path')
+    args = parser.parse_args()
+
+    engine = recommendation_engine
+    engine.load_data_optimized()
+    rng = np.random.default_rng(args.seed)
+    report = {
+        content_type: evaluate(engine, content_type, args.k, args.candidates, args.items, rng)
+        for content_type in ('movie', 'tv')
+    }
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        logger.info(f"📊 Embedding evaluation written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
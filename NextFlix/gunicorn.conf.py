@@ -0,0 +1,45 @@
+"""
+NextFlix AI - Gunicorn configuration
+Loads the model snapshot once in the master so forked workers share its memory
+
+    gunicorn app:app
+"""
+
+import gc
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '4'))
+threads = int(os.environ.get('GUNICORN_THREADS', '4'))
+timeout = 120
+
+# Import the app, and with it the engine, in the master before forking
+preload_app = True
+
+
+def when_ready(server):
+    """Warm start the model in the master from its snapshot, then freeze it so workers share its pages"""
+    from app import recommendation_engine
+    try:
+        # A refit would hold back every worker; they start instead and serve cold-start data while they load
+        if not recommendation_engine.warm_start_available():
+            logger.warning("⚠️ No model snapshot to warm start from, workers will load in the background")
+            return
+        recommendation_engine.load_data_optimized()
+    except Exception as e:
+        # Workers fall back to loading in the background and serving cold-start data
+        logger.warning(f"⚠️ Model could not be preloaded: {str(e)}")
+        return
+    # Objects the collector never visits are never written, so copy-on-write keeps them shared
+    gc.collect()
+    gc.freeze()
+    logger.info("🧊 Model preloaded and frozen for copy-on-write sharing across workers")
+
+
+def post_worker_init(worker):
+    """Start loading in workers that did not inherit a preloaded model"""
+    from app import recommendation_engine
+    recommendation_engine.start_background_load()
@@ -3,25 +3,54 @@ import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.preprocessing import StandardScaler
-import re
 import pickle
 import os
 from datetime import datetime
+from functools import partial
 import random
 
+from utils.columnar import ColumnarStore
+from utils.serialize import nullable_int_list, truncate_list, zip_records
+from utils.search_index import InvertedIndex
+from utils.fuzzy import FuzzyTitleMatcher
+from utils.parallel import map_chunks
+
 class RecommendationEngine:
-    def __init__(self, movies_path, series_path):
+    # Columns needed for scoring and formatting when reading a columnar catalog
+    MOVIE_COLUMNS = ['id', 'title', 'overview', 'genres', 'cast', 'director', 'original_language',
+                     'vote_average', 'vote_count', 'runtime', 'year', 'poster_path',
+                     'popularity_score', 'content_type', 'adult']
+    SERIES_COLUMNS = ['id', 'title', 'overview', 'genres', 'original_language', 'vote_average',
+                      'vote_count', 'number_of_seasons', 'number_of_episodes', 'episode_run_time',
+                      'year', 'poster_path', 'popularity_score', 'content_type']
+    
+    # BM25 field weights for full-text search
+    SEARCH_FIELDS = {'title': 3.0, 'overview': 1.0, 'genres': 1.5}
+    FUZZY_MIN_RESULTS = 3  # Fewer exact hits than this adds typo-tolerant title matches
+    
+    def __init__(self, movies_path, series_path, processed_dir=None, workers=1):
         self.movies_path = movies_path
         self.series_path = series_path
+        self.processed_dir = processed_dir
+        self.workers = workers  # Processes cleaning raw CSV chunks in parallel
         self.movies_df = None
         self.series_df = None
         self.tfidf_vectorizer = None
         self.movies_tfidf_matrix = None
         self.series_tfidf_matrix = None
         self.content_similarity_matrix = None
+        self.trending = None
+        self.search_indexes = None
+        self.fuzzy_matchers = None
         
     def load_and_preprocess_data(self):
         """Load and preprocess TMDB datasets efficiently"""
+        if self._load_processed_catalogs():
+            self._create_content_features()
+            self._materialize_trending()
+            self._build_search_indexes()
+            return
+        
         print("Loading TMDB datasets...")
         
         # Load movies dataset with error handling for columns
@@ -41,9 +70,9 @@ class RecommendationEngine:
         movies_cols = [col for col in preferred_movies_cols if col in available_movies_cols]
         print(f"Using movie columns: {movies_cols}")
         
-        for chunk in pd.read_csv(self.movies_path, chunksize=chunk_size, usecols=movies_cols):
-            # Basic preprocessing for each chunk
-            chunk = self._preprocess_chunk(chunk, 'movie')
+        # Basic preprocessing for each chunk, in worker processes if configured, keeping file order
+        reader = pd.read_csv(self.movies_path, chunksize=chunk_size, usecols=movies_cols)
+        for chunk in map_chunks(partial(RecommendationEngine._preprocess_chunk, content_type='movie'), reader, self.workers):
             movies_chunks.append(chunk)
         
         self.movies_df = pd.concat(movies_chunks, ignore_index=True)
@@ -61,8 +90,8 @@ class RecommendationEngine:
         print(f"Using series columns: {series_cols}")
         
         series_chunks = []
-        for chunk in pd.read_csv(self.series_path, chunksize=chunk_size, usecols=series_cols):
-            chunk = self._preprocess_chunk(chunk, 'series')
+        reader = pd.read_csv(self.series_path, chunksize=chunk_size, usecols=series_cols)
+        for chunk in map_chunks(partial(RecommendationEngine._preprocess_chunk, content_type='series'), reader, self.workers):
             series_chunks.append(chunk)
             
         self.series_df = pd.concat(series_chunks, ignore_index=True)
@@ -71,9 +100,29 @@ class RecommendationEngine:
         
         # Create content-based features
         self._create_content_features()
+        self._materialize_trending()
+        self._build_search_indexes()
+        
+    def _load_processed_catalogs(self):
+        """Read only the needed columns from a columnar processed catalog, if one exists"""
+        if not self.processed_dir:
+            return False
         
-    def _preprocess_chunk(self, chunk, content_type):
-        """Preprocess individual chunks of data"""
+        movies_store = ColumnarStore(os.path.join(self.processed_dir, 'movies'))
+        series_store = ColumnarStore(os.path.join(self.processed_dir, 'series'))
+        if not (movies_store.exists() and series_store.exists()):
+            return False
+        
+        print(f"Loading processed catalogs from {self.processed_dir}...")
+        self.movies_df = movies_store.read(self.MOVIE_COLUMNS)
+        self.series_df = series_store.read(self.SERIES_COLUMNS)
+        
+        print(f"Loaded {len(self.movies_df)} movies and {len(self.series_df)} series")
+        return True
+    
+    @staticmethod
+    def _preprocess_chunk(chunk, content_type):
+        """Preprocess individual chunks of data; static so worker processes can run it"""
         # Handle missing values
         essential_cols = ['title', 'overview'] if content_type == 'movie' else ['name', 'overview']
         if content_type == 'series' and 'name' in chunk.columns:
@@ -89,17 +138,17 @@ class RecommendationEngine:
         
         # Clean and standardize text fields
         if 'title' in chunk.columns:
-            chunk['title'] = chunk['title'].astype(str).apply(self._clean_text)
+            chunk['title'] = RecommendationEngine._clean_text_column(chunk['title'].astype(str))
         if 'overview' in chunk.columns:
-            chunk['overview'] = chunk['overview'].astype(str).apply(self._clean_text)
+            chunk['overview'] = RecommendationEngine._clean_text_column(chunk['overview'].astype(str))
         if 'genres' in chunk.columns:
-            chunk['genres'] = chunk['genres'].fillna('').astype(str).apply(self._clean_genres)
+            chunk['genres'] = RecommendationEngine._clean_genres_column(chunk['genres'].fillna('').astype(str))
         
         # Handle cast and director if available
         if 'cast' in chunk.columns:
-            chunk['cast'] = chunk['cast'].fillna('').astype(str).apply(self._clean_text)
+            chunk['cast'] = RecommendationEngine._clean_text_column(chunk['cast'].fillna('').astype(str))
         if 'director' in chunk.columns:
-            chunk['director'] = chunk['director'].fillna('').astype(str).apply(self._clean_text)
+            chunk['director'] = RecommendationEngine._clean_text_column(chunk['director'].fillna('').astype(str))
         
         # Clean numeric fields
         if 'vote_average' in chunk.columns:
@@ -149,31 +198,24 @@ class RecommendationEngine:
         chunk['content_type'] = content_type
         
         # Calculate popularity score
-        chunk['popularity_score'] = self._calculate_popularity_score(chunk)
+        chunk['popularity_score'] = RecommendationEngine._calculate_popularity_score(chunk)
         
         return chunk
     
-    def _clean_text(self, text):
-        """Clean text data"""
-        if pd.isna(text):
-            return ""
-        text = str(text).lower()
-        # Remove special characters and extra spaces
-        text = re.sub(r'[^a-zA-Z0-9\s]', ' ', text)
-        text = re.sub(r'\s+', ' ', text).strip()
-        return text
+    @staticmethod
+    def _clean_text_column(texts):
+        """Lowercase and strip special characters and extra spaces from a Series of strings"""
+        texts = texts.str.lower().str.replace(r'[^a-zA-Z0-9\s]', ' ', regex=True)
+        return texts.str.replace(r'\s+', ' ', regex=True).str.strip().fillna('')
     
-    def _clean_genres(self, genres):
-        """Clean and process genres"""
-        if pd.isna(genres):
-            return ""
-        # Handle both comma and pipe separated genres
-        genres = str(genres).replace('|', ',').lower()
-        # Remove extra spaces and standardize
-        genres = re.sub(r'\s+', ' ', genres).strip()
-        return genres
+    @staticmethod
+    def _clean_genres_column(genres):
+        """Lowercase a Series of comma or pipe separated genres, standardizing separators and spaces"""
+        genres = genres.str.replace('|', ',', regex=False).str.lower()
+        return genres.str.replace(r'\s+', ' ', regex=True).str.strip().fillna('')
     
-    def _calculate_popularity_score(self, df):
+    @staticmethod
+    def _calculate_popularity_score(df):
         """Calculate a normalized popularity score"""
         # Handle missing columns gracefully
         vote_avg = df.get('vote_average', pd.Series([5.0] * len(df)))
@@ -326,8 +368,6 @@ class RecommendationEngine:
     
     def _get_content_recommendations(self, df, tfidf_matrix, favorites, content_type):
         """Get content-based recommendations"""
-        recommendations = []
-        
         # If favorites are provided, use content-based similarity
         if favorites:
             similarity_scores = self._calculate_favorites_similarity(favorites, tfidf_matrix)
@@ -347,30 +387,15 @@ class RecommendationEngine:
         # Get top recommendations
         top_content = df.nlargest(15, 'final_score')
         
-        for _, item in top_content.iterrows():
-            recommendation = {
-                'id': int(item['id']),
-                'title': item['title'],
-                'overview': item['overview'][:200] + '...' if len(item['overview']) > 200 else item['overview'],
-                'genres': item['genres'],
-                'vote_average': float(item['vote_average']),
-                'year': int(item['year']) if pd.notna(item['year']) else None,
-                'poster_path': item.get('poster_path', ''),
-                'content_type': content_type,
-                'score': float(item['final_score']),
-                'reason': self._generate_reason(item, favorites)
-            }
-            
-            # Add type-specific fields
-            if content_type == 'movie':
-                recommendation['runtime'] = int(item['runtime']) if pd.notna(item.get('runtime')) else None
-            else:
-                recommendation['seasons'] = int(item['number_of_seasons']) if pd.notna(item.get('number_of_seasons')) else None
-                recommendation['episodes'] = int(item['number_of_episodes']) if pd.notna(item.get('number_of_episodes')) else None
-            
-            recommendations.append(recommendation)
-        
-        return recommendations
+        reasons = [
+            self._generate_reason(vote_average, popularity_score, favorites)
+            for vote_average, popularity_score in zip(
+                top_content['vote_average'].tolist(), top_content['popularity_score'].tolist()
+            )
+        ]
+        return self._format_recommendations(
+            top_content, content_type, scores=top_content['final_score'], reasons=reasons
+        )
     
     def _calculate_favorites_similarity(self, favorites, tfidf_matrix):
         """Calculate similarity with user's favorite content"""
@@ -378,17 +403,17 @@ class RecommendationEngine:
         similarity_scores = cosine_similarity(favorites_vector, tfidf_matrix).flatten()
         return similarity_scores
     
-    def _generate_reason(self, item, favorites):
+    def _generate_reason(self, vote_average, popularity_score, favorites):
         """Generate explanation for why this was recommended"""
         reasons = []
         
         if favorites:
             reasons.append(f"matches your interests in {favorites[:30]}...")
         
-        if item['vote_average'] >= 8.0:
+        if vote_average >= 8.0:
             reasons.append("highly rated")
         
-        if item['popularity_score'] >= 7.0:
+        if popularity_score >= 7.0:
             reasons.append("trending now")
         
         if not reasons:
@@ -409,82 +434,120 @@ class RecommendationEngine:
             (self.series_df['vote_count'] >= 50)
         ].sample(n=min(5, len(self.series_df)))
         
-        surprise_recs = []
-        
-        for _, item in good_movies.iterrows():
-            surprise_recs.append(self._format_recommendation(item, 'movie'))
-        
-        for _, item in good_series.iterrows():
-            surprise_recs.append(self._format_recommendation(item, 'series'))
+        surprise_recs = (
+            self._format_recommendations(good_movies, 'movie') +
+            self._format_recommendations(good_series, 'series')
+        )
         
         random.shuffle(surprise_recs)
         return surprise_recs[:10]
     
-    def _format_recommendation(self, item, content_type):
-        """Format a single recommendation"""
-        rec = {
-            'id': int(item['id']),
-            'title': item['title'],
-            'overview': item['overview'][:200] + '...' if len(item['overview']) > 200 else item['overview'],
-            'genres': item['genres'],
-            'vote_average': float(item['vote_average']),
-            'year': int(item['year']) if pd.notna(item['year']) else None,
-            'poster_path': item.get('poster_path', ''),
-            'content_type': content_type,
-            'score': float(item.get('popularity_score', item['vote_average'])),
-            'reason': "Surprise pick for you!"
+    def _format_recommendations(self, df, content_type, scores=None, reasons=None):
+        """Format the rows of a frame column-wise into recommendation dicts"""
+        count = len(df)
+        if scores is None:
+            scores = df['popularity_score'] if 'popularity_score' in df.columns else df['vote_average']
+        
+        columns = {
+            'id': df['id'].to_numpy(dtype=np.int64).tolist(),
+            'title': df['title'].tolist(),
+            'overview': truncate_list(df['overview'].tolist(), 200, '...'),
+            'genres': df['genres'].tolist(),
+            'vote_average': df['vote_average'].to_numpy(dtype=np.float64).tolist(),
+            'year': nullable_int_list(df['year']),
+            'poster_path': df['poster_path'].tolist() if 'poster_path' in df.columns else [''] * count,
+            'content_type': [content_type] * count,
+            'score': np.asarray(scores, dtype=np.float64).tolist(),
+            'reason': reasons if reasons is not None else ["Surprise pick for you!"] * count
         }
         
         if content_type == 'movie':
-            rec['runtime'] = int(item['runtime']) if pd.notna(item.get('runtime')) else None
+            columns['runtime'] = self._nullable_column(df, 'runtime')
         else:
-            rec['seasons'] = int(item['number_of_seasons']) if pd.notna(item.get('number_of_seasons')) else None
-            rec['episodes'] = int(item['number_of_episodes']) if pd.notna(item.get('number_of_episodes')) else None
+            columns['seasons'] = self._nullable_column(df, 'number_of_seasons')
+            columns['episodes'] = self._nullable_column(df, 'number_of_episodes')
         
-        return rec
+        return zip_records(columns)
+    
+    def _nullable_column(self, df, col):
+        """Integer values of a column with None for missing values or a missing column"""
+        if col not in df.columns:
+            return [None] * len(df)
+        return nullable_int_list(pd.to_numeric(df[col], errors='coerce'))
+    
+    def _build_search_indexes(self):
+        """Build the BM25 inverted indexes and fuzzy title matchers used by search_content"""
+        self.search_indexes = {
+            'movies': InvertedIndex(self.movies_df, self.SEARCH_FIELDS),
+            'series': InvertedIndex(self.series_df, self.SEARCH_FIELDS)
+        }
+        self.fuzzy_matchers = {
+            name: FuzzyTitleMatcher(df['title'].fillna('').astype(str).tolist(), df['popularity_score'])
+            for name, df in (('movies', self.movies_df), ('series', self.series_df))
+        }
     
     def search_content(self, query, content_type='both'):
-        """Search for specific content"""
+        """Search for specific content, ranked by BM25 relevance"""
+        if self.search_indexes is None:
+            self._build_search_indexes()
+        
         results = []
+        relevance = []
         
         if content_type in ['movies', 'both']:
-            movie_results = self.movies_df[
-                self.movies_df['title'].str.contains(query, case=False, na=False) |
-                self.movies_df['overview'].str.contains(query, case=False, na=False) |
-                self.movies_df['genres'].str.contains(query, case=False, na=False)
-            ].head(10)
-            
-            for _, item in movie_results.iterrows():
-                results.append(self._format_recommendation(item, 'movie'))
+            positions, scores = self._search_catalog('movies', query, 10)
+            results.extend(self._format_recommendations(self.movies_df.iloc[positions], 'movie'))
+            relevance.extend(scores.tolist())
         
         if content_type in ['series', 'both']:
-            series_results = self.series_df[
-                self.series_df['title'].str.contains(query, case=False, na=False) |
-                self.series_df['overview'].str.contains(query, case=False, na=False) |
-                self.series_df['genres'].str.contains(query, case=False, na=False)
-            ].head(10)
-            
-            for _, item in series_results.iterrows():
-                results.append(self._format_recommendation(item, 'series'))
+            positions, scores = self._search_catalog('series', query, 10)
+            results.extend(self._format_recommendations(self.series_df.iloc[positions], 'series'))
+            relevance.extend(scores.tolist())
         
-        return sorted(results, key=lambda x: x['vote_average'], reverse=True)[:20]
+        order = sorted(range(len(results)), key=lambda i: relevance[i], reverse=True)
+        return [results[i] for i in order[:20]]
+    
+    def _search_catalog(self, name, query, limit):
+        """Exact BM25 hits, topped up with fuzzy title matches when there are too few"""
+        positions, scores = self.search_indexes[name].search(query, limit)
+        if len(positions) < self.FUZZY_MIN_RESULTS:
+            fuzzy = self.fuzzy_matchers[name].match(query, limit)
+            fuzzy = fuzzy[~np.isin(fuzzy, positions)][:limit - len(positions)]
+            # Fuzzy matches rank after every exact hit
+            positions = np.concatenate([positions, fuzzy])
+            scores = np.concatenate([scores, np.zeros(len(fuzzy))])
+        return positions, scores
     
     def get_trending_content(self, content_type):
         """Get trending content"""
+        if self.trending is None:
+            self._materialize_trending()
+        key = content_type if content_type in ('movies', 'series') else 'both'
+        return list(self.trending[key])
+    
+    def _materialize_trending(self):
+        """Rank trending content once per load, since the catalogs do not change"""
+        self.trending = {
+            content_type: self._rank_trending(content_type)
+            for content_type in ('movies', 'series', 'both')
+        }
+    
+    def _rank_trending(self, content_type):
+        """Trending ranking for one content type"""
         if content_type == 'movies':
             trending = self.movies_df.nlargest(20, 'popularity_score')
-            return [self._format_recommendation(item, 'movie') for _, item in trending.iterrows()]
+            return self._format_recommendations(trending, 'movie')
         elif content_type == 'series':
             trending = self.series_df.nlargest(20, 'popularity_score')
-            return [self._format_recommendation(item, 'series') for _, item in trending.iterrows()]
+            return self._format_recommendations(trending, 'series')
         else:  # both
             movie_trending = self.movies_df.nlargest(10, 'popularity_score')
             series_trending = self.series_df.nlargest(10, 'popularity_score')
             
-            results = []
-            for _, item in movie_trending.iterrows():
-                results.append(self._format_recommendation(item, 'movie'))
-            for _, item in series_trending.iterrows():
-                results.append(self._format_recommendation(item, 'series'))
+            results = (
+                self._format_recommendations(movie_trending, 'movie') +
+                self._format_recommendations(series_trending, 'series')
+            )
             
             return sorted(results, key=lambda x: x['score'], reverse=True)
+
@@ -0,0 +1,114 @@
+import pytest
+
+import utils.cache as cache_module
+from utils.cache import RecommendationCache, SharedCache, create_cache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, 'time', clock)
+    return clock
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def make_cache(request, tmp_path):
+    def make(**limits):
+        return create_cache(request.param, path=str(tmp_path / 'cache.sqlite'), **limits)
+    return make
+
+
+def value(size):
+    """A value whose JSON encoding is size bytes"""
+    return 'x' * (size - 2)
+
+
+def test_least_recently_used_entry_is_evicted(make_cache, clock):
+    cache = make_cache(max_entries=3)
+    for key in 'abc':
+        cache.set(key, key)
+        clock.now += 1
+    # Recency is refreshed on a hit (by the shared cache once per TOUCH_INTERVAL)
+    clock.now += SharedCache.TOUCH_INTERVAL + 1
+    assert cache.get('a') == 'a'
+    cache.set('d', 'd')
+
+    assert cache.get('b') is None
+    assert [cache.get(key) for key in 'acd'] == ['a', 'c', 'd']
+    assert len(cache) == 3
+    assert cache.stats()['evictions'] == 1
+
+
+def test_expired_entries_miss_and_are_purged(make_cache, clock):
+    cache = make_cache(ttl=10)
+    cache.set('old', 1)
+    clock.now += 5
+    cache.set('new', 2)
+    clock.now += 6
+
+    assert cache.get('old') is None
+    assert cache.get('new') == 2
+    clock.now += 5
+    assert cache.purge_expired() == 1
+    assert len(cache) == 0
+    stats = cache.stats()
+    assert stats['expirations'] == 2
+    assert (stats['hits'], stats['misses']) == (1, 1)
+
+
+def test_byte_budget_evicts_oldest_and_skips_oversized_values(make_cache, clock):
+    cache = make_cache(max_bytes=350)
+    for key in 'abcd':
+        cache.set(key, value(100))
+        clock.now += 1
+
+    assert cache.get('a') is None
+    assert len(cache) == 3
+    assert cache.stats()['bytes'] == 300
+    cache.set('huge', value(351))
+    assert cache.get('huge') is None
+    assert cache.stats()['bytes'] == 300
+
+
+def test_overwriting_a_key_replaces_its_size(make_cache, clock):
+    cache = make_cache()
+    cache.set('a', value(100))
+    cache.set('a', value(40))
+    assert len(cache) == 1
+    assert cache.stats()['bytes'] == 40
+    assert cache.get('a') == value(40)
+
+
+def test_shared_cache_serves_entries_written_by_another_worker(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    writer, reader = SharedCache(path), SharedCache(path)
+    writer.set('key', {'results': [1, 2, 3]})
+    assert reader.get('key') == {'results': [1, 2, 3]}
+    assert len(reader) == 1
+
+
+def test_shared_cache_stats_read_only_the_running_totals(tmp_path):
+    cache = SharedCache(str(tmp_path / 'cache.sqlite'), max_entries=100)
+    for i in range(10):
+        cache.set(f'key-{i}', {'value': i})
+    statements = []
+    cache._connection().set_trace_callback(statements.append)
+
+    stats = cache.stats()
+    assert stats['entries'] == 10
+    assert stats['bytes'] > 0
+    assert statements == ['SELECT entries, bytes FROM cache_totals']
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        create_cache('redis')
+    assert isinstance(create_cache(), RecommendationCache)
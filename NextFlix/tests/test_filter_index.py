@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.filter_index import CatalogFilterIndex
+
+CATALOG = pd.DataFrame({
+    'genres': ['Action, Science Fiction', 'Drama', 'Action|Comedy', None, 'Science Fiction', 'Comedy, Drama',
+               'Action', 'Drama', 'Horror'],
+    'original_language': ['en', 'fr', 'en', 'en', 'ja', 'fr', 'en', 'ko', 'en'],
+    'runtime': [120, 95, np.nan, 100, 140, 88, 110, 130, 90],
+    'vote_average': [7.5, 6.0, 8.1, 5.0, 7.0, 6.5, 9.0, 7.2, 4.0],
+    'release_year': [2010, 1995, 2020, 2001, 2015, 1988, 2022, 2019, 2005],
+    'vote_count': [500, 20, 1000, 50, 5, 300, 800, 60, 40]
+})
+
+
+def reference(genres=None, equals=None, ranges=None, min_vote_count=10):
+    """Row positions matching the filters, evaluated row by row"""
+    matches = []
+    for position, row in CATALOG.iterrows():
+        if row['vote_count'] < min_vote_count:
+            continue
+        tokens = [token.strip() for token in str(row['genres'] or '').lower().replace('|', ',').split(',')]
+        if genres and not any(genre.strip().lower() in token for genre in genres for token in tokens if token):
+            continue
+        if any(row[col] not in values for col, values in (equals or {}).items()):
+            continue
+        if any(pd.isna(row[col]) or (low is not None and row[col] < low) or (high is not None and row[col] > high)
+               for col, (low, high) in (ranges or {}).items()):
+            continue
+        matches.append(position)
+    return matches
+
+
+QUERIES = [
+    {},
+    {'genres': ['action']},
+    {'genres': ['Science']},
+    {'genres': ['comedy', 'horror']},
+    {'equals': {'original_language': ['en']}},
+    {'equals': {'original_language': ['fr', 'ko']}},
+    {'equals': {'original_language': ['de']}},
+    {'ranges': {'runtime': (None, 110)}},
+    {'ranges': {'release_year': (2000, 2019), 'vote_average': (7.0, None)}},
+    {'genres': ['drama'], 'equals': {'original_language': ['fr']}, 'ranges': {'runtime': (90, None)}},
+    {'genres': ['western']}
+]
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_query_matches_row_by_row_filters(query):
+    index = CatalogFilterIndex(CATALOG)
+    assert index.query(**query).tolist() == reference(**query)
+
+
+def test_genres_are_or_and_filters_are_and():
+    index = CatalogFilterIndex(CATALOG)
+    assert index.query(genres=['comedy', 'horror']).tolist() == [2, 5, 8]
+    assert index.query(genres=['comedy'], equals={'original_language': ['en']}).tolist() == [2]
+
+
+def test_quality_floor_applies_to_every_query():
+    index = CatalogFilterIndex(CATALOG, min_vote_count=100)
+    assert index.query().tolist() == [0, 2, 5, 6]
+    assert 1 not in index.query(genres=['drama']).tolist()
+
+
+def test_missing_range_values_never_match():
+    index = CatalogFilterIndex(CATALOG)
+    assert 2 not in index.query(ranges={'runtime': (None, None)}).tolist()
+    assert 2 in index.query().tolist()
+
+
+@pytest.mark.parametrize('split', [1, 4, 8])
+def test_extended_index_matches_full_build(split):
+    extended = CatalogFilterIndex(CATALOG.iloc[:split]).extended(CATALOG.iloc[split:])
+    assert extended.size == len(CATALOG)
+    for query in QUERIES:
+        assert extended.query(**query).tolist() == reference(**query)
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from app import UltraModernRecommendationEngine
+from utils.synthetic import SyntheticCatalog
+
+NEW_TITLE = {
+    'id': 99000001,
+    'title': 'Space Detective',
+    'overview': 'A detective investigates a murder aboard a spaceship far from home',
+    'genres': 'Science Fiction, Mystery',
+    'vote_average': 7.5,
+    'vote_count': 100000,
+    'release_date': '2024-05-01'
+}
+
+
+@pytest.fixture(scope='module')
+def engine(tmp_path_factory):
+    """Engine warm-started from a snapshot, whose catalog columns are compacted"""
+    data_dir = str(tmp_path_factory.mktemp('data'))
+    snapshot_dir = str(tmp_path_factory.mktemp('snapshot'))
+    SyntheticCatalog(1500, 800, seed=7).write(data_dir)
+
+    fitted = UltraModernRecommendationEngine(snapshot_dir=snapshot_dir, data_dir=data_dir)
+    fitted.load_data_optimized(use_snapshot=False)
+    fitted.save_snapshot()
+
+    engine = UltraModernRecommendationEngine(snapshot_dir=snapshot_dir, data_dir=data_dir)
+    engine.load_data_optimized()
+    assert 'snapshot' in engine.readiness()['stages']
+    return engine
+
+
+def test_ingest_after_snapshot_load_keeps_ids_and_counts(engine):
+    summary = engine.ingest_titles('movie', [NEW_TITLE])
+
+    assert summary['added'] == 1
+    assert engine.serializers['movie'].ids[-1] == NEW_TITLE['id']
+    assert int(engine.movies_df['id'].iloc[-1]) == NEW_TITLE['id']
+    assert int(engine.movies_df['vote_count'].iloc[-1]) == NEW_TITLE['vote_count']
+
+
+def test_reingest_skips_titles_already_in_catalog(engine):
+    size = len(engine.movies_df)
+    summary = engine.ingest_titles('movie', [NEW_TITLE])
+
+    assert summary['added'] == 0
+    assert summary['skipped'] == 1
+    assert len(engine.movies_df) == size
+    ids = [result['id'] for result in engine.search_content('space detective', 'movie')]
+    assert ids.count(NEW_TITLE['id']) == 1
+
+
+def test_ingest_rejects_values_outside_64_bit_range(engine):
+    size = len(engine.movies_df)
+    with pytest.raises(ValueError):
+        engine.ingest_titles('movie', [dict(NEW_TITLE, id=99000002, vote_count=2**70)])
+    assert len(engine.movies_df) == size
+    assert not np.isin(99000002, engine.serializers['movie'].ids)
+
+
+def test_partial_record_gets_default_fields_and_finite_scores(engine):
+    record = {
+        'id': 99000003,
+        'title': 'Action Action Action',
+        'overview': 'An action packed chase full of explosions and action',
+        'genres': 'Action',
+        'vote_count': 50
+    }
+    assert engine.ingest_titles('movie', [record])['added'] == 1
+    row = engine.movies_df.iloc[-1]
+    assert row['vote_average'] == 0
+    assert row['popularity'] == 0
+
+    results = engine.get_recommendations({'content_type': 'movie', 'genres': ['action'], 'result_count': 20})
+    assert results
+    assert all(np.isfinite(result['score']) for result in results)
+
+
+def test_cache_keys_follow_catalog_content(tmp_path_factory):
+    data_dir = str(tmp_path_factory.mktemp('data'))
+    SyntheticCatalog(600, 300, seed=3).write(data_dir)
+    snapshot_dir = str(tmp_path_factory.mktemp('snapshot'))
+    # Two workers over the same catalog that each ingest a different title
+    workers = [UltraModernRecommendationEngine(snapshot_dir=snapshot_dir, data_dir=data_dir) for _ in range(2)]
+    for worker in workers:
+        worker.load_data_optimized()
+    preferences = {'content_type': 'movie', 'genres': ['drama']}
+    assert workers[0]._generate_cache_key(preferences) == workers[1]._generate_cache_key(preferences)
+
+    workers[0].ingest_titles('movie', [NEW_TITLE])
+    workers[1].ingest_titles('movie', [dict(NEW_TITLE, id=99000004)])
+    assert workers[0].catalog_version == workers[1].catalog_version == 1
+    assert workers[0]._generate_cache_key(preferences) != workers[1]._generate_cache_key(preferences)
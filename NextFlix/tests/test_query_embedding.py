@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from app import UltraModernRecommendationEngine
+from utils.query_embedding import QueryEmbedder
+
+DOCUMENTS = [
+    'A detective hunts a killer through the rainy city at night',
+    'The detective and his partner chase a killer across the city',
+    'Space explorers find a strange planet beyond the stars',
+    'A crew of explorers is stranded on a strange planet',
+    'Two friends fall in love during a summer in Paris',
+    'A summer love story between two friends in a small town',
+    'The killer returns to the city and the detective must stop him',
+    'Explorers of deep space meet an alien crew',
+    'Love and friendship in the city of Paris',
+    'A small town hides a dark secret and a killer'
+] * 3
+
+QUERIES = [
+    'detective killer city',
+    'THE Detective, and the Killer!',
+    'strange planet explorers',
+    'summer love in Paris',
+    'love love love',
+    'unknown words only xyzzy',
+    ''
+]
+
+
+@pytest.fixture(scope='module')
+def fitted():
+    """Vectorizer fitted with the engine's TF-IDF parameters, and a small SVD on top"""
+    from sklearn.decomposition import TruncatedSVD
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    vectorizer = TfidfVectorizer(**UltraModernRecommendationEngine.TFIDF_PARAMS)
+    svd = TruncatedSVD(n_components=5, random_state=42)
+    svd.fit(vectorizer.fit_transform(DOCUMENTS))
+    return vectorizer, svd
+
+
+def test_transform_matches_vectorizer_and_svd(fitted):
+    vectorizer, svd = fitted
+    embedder = QueryEmbedder.from_model(vectorizer, svd)
+    for query in QUERIES:
+        expected = svd.transform(vectorizer.transform([query]))
+        np.testing.assert_allclose(embedder.transform(query), expected, atol=1e-12)
+    np.testing.assert_allclose(
+        embedder.transform_many(QUERIES), svd.transform(vectorizer.transform(QUERIES)), atol=1e-12
+    )
+
+
+def test_analyzer_matches_vectorizer(fitted):
+    vectorizer, svd = fitted
+    embedder = QueryEmbedder.from_model(vectorizer, svd)
+    analyzer = vectorizer.build_analyzer()
+    for query in QUERIES + DOCUMENTS[:10]:
+        assert embedder.analyze(query) == analyzer(query)
+
+
+def test_persisted_embedder_matches(fitted):
+    vectorizer, svd = fitted
+    embedder = QueryEmbedder.from_model(vectorizer, svd)
+    restored = QueryEmbedder.from_arrays(embedder.to_arrays('movie'), embedder.to_meta('movie'), 'movie')
+    np.testing.assert_array_equal(restored.transform_many(QUERIES), embedder.transform_many(QUERIES))
@@ -0,0 +1,98 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.search_index import InvertedIndex, tokenize
+
+FIELDS = {'title': 3.0, 'overview': 1.0, 'genres': 1.5}
+CATALOG = pd.DataFrame({
+    'title': ['Star Wars', 'Star Trek', 'Wars of the Roses', 'Dark Star', 'Starship Troopers', 'Love Actually'],
+    'overview': [
+        'A galaxy far away at war',
+        'Space explorers of the star fleet',
+        'A bitter divorce becomes a war',
+        'A star bomb talks back',
+        'Soldiers fight bugs in space',
+        'Love stories at christmas in london'
+    ],
+    'genres': ['Science Fiction', 'Science Fiction', 'Comedy', 'Comedy, Science Fiction', 'Action', 'Romance']
+})
+
+
+def reference_scores(df, fields, terms, k1=1.2, b=0.75):
+    """BM25F scores of documents holding every term, computed document by document"""
+    lengths = [sum(len(tokenize(str(row[col]))) * weight for col, weight in fields.items()) for _, row in df.iterrows()]
+    average = sum(lengths) / len(lengths)
+    scores = {}
+    for position, (_, row) in enumerate(df.iterrows()):
+        total = 0.0
+        for term in terms:
+            freq = sum(tokenize(str(row[col])).count(term) * weight for col, weight in fields.items())
+            if freq == 0:
+                break
+            doc_freq = sum(
+                any(term in tokenize(str(other[col])) for col in fields) for _, other in df.iterrows()
+            )
+            idf = math.log1p((len(df) - doc_freq + 0.5) / (doc_freq + 0.5))
+            total += idf * freq * (k1 + 1) / (freq + k1 * (1 - b + b * lengths[position] / average))
+        else:
+            scores[position] = total
+    return scores
+
+
+@pytest.fixture(scope='module')
+def index():
+    return InvertedIndex(CATALOG, FIELDS)
+
+
+@pytest.mark.parametrize('query', ['star ', 'war ', 'science fiction ', 'space star '])
+def test_scores_match_reference_bm25f(index, query):
+    positions, scores = index.search(query, k=10)
+    expected = reference_scores(CATALOG, FIELDS, tokenize(query))
+    assert sorted(positions.tolist()) == sorted(expected)
+    for position, score in zip(positions.tolist(), scores.tolist()):
+        assert score == pytest.approx(expected[position], rel=1e-5)
+    assert list(scores) == sorted(scores, reverse=True)
+
+
+def test_every_query_term_is_required(index):
+    positions, _ = index.search('star comedy ')
+    assert positions.tolist() == [3]
+    assert len(index.search('star nosuchword ')[0]) == 0
+
+
+def test_title_matches_outrank_overview_matches():
+    df = pd.DataFrame({
+        'title': ['Robot', 'Garden'],
+        'overview': ['A quiet garden', 'A quiet robot'],
+        'genres': ['Drama', 'Drama']
+    })
+    positions, scores = InvertedIndex(df, FIELDS).search('robot ')
+    assert positions.tolist() == [0, 1]
+    assert scores[0] > scores[1]
+
+
+def test_last_word_matches_as_prefix_unless_followed_by_space(index):
+    assert set(index.search('star')[0].tolist()) == {0, 1, 3, 4}
+    assert set(index.search('star ')[0].tolist()) == {0, 1, 3}
+    assert set(index.search('sta* wars ')[0].tolist()) == {0}
+    # A completion scores at PREFIX_WEIGHT of the exact term's impact
+    exact = dict(zip(*[values.tolist() for values in index.search('starship ')]))
+    completed = dict(zip(*[values.tolist() for values in index.search('starshi')]))
+    assert completed[4] == pytest.approx(exact[4] * InvertedIndex.PREFIX_WEIGHT, rel=1e-6)
+
+
+def test_quoted_phrases_are_verified(index):
+    assert index.search('"star wars"')[0].tolist() == [0]
+    assert len(index.search('"wars star"')[0]) == 0
+
+
+def test_extended_index_matches_full_build(index):
+    extended = InvertedIndex(CATALOG.iloc[:3], FIELDS).extended(CATALOG.iloc[3:])
+    for query in ['star ', 'war', 'science fiction ', 'love', '"star trek"']:
+        expected, expected_scores = index.search(query, k=10)
+        positions, scores = extended.search(query, k=10)
+        np.testing.assert_array_equal(positions, expected)
+        np.testing.assert_allclose(scores, expected_scores, rtol=1e-6)
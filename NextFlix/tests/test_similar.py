@@ -0,0 +1,74 @@
+import pytest
+
+import app as nextflix
+from utils.neighbors import ItemNeighbors
+from utils.synthetic import SyntheticCatalog
+
+
+@pytest.fixture(scope='module')
+def snapshot_paths(tmp_path_factory):
+    """A snapshot written by a fitted engine, which always carries the neighbour lists"""
+    data_dir = str(tmp_path_factory.mktemp('data'))
+    snapshot_dir = str(tmp_path_factory.mktemp('snapshot'))
+    SyntheticCatalog(1500, 800, seed=11).write(data_dir)
+
+    fitted = nextflix.UltraModernRecommendationEngine(snapshot_dir=snapshot_dir, data_dir=data_dir)
+    fitted.load_data_optimized(use_snapshot=False)
+    assert not fitted.has_neighbors()
+    fitted.save_snapshot()
+    assert fitted.has_neighbors()
+    return data_dir, snapshot_dir
+
+
+def warm_engine(snapshot_paths):
+    data_dir, snapshot_dir = snapshot_paths
+    engine = nextflix.UltraModernRecommendationEngine(snapshot_dir=snapshot_dir, data_dir=data_dir)
+    engine.load_data_optimized()
+    return engine
+
+
+def test_snapshot_restores_neighbor_lists(snapshot_paths, monkeypatch):
+    engine = warm_engine(snapshot_paths)
+    assert engine.has_neighbors()
+    assert 'neighbors' not in engine.readiness()['stages']
+
+    monkeypatch.setattr(nextflix, 'recommendation_engine', engine)
+    title_id = int(engine.serializers['movie'].ids[0])
+    response = nextflix.app.test_client().get(f'/api/similar/movie/{title_id}?limit=5')
+    assert response.status_code == 200
+    assert response.get_json()['count'] == 5
+
+
+def test_missing_neighbor_lists_are_built_after_readiness(snapshot_paths, monkeypatch):
+    # A snapshot written before the lists existed
+    monkeypatch.setattr(ItemNeighbors, 'from_arrays', classmethod(lambda cls, arrays, prefix, ids: None))
+    engine = warm_engine(snapshot_paths)
+    assert engine.is_loaded
+    assert not engine.has_neighbors()
+
+    monkeypatch.setattr(nextflix, 'recommendation_engine', engine)
+    client = nextflix.app.test_client()
+    title_id = int(engine.serializers['tv'].ids[0])
+    response = client.get(f'/api/similar/tv/{title_id}')
+    assert response.status_code == 503
+    assert 'Retry-After' in response.headers
+
+    engine.neighbor_thread.join(timeout=120)
+    assert engine.readiness()['neighbors']['state'] == 'ready'
+    response = client.get(f'/api/similar/tv/{title_id}')
+    assert response.status_code == 200
+    assert title_id not in [record['id'] for record in response.get_json()['similar']]
+
+
+def test_unparseable_limits_fall_back_to_defaults(snapshot_paths, monkeypatch):
+    engine = warm_engine(snapshot_paths)
+    monkeypatch.setattr(nextflix, 'recommendation_engine', engine)
+    client = nextflix.app.test_client()
+    title_id = int(engine.serializers['movie'].ids[0])
+
+    response = client.get(f'/api/similar/movie/{title_id}?limit=abc')
+    assert response.status_code == 200
+    assert response.get_json()['count'] == 12
+    assert client.get('/search?q=love&limit=abc').status_code == 200
+    assert client.get('/search?q=love&limit=-5').status_code == 200
+    assert client.get('/autocomplete?q=lo&limit=abc').status_code == 200
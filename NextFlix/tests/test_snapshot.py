@@ -0,0 +1,33 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.snapshot import ModelSnapshot
+
+
+def save(snapshot, fingerprint, value):
+    frames = {'catalog': pd.DataFrame({'id': [1, 2], 'title': ['A', 'B']})}
+    return snapshot.save(fingerprint, [], {}, frames, {'matrix': np.full(3, value, dtype=np.float32)})
+
+
+def test_republishing_a_fingerprint_never_touches_the_published_directory(tmp_path):
+    snapshot = ModelSnapshot(str(tmp_path))
+    fingerprint = 'f' * 64
+    first = save(snapshot, fingerprint, 1.0)
+    loaded = snapshot.load()
+
+    second = save(snapshot, fingerprint, 2.0)
+    assert second != first
+    assert snapshot.current_dir() == second
+    assert snapshot.is_valid(fingerprint)
+    # The previous build is kept for workers that resolved CURRENT before the switch
+    assert os.path.isdir(first)
+    assert loaded['arrays']['matrix'][0] == 1.0
+    assert snapshot.load()['arrays']['matrix'][0] == 2.0
+
+    third = save(snapshot, fingerprint, 3.0)
+    assert not os.path.exists(first)
+    assert sorted(entry for entry in os.listdir(tmp_path) if not entry.startswith('.')) == sorted(
+        ['CURRENT', os.path.basename(second), os.path.basename(third)]
+    )
@@ -0,0 +1,41 @@
+import pandas as pd
+
+from utils.filter_index import CatalogFilterIndex
+from utils.serialize import CatalogSerializer
+from utils.trending import TrendingRankings
+
+
+def rankings():
+    df = pd.DataFrame({
+        'id': [1, 2, 3, 4],
+        'title': ['A', 'B', 'C', 'D'],
+        'genres': ['Action', 'Drama', 'Action, Drama', 'Comedy'],
+        'vote_average': [7.0, 8.0, 6.0, 9.0],
+        'vote_count': [500, 200, 1000, 50]
+    })
+    return TrendingRankings.build(df, CatalogSerializer(df), CatalogFilterIndex(df))
+
+
+def test_rankings_by_genre():
+    trending = rankings()
+    assert [record['id'] for record in trending.records(10)] == [2, 1, 3]
+    assert [record['id'] for record in trending.records(10, 'Action ')] == [1, 3]
+    assert trending.records(10, 'no such genre') == []
+
+
+def test_unknown_genres_share_one_memo_entry():
+    trending = rankings()
+    size = len(trending._records), len(trending._payloads)
+    for i in range(100):
+        assert trending.payload(24, f'made-up-{i}') == ('[]', 0)
+        trending.records(10 + i, f'made-up-{i}')
+    assert len(trending._records) <= size[0] + 1
+    assert len(trending._payloads) <= size[1] + 1
+
+
+def test_limits_beyond_the_ranking_share_one_memo_entry():
+    trending = rankings()
+    size = len(trending._records)
+    for limit in (500, 5000, 10**9):
+        assert len(trending.records(limit)) == 3
+    assert len(trending._records) == size + 1
@@ -0,0 +1,148 @@
+import logging
+
+import numpy as np
+
+from utils.scoring import l2_normalize_rows, l2_normalize_vector, top_k_indices
+
+logger = logging.getLogger(__name__)
+
+
+class IVFIndex:
+    """
+    Inverted-file approximate nearest-neighbour index over unit-length vectors.
+
+    Items are clustered with spherical k-means and stored as one posting list
+    per centroid (CSR layout: list_offsets + list_items). A query scores the
+    centroids, probes the n_probe closest lists and scores only their items,
+    so n_probe trades recall for latency. An optional allowed-row filter is
+    applied to the probed candidates before scoring.
+    """
+
+    def __init__(self, embeddings, centroids, list_offsets, list_items, n_probe=8):
+        self.embeddings = embeddings
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.list_offsets = np.asarray(list_offsets, dtype=np.int64)
+        self.list_items = np.asarray(list_items)
+        self.n_probe = n_probe
+
+    @property
+    def n_lists(self):
+        return len(self.centroids)
+
+    @classmethod
+    def build(cls, embeddings, n_lists=None, n_iter=10, sample_size=100000, n_probe=8, random_state=42):
+        """Cluster the embeddings and build the inverted lists"""
+        n_items = len(embeddings)
+        if n_lists is None:
+            n_lists = max(1, int(np.sqrt(n_items)))
+        n_lists = max(1, min(n_lists, n_items))
+        rng = np.random.default_rng(random_state)
+
+        # Train centroids on a sample to bound build time on large catalogs
+        sample_rows = np.sort(rng.choice(n_items, size=min(sample_size, n_items), replace=False))
+        sample = np.asarray(embeddings[sample_rows], dtype=np.float32)
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+
+        for _ in range(n_iter):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            counts = np.bincount(assignments, minlength=n_lists)
+            empty = counts == 0
+            if empty.any():
+                # Re-seed empty clusters from random sample points
+                sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+            centroids = l2_normalize_rows(sums)
+
+        assignments = cls._assign(embeddings, centroids)
+        list_items = np.argsort(assignments, kind='stable').astype(np.int32 if n_items < 2**31 else np.int64)
+        list_offsets = np.searchsorted(assignments[list_items], np.arange(n_lists + 1)).astype(np.int64)
+
+        logger.info(f"🧭 IVF index built: {n_items} items in {n_lists} lists")
+        return cls(embeddings, centroids, list_offsets, list_items, n_probe=n_probe)
+
+    @staticmethod
+    def _assign(embeddings, centroids, block_size=65536):
+        """Assign every item to its closest centroid, in blocks"""
+        assignments = np.empty(len(embeddings), dtype=np.int64)
+        for start in range(0, len(embeddings), block_size):
+            block = np.asarray(embeddings[start:start + block_size], dtype=np.float32)
+            assignments[start:start + block_size] = np.argmax(block @ centroids.T, axis=1)
+        return assignments
+
+    def extended(self, embeddings, start):
+        """
+        Copy of the index over embeddings whose rows from start on are new.
+
+        New rows join the list of their closest existing centroid; centroids
+        are not retrained, so recall slowly degrades until the next full build.
+        """
+        assignments = self._assign(embeddings[start:], self.centroids)
+        list_ids = np.repeat(np.arange(self.n_lists), np.diff(self.list_offsets))
+        list_ids = np.concatenate([list_ids, assignments])
+        # Stable sort keeps each list's existing items ahead of the new ones
+        order = np.argsort(list_ids, kind='stable')
+        items = np.concatenate([self.list_items, np.arange(start, len(embeddings))])[order]
+        list_offsets = np.searchsorted(list_ids[order], np.arange(self.n_lists + 1)).astype(np.int64)
+        return IVFIndex(embeddings, self.centroids, list_offsets,
+                        items.astype(np.int32 if len(embeddings) < 2**31 else np.int64), n_probe=self.n_probe)
+
+    def to_arrays(self, prefix):
+        """Arrays needed to persist the index, keyed for the model snapshot"""
+        return {
+            f'{prefix}_ann_centroids': self.centroids,
+            f'{prefix}_ann_offsets': self.list_offsets,
+            f'{prefix}_ann_items': self.list_items
+        }
+
+    @classmethod
+    def from_arrays(cls, embeddings, arrays, prefix, n_probe=8):
+        """Restore a persisted index, or return None if it was not persisted"""
+        keys = [f'{prefix}_ann_centroids', f'{prefix}_ann_offsets', f'{prefix}_ann_items']
+        if not all(key in arrays for key in keys):
+            return None
+        return cls(embeddings, *(arrays[key] for key in keys), n_probe=n_probe)
+
+    def search(self, query_vector, k, n_probe=None, allowed=None):
+        """
+        Return (row positions, cosine scores) of the approximate top-k items.
+
+        allowed is an optional sorted array of permitted row positions; probing
+        widens automatically until at least k permitted candidates are found.
+        """
+        query = l2_normalize_vector(query_vector, dtype=self.centroids.dtype)
+        n_probe = min(n_probe or self.n_probe, self.n_lists)
+        list_order = top_k_indices(self.centroids @ query, self.n_lists)
+
+        allowed_mask = None
+        if allowed is not None:
+            allowed_mask = np.zeros(len(self.embeddings), dtype=bool)
+            allowed_mask[allowed] = True
+
+        probed = 0
+        chunks = []
+        found = 0
+        while probed < self.n_lists and (probed < n_probe or found < k):
+            lst = list_order[probed]
+            items = self.list_items[self.list_offsets[lst]:self.list_offsets[lst + 1]]
+            if allowed_mask is not None:
+                items = items[allowed_mask[items]]
+            chunks.append(items)
+            found += len(items)
+            probed += 1
+
+        candidates = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+        scores = np.asarray(self.embeddings[candidates], dtype=np.float32) @ query
+        top = top_k_indices(scores, k)
+        return candidates[top], scores[top]
+
+
+def measure_recall(index, queries, k=10, n_probe=None):
+    """Average recall@k of the index against exact search for the given queries"""
+    embeddings = np.asarray(index.embeddings, dtype=np.float32)
+    hits = 0
+    for query in queries:
+        exact = top_k_indices(embeddings @ l2_normalize_vector(query), k)
+        approx, _ = index.search(query, k, n_probe=n_probe)
+        hits += len(np.intersect1d(exact, approx))
+    return hits / float(k * len(queries)) if len(queries) else 1.0
@@ -0,0 +1,138 @@
+import re
+import copy
+import logging
+import unicodedata
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def normalize_title(text):
+    """Lower-case, accent-free title words separated by single spaces"""
+    text = unicodedata.normalize('NFKD', str(text))
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(_WORD_RE.findall(text.lower()))
+
+
+class TitleAutocomplete:
+    """
+    Prefix lookup over normalized titles, pre-ranked by popularity.
+
+    Every title is stored once per word it contains (the title from that word
+    onwards), so "wars" completes "Star Wars". Keys live in one sorted list,
+    making the entries for a prefix a contiguous range found by binary search;
+    each entry carries the popularity rank of its title. The best titles for
+    every short prefix, whose ranges are the largest, are precomputed.
+    """
+
+    PRECOMPUTED_PREFIX_LENGTH = 3
+
+    def __init__(self, titles, priority, max_results=10):
+        self.max_results = max_results
+        self.size = len(titles)
+        title_ranks = self._title_ranks(priority)
+
+        entries = []
+        for position, title in enumerate(titles):
+            for key in self._title_keys(title):
+                entries.append((key, int(title_ranks[position]), position))
+        entries.sort()
+
+        self.keys = [key for key, _, _ in entries]
+        self.ranks = np.fromiter((rank for _, rank, _ in entries), dtype=np.int32, count=len(entries))
+        self.items = np.fromiter((position for _, _, position in entries), dtype=np.int32, count=len(entries))
+        self.top = self._precompute_short_prefixes()
+
+        logger.info(f"🔤 Autocomplete index built: {len(titles)} titles, {len(self.keys)} prefix entries")
+
+    @staticmethod
+    def _title_ranks(priority):
+        """Rank 0 is the most popular title; ties keep catalog order"""
+        priority = np.asarray(priority, dtype=np.float64)
+        title_ranks = np.empty(len(priority), dtype=np.int32)
+        title_ranks[np.argsort(-np.nan_to_num(priority, nan=-np.inf), kind='stable')] = np.arange(len(priority))
+        return title_ranks
+
+    @staticmethod
+    def _title_keys(title):
+        """The normalized title from each of its words onwards"""
+        words = normalize_title(title).split()
+        return [' '.join(words[i:]) for i in range(len(words))]
+
+    def extended(self, titles, priority):
+        """
+        Copy of the index with titles appended after the existing ones.
+
+        priority covers every title, old and new. New keys are inserted into
+        the sorted list; existing titles keep their relative ranks, so only the
+        precomputed prefixes of the new keys need refreshing.
+        """
+        entries = sorted(
+            (key, position) for position, title in enumerate(titles, self.size) for key in self._title_keys(title)
+        )
+        insert_at = [bisect_right(self.keys, key) for key, _ in entries]
+
+        index = copy.copy(self)
+        index.size = self.size + len(titles)
+        index.keys = np.insert(np.array(self.keys, dtype=object), insert_at,
+                               np.array([key for key, _ in entries], dtype=object)).tolist()
+        index.items = np.insert(self.items, insert_at, [position for _, position in entries]).astype(np.int32)
+        index.ranks = self._title_ranks(priority)[index.items]
+
+        index.top = dict(self.top)
+        prefixes = {key[:length] for key, _ in entries
+                    for length in range(1, self.PRECOMPUTED_PREFIX_LENGTH + 1) if len(key) >= length}
+        for prefix in prefixes:
+            start = bisect_left(index.keys, prefix)
+            stop = bisect_left(index.keys, prefix + '\U0010ffff', start)
+            index.top[prefix] = index._best(start, stop, self.max_results)
+        return index
+
+    def _precompute_short_prefixes(self):
+        """Best titles for every prefix up to PRECOMPUTED_PREFIX_LENGTH characters"""
+        top = {}
+        for length in range(1, self.PRECOMPUTED_PREFIX_LENGTH + 1):
+            start = 0
+            while start < len(self.keys):
+                prefix = self.keys[start][:length]
+                if len(prefix) < length:
+                    start += 1
+                    continue
+                stop = bisect_left(self.keys, prefix + '\U0010ffff', start)
+                top[prefix] = self._best(start, stop, self.max_results)
+                start = stop
+        return top
+
+    def _best(self, start, stop, limit):
+        """Distinct titles with the best ranks among entries [start, stop)"""
+        ranks = self.ranks[start:stop]
+        pool = min(len(ranks), limit * 4)
+        while True:
+            if pool < len(ranks):
+                candidates = np.argpartition(ranks, pool - 1)[:pool]
+            else:
+                candidates = np.arange(len(ranks))
+            candidates = candidates[np.argsort(ranks[candidates], kind='stable')]
+            # A title appears once per word, so keep only its first entry
+            items = self.items[start + candidates]
+            _, first = np.unique(items, return_index=True)
+            distinct = items[np.sort(first)]
+            if len(distinct) >= limit or pool >= len(ranks):
+                return distinct[:limit]
+            pool = len(ranks)
+
+    def lookup(self, prefix, limit=None):
+        """Catalog row positions of the most popular titles matching the prefix"""
+        limit = min(limit or self.max_results, self.max_results)
+        prefix = normalize_title(prefix)
+        if not prefix:
+            return np.empty(0, dtype=np.int32)
+        if len(prefix) <= self.PRECOMPUTED_PREFIX_LENGTH:
+            return self.top.get(prefix, np.empty(0, dtype=np.int32))[:limit]
+        start = bisect_left(self.keys, prefix)
+        stop = bisect_left(self.keys, prefix + '\U0010ffff', start)
+        return self._best(start, stop, limit)
@@ -0,0 +1,305 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+from utils.serialize import dumps
+
+try:
+    import orjson
+except ImportError:  # Optional faster decoder
+    orjson = None
+
+
+def make_cache_key(namespace, payload):
+    """Deterministic content-hash key, identical across processes and restarts"""
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    digest = hashlib.sha256(f'{namespace}:{canonical}'.encode('utf-8')).hexdigest()
+    return f'{namespace}:{digest[:32]}'
+
+
+class RecommendationCache:
+    """
+    Thread-safe LRU cache with a TTL, an entry limit and a byte budget.
+
+    Entries live in an OrderedDict kept in recency order, so lookups, inserts
+    and evictions are O(1). The size of each value is estimated once from its
+    JSON encoding when it is stored.
+    """
+
+    def __init__(self, max_entries=1000, max_bytes=64 * 1024 * 1024, ttl=1800):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """Return the cached value, or None on a miss or an expired entry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at, size = entry
+            if expires_at < time.time():
+                self._remove(key, size)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """Store a value, evicting least recently used entries to stay in budget"""
+        size = len(dumps(value))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key, self._entries[key][2])
+            self._entries[key] = (value, time.time() + self.ttl, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def purge_expired(self):
+        """Drop all expired entries"""
+        now = time.time()
+        with self._lock:
+            expired = [key for key, (_, expires_at, _) in self._entries.items() if expires_at < now]
+            for key in expired:
+                self._remove(key, self._entries[key][2])
+            self.expirations += len(expired)
+        return len(expired)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Counters and current size of the cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'backend': 'memory',
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+    def _remove(self, key, size):
+        del self._entries[key]
+        self._bytes -= size
+
+
+class SharedCache:
+    """
+    Result cache shared by every worker process on one host.
+
+    Entries are JSON documents in a local SQLite file in WAL mode, so readers
+    never block each other and a result computed by one gunicorn worker is
+    served to all of them. Each thread keeps its own connection. A hit only
+    writes when the entry's access time is older than TOUCH_INTERVAL, so
+    repeated reads of a hot entry stay read-only; recency is approximate to
+    that interval. Expiry uses the TTL stored with the entry. Entry count and
+    total size are kept in a one-row table maintained by triggers, so the
+    entry limit and byte budget are checked after each write without scanning
+    the cache, and the least recently accessed rows are evicted when over.
+    Hits on entries written by another process are counted as cross-worker
+    dedupes.
+    """
+
+    TOUCH_INTERVAL = 60  # Seconds between access-time refreshes of one entry
+    EVICTION_BATCH = 64  # Oldest rows fetched per eviction round
+
+    def __init__(self, path, max_entries=10000, max_bytes=256 * 1024 * 1024, ttl=1800):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # SQLite connections must not be carried across fork into worker processes
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, '
+                'expires_at REAL NOT NULL, accessed_at REAL NOT NULL, writer INTEGER NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed_at)')
+            # Running totals, seeded once from any rows written before they existed
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.execute('CREATE TABLE IF NOT EXISTS cache_totals ('
+                             'id INTEGER PRIMARY KEY CHECK (id = 0), entries INTEGER NOT NULL, bytes INTEGER NOT NULL)')
+                conn.execute('INSERT OR IGNORE INTO cache_totals (id, entries, bytes) '
+                             'SELECT 0, COUNT(*), COALESCE(SUM(size), 0) FROM cache')
+                conn.execute('CREATE TRIGGER IF NOT EXISTS cache_insert AFTER INSERT ON cache BEGIN '
+                             'UPDATE cache_totals SET entries = entries + 1, bytes = bytes + NEW.size; END')
+                conn.execute('CREATE TRIGGER IF NOT EXISTS cache_delete AFTER DELETE ON cache BEGIN '
+                             'UPDATE cache_totals SET entries = entries - 1, bytes = bytes - OLD.size; END')
+                conn.execute('CREATE TRIGGER IF NOT EXISTS cache_update AFTER UPDATE OF size ON cache BEGIN '
+                             'UPDATE cache_totals SET bytes = bytes + NEW.size - OLD.size; END')
+                conn.execute('COMMIT')
+            except sqlite3.Error:
+                conn.execute('ROLLBACK')
+                raise
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _reset_after_fork(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _count(self, **counters):
+        with self._lock:
+            for name, amount in counters.items():
+                setattr(self, name, getattr(self, name) + amount)
+
+    def get(self, key):
+        """Return the cached value, or None on a miss or an expired entry"""
+        now = time.time()
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                'SELECT value, expires_at, accessed_at, writer FROM cache WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                self._count(misses=1)
+                return None
+            value, expires_at, accessed_at, writer = row
+            if expires_at < now:
+                conn.execute('DELETE FROM cache WHERE key = ? AND expires_at < ?', (key, now))
+                self._count(misses=1, expirations=1)
+                return None
+            if accessed_at < now - self.TOUCH_INTERVAL:
+                conn.execute('UPDATE cache SET accessed_at = ? WHERE key = ?', (now, key))
+        except sqlite3.Error:
+            self._count(misses=1)
+            return None
+        self._count(hits=1, shared_hits=int(writer != os.getpid()))
+        return orjson.loads(value) if orjson is not None else json.loads(value)
+
+    def set(self, key, value):
+        """Store a value, evicting least recently accessed entries to stay in budget"""
+        encoded = dumps(value).encode('utf-8')
+        size = len(encoded)
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        try:
+            conn = self._connection()
+            # An upsert rather than INSERT OR REPLACE, whose implicit delete would skip the totals trigger
+            conn.execute(
+                'INSERT INTO cache (key, value, size, expires_at, accessed_at, writer) VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (key) DO UPDATE SET value = excluded.value, size = excluded.size, '
+                'expires_at = excluded.expires_at, accessed_at = excluded.accessed_at, writer = excluded.writer',
+                (key, encoded, size, now + self.ttl, now, os.getpid())
+            )
+            self._enforce_budget(conn)
+        except sqlite3.Error:
+            # A busy or unwritable cache file must never fail the request
+            pass
+
+    def _totals(self, conn):
+        return conn.execute('SELECT entries, bytes FROM cache_totals').fetchone()
+
+    def _enforce_budget(self, conn):
+        entries, total_bytes = self._totals(conn)
+        evicted = 0
+        while entries > self.max_entries or total_bytes > self.max_bytes:
+            rows = conn.execute(
+                'SELECT key, size FROM cache ORDER BY accessed_at LIMIT ?', (self.EVICTION_BATCH,)
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if entries <= self.max_entries and total_bytes <= self.max_bytes:
+                    break
+                conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+                entries -= 1
+                total_bytes -= size
+                evicted += 1
+            # Other workers may have written meanwhile
+            entries, total_bytes = self._totals(conn)
+        self._count(evictions=evicted)
+
+    def purge_expired(self):
+        """Drop all expired entries"""
+        try:
+            removed = self._connection().execute('DELETE FROM cache WHERE expires_at < ?', (time.time(),)).rowcount
+        except sqlite3.Error:
+            return 0
+        self._count(expirations=removed)
+        return removed
+
+    def clear(self):
+        self._connection().execute('DELETE FROM cache')
+
+    def __len__(self):
+        return self._totals(self._connection())[0]
+
+    def stats(self):
+        """Counters of this process plus the current size of the shared store"""
+        try:
+            entries, total_bytes = self._totals(self._connection())
+        except sqlite3.Error:
+            entries, total_bytes = None, None
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'backend': 'sqlite',
+                'entries': entries,
+                'bytes': total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'shared_hits': self.shared_hits,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'dedupe_rate': round(self.shared_hits / self.hits, 4) if self.hits else 0.0
+            }
+
+
+def create_cache(backend='memory', path=None, max_entries=1000, max_bytes=64 * 1024 * 1024, ttl=1800):
+    """Build the configured result cache backend"""
+    if backend == 'sqlite':
+        return SharedCache(path, max_entries=max_entries, max_bytes=max_bytes, ttl=ttl)
+    if backend != 'memory':
+        raise ValueError(f"Unknown cache backend: {backend}")
+    return RecommendationCache(max_entries=max_entries, max_bytes=max_bytes, ttl=ttl)
@@ -0,0 +1,197 @@
+import os
+import json
+import shutil
+
+import numpy as np
+import pandas as pd
+
+COLUMNAR_FORMAT_VERSION = 1
+
+# Low-cardinality text columns stored as dictionary-encoded categoricals
+DEFAULT_CATEGORICAL = ('original_language', 'content_type')
+# Identifier columns are looked up and appended to, so they keep a fixed 64-bit type
+DEFAULT_KEYS = ('id',)
+
+# Separator used to pack a string column into a single UTF-8 file
+_STRING_SEPARATOR = '\x00'
+_INDEX_COLUMN = '__index__'
+
+
+class ColumnarStore:
+    """
+    Column-per-file storage for cleaned catalogs.
+
+    Numeric measure columns are downcast and written as .npy files, key
+    columns as 64-bit values so they round-trip unchanged, low-cardinality
+    text columns as categorical codes plus a category list, and free text as
+    one packed UTF-8 file per column. Any subset of columns can be read back
+    without touching the others.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.schema_path = os.path.join(path, 'schema.json')
+
+    def exists(self):
+        """Check whether a store has been written at this path"""
+        return os.path.exists(self.schema_path)
+
+    def read_schema(self):
+        """Read the column schema of the store"""
+        with open(self.schema_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def columns(self):
+        """List the columns available in the store"""
+        return [col['name'] for col in self.read_schema()['columns']]
+
+    def write(self, df, categorical=DEFAULT_CATEGORICAL, keys=DEFAULT_KEYS):
+        """Write a DataFrame as one file per column"""
+        build_path = f'{self.path}.tmp-{os.getpid()}'
+        shutil.rmtree(build_path, ignore_errors=True)
+        os.makedirs(build_path)
+
+        columns = []
+        for position, name in enumerate(df.columns):
+            file_stem = f'c{position:03d}'
+            kind = self._write_column(build_path, file_stem, df[name], name in categorical, name in keys)
+            columns.append({'name': str(name), 'file': file_stem, 'kind': kind})
+
+        index_kind = None
+        if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+            index_kind = self._write_column(build_path, _INDEX_COLUMN, df.index.to_series(), False)
+
+        schema = {
+            'format_version': COLUMNAR_FORMAT_VERSION,
+            'rows': int(len(df)),
+            'columns': columns,
+            'index': index_kind
+        }
+        with open(os.path.join(build_path, 'schema.json'), 'w', encoding='utf-8') as f:
+            json.dump(schema, f, indent=2)
+
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.replace(build_path, self.path)
+        return self.path
+
+    def read(self, columns=None, mmap=False):
+        """
+        Read the requested columns (all by default) into a DataFrame.
+
+        With mmap, numeric columns stay read-only views of the mapped files,
+        so every process reading the store shares their pages.
+        """
+        schema = self.read_schema()
+        if schema.get('format_version') != COLUMNAR_FORMAT_VERSION:
+            raise ValueError(f"Unsupported columnar format in {self.path}")
+
+        available = {col['name']: col for col in schema['columns']}
+        if columns is None:
+            selected = [col['name'] for col in schema['columns']]
+        else:
+            selected = [name for name in columns if name in available]
+
+        rows = schema['rows']
+        data = {}
+        for name in selected:
+            col = available[name]
+            data[name] = self._read_column(col['file'], col['kind'], rows, mmap)
+
+        index = None
+        if schema.get('index'):
+            index = pd.Index(self._read_column(_INDEX_COLUMN, schema['index'], rows, False))
+
+        # copy=False keeps each column as its own block instead of consolidating into fresh copies
+        return pd.DataFrame(data, index=index if index is not None else pd.RangeIndex(rows), columns=selected,
+                            copy=False)
+
+    def _write_column(self, path, stem, series, as_category, as_key=False):
+        """Write a single column and return its storage kind"""
+        base = os.path.join(path, stem)
+
+        if as_category or isinstance(series.dtype, pd.CategoricalDtype):
+            values = series.astype('category')
+            np.save(f'{base}.codes.npy', _downcast_codes(values.cat.codes.to_numpy()))
+            with open(f'{base}.categories.json', 'w', encoding='utf-8') as f:
+                json.dump([str(c) for c in values.cat.categories], f)
+            return 'category'
+
+        if pd.api.types.is_bool_dtype(series.dtype):
+            np.save(f'{base}.npy', series.to_numpy(dtype=bool))
+            return 'bool'
+
+        if pd.api.types.is_datetime64_any_dtype(series.dtype):
+            np.save(f'{base}.npy', series.to_numpy(dtype='datetime64[ns]'))
+            return 'datetime'
+
+        if as_key and pd.api.types.is_integer_dtype(series.dtype) and pd.api.types.is_extension_array_dtype(series.dtype):
+            # Nullable keys keep their Int64 dtype: values plus a missing mask
+            mask = series.isna().to_numpy()
+            np.save(f'{base}.npy', series.to_numpy(dtype=np.int64, na_value=0))
+            np.save(f'{base}.mask.npy', mask)
+            return 'nullable_int'
+
+        if pd.api.types.is_numeric_dtype(series.dtype):
+            np.save(f'{base}.npy', _key_values(series) if as_key else _downcast_numeric(series))
+            return 'numeric'
+
+        mask = series.isna().to_numpy()
+        text = series.astype(object).where(~mask, '').astype(str)
+        text = text.str.replace(_STRING_SEPARATOR, ' ', regex=False)
+        with open(f'{base}.utf8', 'w', encoding='utf-8', newline='') as f:
+            f.write(_STRING_SEPARATOR.join(text.tolist()))
+        if mask.any():
+            np.save(f'{base}.mask.npy', mask)
+        return 'string'
+
+    def _read_column(self, stem, kind, rows, mmap):
+        """Read a single column of the given storage kind"""
+        base = os.path.join(self.path, stem)
+        mmap_mode = 'r' if mmap else None
+
+        if kind == 'category':
+            codes = np.load(f'{base}.codes.npy')
+            with open(f'{base}.categories.json', 'r', encoding='utf-8') as f:
+                categories = json.load(f)
+            return pd.Categorical.from_codes(codes, categories=categories)
+
+        if kind == 'nullable_int':
+            return pd.arrays.IntegerArray(np.load(f'{base}.npy', mmap_mode=mmap_mode), np.load(f'{base}.mask.npy'))
+
+        if kind in ('bool', 'datetime', 'numeric'):
+            return np.load(f'{base}.npy', mmap_mode=mmap_mode)
+
+        with open(f'{base}.utf8', 'r', encoding='utf-8', newline='') as f:
+            packed = f.read()
+        values = np.array(packed.split(_STRING_SEPARATOR) if rows else [], dtype=object)
+        mask_path = f'{base}.mask.npy'
+        if os.path.exists(mask_path):
+            values[np.load(mask_path)] = np.nan
+        return values
+
+
+def _downcast_codes(codes):
+    """Store categorical codes in the smallest signed integer type"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if len(codes) == 0 or codes.max() <= np.iinfo(dtype).max:
+            return codes.astype(dtype)
+    return codes.astype(np.int64)
+
+
+def _key_values(series):
+    """Identifier values as int64, or float64 when some are missing"""
+    if pd.api.types.is_integer_dtype(series.dtype) and not series.isna().any():
+        return series.to_numpy(dtype=np.int64)
+    return series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _downcast_numeric(series):
+    """Downcast a numeric column to the smallest type that holds it exactly"""
+    if pd.api.types.is_integer_dtype(series.dtype) and not series.isna().any():
+        return pd.to_numeric(series, downcast='integer').to_numpy()
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    # Only narrow floats when it is lossless, e.g. whole-number counts with NaNs
+    narrowed = values.astype(np.float32)
+    if np.array_equal(narrowed.astype(np.float64), values, equal_nan=True):
+        return narrowed
+    return values
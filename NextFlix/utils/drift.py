@@ -0,0 +1,102 @@
+import time
+
+import numpy as np
+
+
+def captured_energy(matrix, block_size=65536):
+    """
+    Squared norm of each reduced row.
+
+    Rows are projections of unit-length TF-IDF vectors onto orthonormal SVD
+    components, so this is the share of each document the components explain.
+    """
+    energy = np.empty(len(matrix), dtype=np.float64)
+    for start in range(0, len(matrix), block_size):
+        block = np.asarray(matrix[start:start + block_size], dtype=np.float64)
+        energy[start:start + block_size] = np.einsum('ij,ij->i', block, block)
+    return energy
+
+
+class CatalogDrift:
+    """
+    Tracks how far titles folded into a fitted model have drifted from it.
+
+    Folded-in titles reuse the fitted vocabulary and SVD components, so the
+    model degrades as they accumulate: their share of the catalog grows, and
+    new vocabulary shows up as a falling share of their TF-IDF energy being
+    captured by the components. A full refit is recommended once either
+    crosses its threshold.
+    """
+
+    MAX_INGESTED_FRACTION = 0.2
+    MIN_ENERGY_RATIO = 0.8
+    MIN_SAMPLES = 50  # Ingested titles needed before the energy ratio is trusted
+
+    def __init__(self, fitted_size, baseline_energy, ingested=0, energy_sum=0.0, coverage_sum=0.0,
+                 last_ingest_at=None):
+        self.fitted_size = fitted_size
+        self.baseline_energy = baseline_energy
+        self.ingested = ingested
+        self.energy_sum = energy_sum
+        self.coverage_sum = coverage_sum
+        self.last_ingest_at = last_ingest_at
+
+    @classmethod
+    def from_matrix(cls, matrix):
+        """Start tracking a freshly fitted reduced item matrix"""
+        energy = captured_energy(matrix)
+        nonempty = energy[energy > 0]
+        return cls(len(matrix), float(nonempty.mean()) if len(nonempty) else 1.0)
+
+    def record(self, folded, coverage):
+        """Account for a batch of folded-in rows and their vocabulary coverage"""
+        energy = captured_energy(folded)
+        self.ingested += len(folded)
+        self.energy_sum += float(energy.sum())
+        self.coverage_sum += float(np.sum(coverage))
+        self.last_ingest_at = time.time()
+
+    @property
+    def ingested_fraction(self):
+        return self.ingested / max(self.fitted_size, 1)
+
+    @property
+    def energy_ratio(self):
+        if not self.ingested:
+            return 1.0
+        return (self.energy_sum / self.ingested) / (self.baseline_energy or 1.0)
+
+    @property
+    def refit_recommended(self):
+        return (
+            self.ingested_fraction > self.MAX_INGESTED_FRACTION or
+            (self.ingested >= self.MIN_SAMPLES and self.energy_ratio < self.MIN_ENERGY_RATIO)
+        )
+
+    def report(self):
+        """Drift metrics for health checks and ingest responses"""
+        return {
+            'fitted_items': self.fitted_size,
+            'ingested_items': self.ingested,
+            'ingested_fraction': round(self.ingested_fraction, 4),
+            'energy_ratio': round(self.energy_ratio, 4),
+            'vocabulary_coverage': round(self.coverage_sum / self.ingested, 4) if self.ingested else None,
+            'last_ingest_at': self.last_ingest_at,
+            'refit_recommended': self.refit_recommended
+        }
+
+    def to_meta(self):
+        """JSON state persisted with the model snapshot"""
+        return {
+            'fitted_size': self.fitted_size,
+            'baseline_energy': self.baseline_energy,
+            'ingested': self.ingested,
+            'energy_sum': self.energy_sum,
+            'coverage_sum': self.coverage_sum,
+            'last_ingest_at': self.last_ingest_at
+        }
+
+    @classmethod
+    def from_meta(cls, meta):
+        """Restore persisted drift state"""
+        return cls(**meta)
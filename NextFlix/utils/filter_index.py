@@ -0,0 +1,205 @@
+import re
+import copy
+
+import numpy as np
+import pandas as pd
+
+_GENRE_SEPARATORS = re.compile(r'[,|]')
+
+
+class SortedColumnIndex:
+    """Sorted values of a numeric column for binary-searched range queries"""
+
+    def __init__(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        valid = np.flatnonzero(~np.isnan(values))
+        order = np.argsort(values[valid], kind='stable')
+        self.positions = valid[order]
+        self.sorted_values = values[self.positions]
+
+    def extended(self, values, start):
+        """Copy of the index with values for rows start, start + 1, ... merged in"""
+        values = np.asarray(values, dtype=np.float64)
+        valid = np.flatnonzero(~np.isnan(values))
+        order = valid[np.argsort(values[valid], kind='stable')]
+        # New rows come after every existing row, so they go after equal values
+        insert_at = np.searchsorted(self.sorted_values, values[order], side='right')
+        index = copy.copy(self)
+        index.positions = np.insert(self.positions, insert_at, order + start)
+        index.sorted_values = np.insert(self.sorted_values, insert_at, values[order])
+        return index
+
+    def range_positions(self, low=None, high=None):
+        """Row positions with low <= value <= high"""
+        start = 0 if low is None else np.searchsorted(self.sorted_values, low, side='left')
+        stop = len(self.sorted_values) if high is None else np.searchsorted(self.sorted_values, high, side='right')
+        return self.positions[start:stop]
+
+
+class CatalogFilterIndex:
+    """
+    Precomputed filter index over one catalog.
+
+    Genres and equality columns (language, certification) are kept as packed
+    multi-hot bitsets, numeric columns as sorted arrays queried with binary
+    search. A query ANDs the bitsets together and returns the matching row
+    positions, which index both the catalog and its item matrix directly.
+    """
+
+    def __init__(self, df, equality_columns=('original_language', 'certification', 'rating'),
+                 range_columns=('runtime', 'vote_average', 'release_year', 'vote_count'),
+                 min_vote_count=10):
+        self.size = len(df)
+        self.min_vote_count = min_vote_count
+        self.genre_bitsets = self._build_genre_bitsets(df['genres'] if 'genres' in df.columns else None)
+        self.equality_bitsets = {
+            col: self._build_value_bitsets(df[col])
+            for col in equality_columns if col in df.columns
+        }
+        self.range_indexes = {
+            col: SortedColumnIndex(pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64))
+            for col in range_columns if col in df.columns
+        }
+        # Quality floor applied to every query
+        self.base_bitset = self._full_bitset()
+        if 'vote_count' in self.range_indexes:
+            self.base_bitset = self._positions_to_bitset(
+                self.range_indexes['vote_count'].range_positions(low=min_vote_count)
+            )
+
+    def extended(self, df):
+        """
+        Copy of the index with the rows of df appended after the existing rows.
+
+        Packed bitsets only gain trailing bits and sorted columns take the new
+        values by insertion, so the cost grows with the appended rows rather
+        than with the catalog.
+        """
+        # Bitsets of the new rows alone, built by the same code as a full index
+        added = copy.copy(self)
+        added.size = len(df)
+        new_genres = added._build_genre_bitsets(df['genres'] if 'genres' in df.columns else None)
+        new_equality = {
+            col: added._build_value_bitsets(df[col]) for col in self.equality_bitsets if col in df.columns
+        }
+
+        index = copy.copy(self)
+        index.size = self.size + len(df)
+        index.genre_bitsets = self._extend_bitsets(self.genre_bitsets, new_genres, len(df))
+        index.equality_bitsets = {
+            col: self._extend_bitsets(bitsets, new_equality.get(col, {}), len(df))
+            for col, bitsets in self.equality_bitsets.items()
+        }
+        index.range_indexes = {
+            col: column_index.extended(self._numeric(df, col), self.size)
+            for col, column_index in self.range_indexes.items()
+        }
+        new_base = np.ones(len(df), dtype=bool)
+        if 'vote_count' in self.range_indexes:
+            new_base = self._numeric(df, 'vote_count') >= self.min_vote_count
+        index.base_bitset = self._append_bits(self.base_bitset, new_base)
+        return index
+
+    @staticmethod
+    def _numeric(df, col):
+        if col not in df.columns:
+            return np.full(len(df), np.nan)
+        return pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64)
+
+    def _extend_bitsets(self, bitsets, new_bitsets, count):
+        """Append count rows to every bitset, set where the new rows' bitsets are"""
+        empty_old = self._empty_bitset()
+        empty_new = np.zeros(count, dtype=bool)
+        values = list(bitsets) + [value for value in new_bitsets if value not in bitsets]
+        return {
+            value: self._append_bits(
+                bitsets.get(value, empty_old),
+                np.unpackbits(new_bitsets[value], count=count).astype(bool) if value in new_bitsets else empty_new
+            )
+            for value in values
+        }
+
+    def _append_bits(self, bitset, bits):
+        """Packed bitset of this index's rows followed by the given bools"""
+        full_bytes = self.size // 8
+        tail = np.unpackbits(bitset[full_bytes:], count=self.size % 8).astype(bool)
+        return np.concatenate([bitset[:full_bytes], np.packbits(np.concatenate([tail, bits]))])
+
+    def has_column(self, col):
+        """Check whether the column is indexed for equality or range queries"""
+        return col in self.equality_bitsets or col in self.range_indexes
+
+    def genre_bitset(self, genres):
+        """Bitset of rows having any genre containing one of the given names"""
+        bitset = self._empty_bitset()
+        for genre in genres:
+            needle = genre.strip().lower()
+            for token, token_bitset in self.genre_bitsets.items():
+                if needle in token:
+                    np.bitwise_or(bitset, token_bitset, out=bitset)
+        return bitset
+
+    def equality_bitset(self, col, values):
+        """Bitset of rows whose column equals any of the given values"""
+        bitset = self._empty_bitset()
+        value_bitsets = self.equality_bitsets.get(col, {})
+        for value in values:
+            if value in value_bitsets:
+                np.bitwise_or(bitset, value_bitsets[value], out=bitset)
+        return bitset
+
+    def range_bitset(self, col, low=None, high=None):
+        """Bitset of rows whose column lies within [low, high]"""
+        return self._positions_to_bitset(self.range_indexes[col].range_positions(low, high))
+
+    def query(self, genres=None, equals=None, ranges=None):
+        """
+        AND together all filters and return matching row positions.
+
+        equals maps a column to acceptable values, ranges maps a column to an
+        inclusive (low, high) pair where either bound may be None.
+        """
+        bitset = self.base_bitset.copy()
+        if genres:
+            np.bitwise_and(bitset, self.genre_bitset(genres), out=bitset)
+        for col, values in (equals or {}).items():
+            np.bitwise_and(bitset, self.equality_bitset(col, values), out=bitset)
+        for col, (low, high) in (ranges or {}).items():
+            np.bitwise_and(bitset, self.range_bitset(col, low, high), out=bitset)
+        return np.flatnonzero(np.unpackbits(bitset, count=self.size))
+
+    def _build_genre_bitsets(self, genres):
+        """Multi-hot genre bitsets keyed by lower-cased genre name"""
+        if genres is None:
+            return {}
+        split = genres.fillna('').astype(str).str.lower().str.split(_GENRE_SEPARATORS)
+        positions = np.repeat(np.arange(self.size), split.str.len().to_numpy())
+        tokens = split.explode().str.strip().to_numpy(dtype=object)
+        bitsets = self._group_bitsets(tokens, positions)
+        bitsets.pop('', None)
+        return bitsets
+
+    def _build_value_bitsets(self, column):
+        """Bitsets keyed by each distinct value of an equality column"""
+        return self._group_bitsets(column.astype(object).to_numpy(), np.arange(self.size))
+
+    def _group_bitsets(self, values, positions):
+        """One bitset per distinct value, built with a single sort"""
+        codes, uniques = pd.factorize(values, sort=False)
+        order = np.argsort(codes, kind='stable')
+        boundaries = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        return {
+            value: self._positions_to_bitset(positions[order[boundaries[i]:boundaries[i + 1]]])
+            for i, value in enumerate(uniques)
+        }
+
+    def _positions_to_bitset(self, positions):
+        mask = np.zeros(self.size, dtype=bool)
+        mask[positions] = True
+        return np.packbits(mask)
+
+    def _empty_bitset(self):
+        return np.zeros((self.size + 7) // 8, dtype=np.uint8)
+
+    def _full_bitset(self):
+        return np.packbits(np.ones(self.size, dtype=bool))
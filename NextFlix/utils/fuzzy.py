@@ -0,0 +1,125 @@
+import copy
+import logging
+
+import numpy as np
+
+from utils.autocomplete import TitleAutocomplete, normalize_title
+
+logger = logging.getLogger(__name__)
+
+
+def substring_distance(pattern, text, bound):
+    """
+    Edit distance (with adjacent transpositions) between pattern and its
+    best-matching substring of text.
+
+    Returns bound + 1 as soon as every alignment exceeds the bound.
+    """
+    before = None
+    previous = [0] * (len(text) + 1)
+    for i, pattern_char in enumerate(pattern, 1):
+        current = [i] + [0] * len(text)
+        for j, text_char in enumerate(text, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (pattern_char != text_char))
+            if before is not None and j > 1 and pattern_char == text[j - 2] and pattern[i - 2] == text_char:
+                cost = min(cost, before[j - 2] + 1)
+            current[j] = cost
+        if min(current) > bound:
+            return bound + 1
+        before, previous = previous, current
+    return min(previous)
+
+
+class FuzzyTitleMatcher:
+    """
+    Typo-tolerant title lookup over a character-trigram index.
+
+    Normalized titles are indexed by their trigrams in CSR posting lists. A
+    query collects the titles sharing the most trigrams with it (an edit
+    changes at most three trigrams, which bounds the overlap needed), verifies
+    only a fixed number of them with a cut-off edit distance against the
+    closest title substring, and ranks survivors by distance and then
+    popularity. Overlap counting is one bincount, so a lookup is linear in
+    the catalog size at worst and never runs edit distance on the whole of it.
+    """
+
+    MAX_CANDIDATES = 64
+
+    def __init__(self, titles, priority):
+        self.titles = [normalize_title(title) for title in titles]
+        self.ranks = TitleAutocomplete._title_ranks(priority)
+        self.trigram_ids = {}
+        gram_codes, gram_titles = self._title_grams(self.titles, 0)
+        order = np.argsort(gram_codes, kind='stable')
+        self.postings = gram_titles[order]
+        self.offsets = np.searchsorted(gram_codes[order], np.arange(len(self.trigram_ids) + 1)).astype(np.int64)
+
+        logger.info(f"🔡 Fuzzy title index built: {len(self.titles)} titles, {len(self.trigram_ids)} trigrams")
+
+    def _title_grams(self, titles, start):
+        """(trigram id, title position) pairs of titles numbered from start, registering new trigrams"""
+        gram_codes, gram_titles = [], []
+        for position, title in enumerate(titles, start):
+            for gram in self._trigrams(title):
+                gram_codes.append(self.trigram_ids.setdefault(gram, len(self.trigram_ids)))
+                gram_titles.append(position)
+        return np.asarray(gram_codes, dtype=np.int64), np.asarray(gram_titles, dtype=np.int32)
+
+    def extended(self, titles, priority):
+        """Copy of the matcher with titles appended; priority covers every title"""
+        matcher = copy.copy(self)
+        new_titles = [normalize_title(title) for title in titles]
+        matcher.titles = self.titles + new_titles
+        matcher.ranks = TitleAutocomplete._title_ranks(priority)
+        matcher.trigram_ids = dict(self.trigram_ids)
+        gram_codes, gram_titles = matcher._title_grams(new_titles, len(self.titles))
+
+        # Existing trigram ids are stable and new titles follow every posting, so a stable sort merges
+        old_codes = np.repeat(np.arange(len(self.trigram_ids), dtype=np.int64), np.diff(self.offsets))
+        gram_codes = np.concatenate([old_codes, gram_codes])
+        order = np.argsort(gram_codes, kind='stable')
+        matcher.postings = np.concatenate([self.postings, gram_titles])[order]
+        matcher.offsets = np.searchsorted(gram_codes[order], np.arange(len(matcher.trigram_ids) + 1)).astype(np.int64)
+        return matcher
+
+    @staticmethod
+    def _trigrams(text):
+        # Padding gives short words boundary trigrams such as " he" and "rt "
+        text = f' {text} '
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    @staticmethod
+    def max_distance(query):
+        """Edit-distance bound scaled to the query length"""
+        if len(query) <= 4:
+            return 1
+        return 2 if len(query) <= 8 else 3
+
+    def match(self, query, limit=10, max_distance=None):
+        """Catalog row positions of titles within the edit-distance bound, best first"""
+        query = normalize_title(query)
+        if len(query) < 3:
+            return np.empty(0, dtype=np.int64)
+        bound = self.max_distance(query) if max_distance is None else max_distance
+
+        query_grams = self._trigrams(query)
+        grams = [self.trigram_ids[gram] for gram in query_grams if gram in self.trigram_ids]
+        if not grams:
+            return np.empty(0, dtype=np.int64)
+
+        postings = np.concatenate([self.postings[self.offsets[gram]:self.offsets[gram + 1]] for gram in grams])
+        shared = np.bincount(postings, minlength=len(self.titles))
+        # Each edit removes at most three of the query's trigrams
+        candidates = np.flatnonzero(shared >= max(1, len(query_grams) - 3 * bound))
+        if len(candidates) > self.MAX_CANDIDATES:
+            # Most shared trigrams first, then most popular
+            priority = shared[candidates].astype(np.int64) * len(self.titles) - self.ranks[candidates]
+            candidates = candidates[np.argpartition(-priority, self.MAX_CANDIDATES - 1)[:self.MAX_CANDIDATES]]
+
+        matches = []
+        for position in candidates.tolist():
+            distance = substring_distance(query, self.titles[position], bound)
+            if distance <= bound:
+                matches.append((distance, int(self.ranks[position]), position))
+        matches.sort()
+        return np.asarray([position for _, _, position in matches[:limit]], dtype=np.int64)
@@ -0,0 +1,81 @@
+import sys
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def resident_memory_mb():
+    """Current resident set size of this process in MB (peak RSS where unavailable)"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in KB elsewhere
+    return peak / (1024.0 * 1024.0) if sys.platform == 'darwin' else peak / 1024.0
+
+
+def reset_peak_memory():
+    """Restart peak RSS tracking from the current RSS; False where the kernel does not support it"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_memory_mb():
+    """Peak resident set size of this process in MB, since start or the last reset_peak_memory()"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024.0 * 1024.0) if sys.platform == 'darwin' else peak / 1024.0
+
+
+def frame_memory_mb(df):
+    """Deep memory usage of a DataFrame in MB"""
+    return float(df.memory_usage(deep=True).sum()) / (1024.0 * 1024.0)
+
+
+def array_memory_mb(array):
+    """Memory held by an array in MB (the mapped size for memory-mapped arrays)"""
+    return float(getattr(array, 'nbytes', 0)) / (1024.0 * 1024.0)
+
+
+def memory_sharing_mb():
+    """
+    Proportional, private and shared resident memory of this process in MB.
+
+    Pages shared with other processes (a preloading master, or memory-mapped
+    snapshot files) count towards shared, not private; None where
+    /proc/self/smaps_rollup is unavailable.
+    """
+    fields = {}
+    try:
+        with open('/proc/self/smaps_rollup', 'r') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == 'kB':
+                    fields[parts[0].rstrip(':')] = int(parts[1]) / 1024.0
+    except OSError:
+        return None
+    return {
+        'pss_mb': round(fields.get('Pss', 0.0), 1),
+        'private_mb': round(fields.get('Private_Clean', 0.0) + fields.get('Private_Dirty', 0.0), 1),
+        'shared_mb': round(fields.get('Shared_Clean', 0.0) + fields.get('Shared_Dirty', 0.0), 1)
+    }
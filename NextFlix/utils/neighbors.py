@@ -0,0 +1,143 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from utils.quantization import QuantizedEmbeddings
+
+logger = logging.getLogger(__name__)
+
+
+class ItemNeighbors:
+    """
+    Precomputed "more like this" lists: the top-N most similar items per row.
+
+    Lists are built offline from unit-length item vectors by scoring one
+    block of rows against the whole catalog at a time, so the N x N
+    similarity matrix is never held in memory. They are stored as two dense
+    (items x N) arrays, neighbour row positions and cosine scores, which map
+    straight into the model snapshot. A title id resolves to its row through
+    a hash index, so a lookup is one hash probe and one row slice.
+    """
+
+    # Upper bound on the similarity block scored at once (elements)
+    BLOCK_SIZE = 16 * 1024 * 1024
+
+    def __init__(self, neighbors, scores, ids):
+        self.neighbors = neighbors
+        self.scores = scores
+        self.ids = ids
+        # First row wins for ids repeated in the source catalog
+        first = ~pd.Index(ids).duplicated(keep='first')
+        self._id_positions = np.flatnonzero(first)
+        self._id_index = pd.Index(ids[first])
+
+    @property
+    def n_neighbors(self):
+        return self.neighbors.shape[1]
+
+    @property
+    def nbytes(self):
+        return self.neighbors.nbytes + self.scores.nbytes
+
+    @classmethod
+    def build(cls, embeddings, ids, n_neighbors=32):
+        """Exact top-N neighbour lists for every row of the embeddings"""
+        vectors = cls._float_rows(embeddings)
+        n_items = len(vectors)
+        k = max(0, min(n_neighbors, n_items - 1))
+        neighbors = np.empty((n_items, k), dtype=cls._position_dtype(n_items))
+        scores = np.empty((n_items, k), dtype=np.float32)
+        block_rows = max(1, cls.BLOCK_SIZE // max(n_items, 1))
+        for start in range(0, n_items, block_rows):
+            rows = np.arange(start, min(start + block_rows, n_items))
+            block = vectors[rows] @ vectors.T
+            # An item is never its own neighbour
+            block[np.arange(len(rows)), rows] = -np.inf
+            top = cls._top_k(block, k)
+            neighbors[rows] = top
+            scores[rows] = np.take_along_axis(block, top, axis=1)
+
+        logger.info(f"🔗 Neighbour lists built: {n_items} items x {k} neighbours")
+        return cls(neighbors, scores, np.asarray(ids, dtype=np.int64))
+
+    @staticmethod
+    def _float_rows(embeddings):
+        """Full-precision float32 rows, so int8 serving codes do not blur the lists"""
+        if isinstance(embeddings, QuantizedEmbeddings):
+            return embeddings.float_rows()
+        return np.asarray(embeddings, dtype=np.float32)
+
+    @staticmethod
+    def _position_dtype(n_items):
+        return np.int32 if n_items < 2**31 else np.int64
+
+    @staticmethod
+    def _top_k(block, k):
+        """Column indices of each row's k highest scores, highest first"""
+        if k == 0:
+            return np.empty((len(block), 0), dtype=np.intp)
+        if k < block.shape[1]:
+            top = np.argpartition(block, block.shape[1] - k, axis=1)[:, -k:]
+        else:
+            top = np.broadcast_to(np.arange(block.shape[1]), block.shape)
+        order = np.argsort(-np.take_along_axis(block, top, axis=1), axis=1, kind='stable')
+        return np.take_along_axis(top, order, axis=1)
+
+    def extended(self, embeddings, start, ids):
+        """
+        Copy of the lists over embeddings whose rows from start on are new.
+
+        New rows get exact lists over the whole catalog; existing lists only
+        have to consider the new rows, merged in one block of rows at a time.
+        """
+        vectors = self._float_rows(embeddings)
+        n_items = len(vectors)
+        k = self.n_neighbors
+        new_rows = np.arange(start, n_items)
+        position_dtype = self._position_dtype(n_items)
+        neighbors = np.empty((n_items, k), dtype=position_dtype)
+        scores = np.empty((n_items, k), dtype=np.float32)
+
+        block_rows = max(1, self.BLOCK_SIZE // max(len(new_rows) + k, 1))
+        for block_start in range(0, start, block_rows):
+            rows = np.arange(block_start, min(block_start + block_rows, start))
+            block = np.hstack([np.asarray(self.scores[rows], dtype=np.float32), vectors[rows] @ vectors[start:].T])
+            columns = np.hstack([np.asarray(self.neighbors[rows], dtype=position_dtype),
+                                 np.broadcast_to(new_rows.astype(position_dtype), (len(rows), len(new_rows)))])
+            top = self._top_k(block, k)
+            neighbors[rows] = np.take_along_axis(columns, top, axis=1)
+            scores[rows] = np.take_along_axis(block, top, axis=1)
+
+        block_rows = max(1, self.BLOCK_SIZE // max(n_items, 1))
+        for block_start in range(start, n_items, block_rows):
+            rows = np.arange(block_start, min(block_start + block_rows, n_items))
+            block = vectors[rows] @ vectors.T
+            block[np.arange(len(rows)), rows] = -np.inf
+            top = self._top_k(block, k)
+            neighbors[rows] = top
+            scores[rows] = np.take_along_axis(block, top, axis=1)
+        return ItemNeighbors(neighbors, scores, np.asarray(ids, dtype=np.int64))
+
+    def to_arrays(self, prefix):
+        """Arrays needed to persist the lists, keyed for the model snapshot"""
+        return {f'{prefix}_neighbor_items': self.neighbors, f'{prefix}_neighbor_scores': self.scores}
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix, ids):
+        """Restore persisted lists, or return None if they were not persisted"""
+        keys = [f'{prefix}_neighbor_items', f'{prefix}_neighbor_scores']
+        if not all(key in arrays for key in keys):
+            return None
+        return cls(arrays[keys[0]], arrays[keys[1]], np.asarray(ids, dtype=np.int64))
+
+    def position(self, title_id):
+        """Row position of a title id, or None if the catalog does not hold it"""
+        try:
+            return int(self._id_positions[self._id_index.get_loc(title_id)])
+        except KeyError:
+            return None
+
+    def similar(self, position, limit):
+        """(row positions, cosine scores) of the items most similar to a row"""
+        return self.neighbors[position, :limit], self.scores[position, :limit]
@@ -0,0 +1,27 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+
+def map_chunks(func, chunks, workers=1):
+    """
+    Apply func to each chunk, yielding the results in input order.
+
+    With more than one worker the chunks are processed in a process pool, so
+    CPU-bound cleaning scales across cores. Only a few chunks per worker are
+    in flight at once, so a chunked CSV reader is consumed as results are
+    taken rather than read into memory up front. func must be picklable: a
+    module-level function, or a functools.partial of one.
+    """
+    if not workers or workers <= 1:
+        for chunk in chunks:
+            yield func(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(func, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
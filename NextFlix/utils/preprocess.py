@@ -1,19 +1,38 @@
 import pandas as pd
 import numpy as np
-import re
 from datetime import datetime
-import pickle
+from functools import partial
 import os
 
+try:
+    from utils.columnar import ColumnarStore
+    from utils.parallel import map_chunks
+except ImportError:  # Executed directly as a script from within utils/
+    from columnar import ColumnarStore
+    from parallel import map_chunks
+
 class DataPreprocessor:
     """
     Utility class for preprocessing TMDB movie and series datasets
     Optimized for large datasets and memory efficiency
+    With workers > 1, chunks are cleaned in parallel worker processes
     """
     
-    def __init__(self):
+    # Map common genre variations to a standard name
+    GENRE_MAPPING = {
+        'sci-fi': 'science fiction',
+        'scifi': 'science fiction',
+        'rom-com': 'romantic comedy',
+        'romcom': 'romantic comedy',
+        'action & adventure': 'action',
+        'kids & family': 'family',
+        'tv movie': 'television',
+    }
+    
+    def __init__(self, workers=1):
         self.movies_df = None
         self.series_df = None
+        self.workers = workers
         
     def load_and_clean_movies(self, file_path, chunk_size=10000):
         """Load and clean movies dataset in chunks"""
@@ -30,14 +49,11 @@ class DataPreprocessor:
         total_rows = 0
         
         try:
-            for chunk in pd.read_csv(file_path, chunksize=chunk_size, low_memory=False):
-                # Select only required columns that exist
-                available_cols = [col for col in required_cols if col in chunk.columns]
-                chunk = chunk[available_cols]
-                
-                # Clean the chunk
-                cleaned_chunk = self._clean_movie_chunk(chunk)
-                
+            reader = pd.read_csv(file_path, chunksize=chunk_size, low_memory=False,
+                                 usecols=lambda col: col in required_cols)
+            # Clean the chunks, in worker processes if configured, keeping file order
+            clean = partial(_clean_chunk, 'movie', required_cols)
+            for cleaned_chunk in map_chunks(clean, reader, self.workers):
                 if len(cleaned_chunk) > 0:
                     chunks.append(cleaned_chunk)
                     total_rows += len(cleaned_chunk)
@@ -70,14 +86,11 @@ class DataPreprocessor:
         total_rows = 0
         
         try:
-            for chunk in pd.read_csv(file_path, chunksize=chunk_size, low_memory=False):
-                # Select only required columns that exist
-                available_cols = [col for col in required_cols if col in chunk.columns]
-                chunk = chunk[available_cols]
-                
-                # Clean the chunk
-                cleaned_chunk = self._clean_series_chunk(chunk)
-                
+            reader = pd.read_csv(file_path, chunksize=chunk_size, low_memory=False,
+                                 usecols=lambda col: col in required_cols)
+            # Clean the chunks, in worker processes if configured, keeping file order
+            clean = partial(_clean_chunk, 'series', required_cols)
+            for cleaned_chunk in map_chunks(clean, reader, self.workers):
                 if len(cleaned_chunk) > 0:
                     chunks.append(cleaned_chunk)
                     total_rows += len(cleaned_chunk)
@@ -96,21 +109,22 @@ class DataPreprocessor:
             print("No series data could be loaded")
             return None
     
-    def _clean_movie_chunk(self, chunk):
+    @classmethod
+    def _clean_movie_chunk(cls, chunk):
         """Clean a chunk of movie data"""
         # Drop rows with missing essential data
         chunk = chunk.dropna(subset=['title', 'overview'])
         
         # Clean text fields
-        chunk['title'] = chunk['title'].astype(str).apply(self._clean_text)
-        chunk['overview'] = chunk['overview'].astype(str).apply(self._clean_text)
-        chunk['genres'] = chunk['genres'].fillna('').astype(str).apply(self._clean_genres)
+        chunk['title'] = cls._clean_text_column(chunk['title'].astype(str))
+        chunk['overview'] = cls._clean_text_column(chunk['overview'].astype(str))
+        chunk['genres'] = cls._clean_genres_column(chunk['genres'].fillna('').astype(str))
         
         # Handle cast and director if available
         if 'cast' in chunk.columns:
-            chunk['cast'] = chunk['cast'].fillna('').astype(str).apply(self._clean_text)
+            chunk['cast'] = cls._clean_text_column(chunk['cast'].fillna('').astype(str))
         if 'director' in chunk.columns:
-            chunk['director'] = chunk['director'].fillna('').astype(str).apply(self._clean_text)
+            chunk['director'] = cls._clean_text_column(chunk['director'].fillna('').astype(str))
         
         # Clean numeric fields
         chunk['vote_average'] = pd.to_numeric(chunk['vote_average'], errors='coerce').fillna(0)
@@ -139,11 +153,12 @@ class DataPreprocessor:
         chunk['content_type'] = 'movie'
         
         # Calculate popularity score
-        chunk['popularity_score'] = self._calculate_popularity_score(chunk)
+        chunk['popularity_score'] = cls._calculate_popularity_score(chunk)
         
         return chunk
     
-    def _clean_series_chunk(self, chunk):
+    @classmethod
+    def _clean_series_chunk(cls, chunk):
         """Clean a chunk of series data"""
         # Rename 'name' to 'title' for consistency
         if 'name' in chunk.columns:
@@ -155,9 +170,9 @@ class DataPreprocessor:
         chunk = chunk.dropna(subset=['title', 'overview'])
         
         # Clean text fields
-        chunk['title'] = chunk['title'].astype(str).apply(self._clean_text)
-        chunk['overview'] = chunk['overview'].astype(str).apply(self._clean_text)
-        chunk['genres'] = chunk['genres'].fillna('').astype(str).apply(self._clean_genres)
+        chunk['title'] = cls._clean_text_column(chunk['title'].astype(str))
+        chunk['overview'] = cls._clean_text_column(chunk['overview'].astype(str))
+        chunk['genres'] = cls._clean_genres_column(chunk['genres'].fillna('').astype(str))
         
         # Clean numeric fields
         chunk['vote_average'] = pd.to_numeric(chunk['vote_average'], errors='coerce').fillna(0)
@@ -187,23 +202,12 @@ class DataPreprocessor:
         chunk['content_type'] = 'series'
         
         # Calculate popularity score
-        chunk['popularity_score'] = self._calculate_popularity_score(chunk)
+        chunk['popularity_score'] = cls._calculate_popularity_score(chunk)
         
         return chunk
     
-    def _clean_text(self, text):
-        """Clean text data"""
-        if pd.isna(text) or text == '':
-            return ""
-        
-        text = str(text).strip()
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
-        # Remove special characters that might cause encoding issues
-        text = re.sub(r'[^\w\s\-.,!?\'\"()&]', ' ', text)
-        return text
-    
-    def _clean_genres(self, genres):
+    @classmethod
+    def _clean_genres(cls, genres):
         """Clean and standardize genres"""
         if pd.isna(genres) or genres == '':
             return ""
@@ -217,23 +221,28 @@ class DataPreprocessor:
         standardized = []
         for genre in genre_list:
             genre = genre.lower().strip()
-            # Map common variations
-            genre_mapping = {
-                'sci-fi': 'science fiction',
-                'scifi': 'science fiction',
-                'rom-com': 'romantic comedy',
-                'romcom': 'romantic comedy',
-                'action & adventure': 'action',
-                'kids & family': 'family',
-                'tv movie': 'television',
-            }
-            genre = genre_mapping.get(genre, genre)
+            genre = cls.GENRE_MAPPING.get(genre, genre)
             if genre and len(genre) > 1:
                 standardized.append(genre.title())
         
         return ', '.join(standardized[:5])  # Limit to 5 genres max
     
-    def _calculate_popularity_score(self, df):
+    @staticmethod
+    def _clean_text_column(texts):
+        """Collapse whitespace and drop characters that might cause encoding issues in a Series of strings"""
+        texts = texts.str.strip().str.replace(r'\s+', ' ', regex=True)
+        texts = texts.str.replace(r'[^\w\s\-.,!?\'\"()&]', ' ', regex=True)
+        return texts.fillna('')
+    
+    @classmethod
+    def _clean_genres_column(cls, genres):
+        """_clean_genres over a Series, computed once per distinct genre string"""
+        codes, uniques = pd.factorize(genres.fillna(''))
+        cleaned = np.array([cls._clean_genres(value) for value in uniques], dtype=object)
+        return pd.Series(cleaned[codes], index=genres.index)
+    
+    @staticmethod
+    def _calculate_popularity_score(df):
         """Calculate normalized popularity score"""
         # Normalize vote average (0-10 scale)
         vote_avg_norm = df['vote_average'] / 10.0
@@ -294,42 +303,41 @@ class DataPreprocessor:
         return language_counts.head(20)
     
     def save_processed_data(self, output_dir='data/processed'):
-        """Save processed datasets"""
+        """Save processed datasets in columnar format"""
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
         
         if self.movies_df is not None:
-            movies_path = os.path.join(output_dir, 'movies_processed.pkl')
-            with open(movies_path, 'wb') as f:
-                pickle.dump(self.movies_df, f)
+            movies_path = ColumnarStore(os.path.join(output_dir, 'movies')).write(self.movies_df)
             print(f"Saved processed movies to {movies_path}")
         
         if self.series_df is not None:
-            series_path = os.path.join(output_dir, 'series_processed.pkl')
-            with open(series_path, 'wb') as f:
-                pickle.dump(self.series_df, f)
+            series_path = ColumnarStore(os.path.join(output_dir, 'series')).write(self.series_df)
             print(f"Saved processed series to {series_path}")
     
-    def load_processed_data(self, data_dir='data/processed'):
-        """Load previously processed datasets"""
-        movies_path = os.path.join(data_dir, 'movies_processed.pkl')
-        series_path = os.path.join(data_dir, 'series_processed.pkl')
+    def load_processed_data(self, data_dir='data/processed', columns=None):
+        """Load previously processed datasets, optionally only the given columns"""
+        movies_store = ColumnarStore(os.path.join(data_dir, 'movies'))
+        series_store = ColumnarStore(os.path.join(data_dir, 'series'))
         
-        if os.path.exists(movies_path):
-            with open(movies_path, 'rb') as f:
-                self.movies_df = pickle.load(f)
-            print(f"Loaded processed movies from {movies_path}")
+        if movies_store.exists():
+            self.movies_df = movies_store.read(columns)
+            print(f"Loaded processed movies from {movies_store.path}")
         
-        if os.path.exists(series_path):
-            with open(series_path, 'rb') as f:
-                self.series_df = pickle.load(f)
-            print(f"Loaded processed series from {series_path}")
+        if series_store.exists():
+            self.series_df = series_store.read(columns)
+            print(f"Loaded processed series from {series_store.path}")
         
         return self.movies_df is not None or self.series_df is not None
 
+def _clean_chunk(kind, columns, chunk):
+    """Clean one chunk of the given kind; module level so worker processes can run it"""
+    chunk = chunk[[col for col in columns if col in chunk.columns]]
+    return getattr(DataPreprocessor, f'_clean_{kind}_chunk')(chunk)
+
 def main():
     """Example usage of the DataPreprocessor"""
-    preprocessor = DataPreprocessor()
+    preprocessor = DataPreprocessor(workers=os.cpu_count() or 1)
     
     # Try to load processed data first
     if not preprocessor.load_processed_data():
@@ -0,0 +1,128 @@
+import numpy as np
+
+from utils.scoring import l2_normalize_vector
+
+
+class QuantizedEmbeddings:
+    """
+    Int8 item embeddings with one scale per dimension.
+
+    Unit-length rows are stored as int8 codes, a quarter of the float32 size,
+    with each dimension scaled by its largest magnitude. Scoring folds the
+    scales into the query and converts codes to float32 one cache-sized block
+    at a time, so the large matrix is read at one byte per value. Scores are
+    approximate; rerank() rescores a short candidate list exactly from the
+    full-precision rows, which can stay memory-mapped on disk since only the
+    candidates' rows are touched. Indexing returns dequantized float32 rows,
+    so the approximate nearest-neighbour index can use the codes directly.
+    """
+
+    BLOCK_ROWS = 16384
+
+    def __init__(self, codes, scales, full_precision=None, appended=None):
+        self.codes = codes
+        self.scales = np.asarray(scales, dtype=np.float32)
+        # Exact rows for re-ranking: the fitted rows, plus rows appended since
+        self.full_precision = full_precision
+        self.appended = appended
+
+    @classmethod
+    def quantize(cls, embeddings, scales=None):
+        """Quantize unit-length rows, computing per-dimension scales unless given"""
+        if scales is None:
+            scales = np.zeros(embeddings.shape[1], dtype=np.float32)
+            for start in range(0, len(embeddings), cls.BLOCK_ROWS):
+                block = np.abs(np.asarray(embeddings[start:start + cls.BLOCK_ROWS], dtype=np.float32))
+                np.maximum(scales, block.max(axis=0, initial=0), out=scales)
+            scales = scales / 127.0
+            scales[scales == 0] = 1.0
+        codes = np.empty(embeddings.shape, dtype=np.int8)
+        for start in range(0, len(embeddings), cls.BLOCK_ROWS):
+            block = np.asarray(embeddings[start:start + cls.BLOCK_ROWS], dtype=np.float32) / scales
+            codes[start:start + cls.BLOCK_ROWS] = np.clip(np.rint(block), -127, 127)
+        return cls(codes, scales, full_precision=embeddings)
+
+    def to_arrays(self, prefix):
+        """Arrays needed to persist the codes, keyed for the model snapshot"""
+        return {f'{prefix}_embedding_codes': self.codes, f'{prefix}_embedding_scales': self.scales}
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix, full_precision=None):
+        """Restore persisted codes, or return None if they were not persisted"""
+        keys = [f'{prefix}_embedding_codes', f'{prefix}_embedding_scales']
+        if not all(key in arrays for key in keys):
+            return None
+        return cls(arrays[keys[0]], arrays[keys[1]], full_precision=full_precision)
+
+    def __len__(self):
+        return len(self.codes)
+
+    @property
+    def shape(self):
+        return self.codes.shape
+
+    @property
+    def dtype(self):
+        return np.dtype(np.float32)
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + self.scales.nbytes
+
+    def __getitem__(self, rows):
+        """Dequantized float32 rows"""
+        return self.codes[rows].astype(np.float32) * self.scales
+
+    def __array__(self, dtype=None, copy=None):
+        return self[:].astype(dtype or np.float32, copy=False)
+
+    def scores(self, positions, query_vector):
+        """Approximate cosine similarity of a query against the given rows"""
+        return self.scores_batch(positions, np.asarray(query_vector).reshape(1, -1))[0]
+
+    def scores_batch(self, positions, query_matrix):
+        """Approximate cosine similarities of many queries, shaped (n_queries, len(positions))"""
+        queries = np.asarray(query_matrix, dtype=np.float32)
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        queries = (queries / norms * self.scales).T
+        # Like cosine_scores, scan contiguous blocks when most rows are wanted
+        if len(positions) * 2 > len(self.codes):
+            full = np.empty((queries.shape[1], len(self.codes)), dtype=np.float32)
+            for start in range(0, len(self.codes), self.BLOCK_ROWS):
+                block = self.codes[start:start + self.BLOCK_ROWS].astype(np.float32)
+                full[:, start:start + len(block)] = (block @ queries).T
+            return full[:, positions]
+        scores = np.empty((queries.shape[1], len(positions)), dtype=np.float32)
+        for start in range(0, len(positions), self.BLOCK_ROWS):
+            block = self.codes[positions[start:start + self.BLOCK_ROWS]].astype(np.float32)
+            scores[:, start:start + len(block)] = (block @ queries).T
+        return scores
+
+    def rerank(self, positions, query_vector):
+        """Exact cosine similarity of a query against a short list of rows"""
+        if self.full_precision is None:
+            return self.scores(positions, query_vector)
+        return self.float_rows(positions) @ l2_normalize_vector(query_vector)
+
+    def float_rows(self, positions=None):
+        """Full-precision float32 rows (all rows when positions is None)"""
+        if positions is None:
+            rows = np.asarray(self.full_precision, dtype=np.float32)
+            return rows if self.appended is None else np.vstack([rows, self.appended])
+        positions = np.asarray(positions)
+        fitted = len(self.full_precision)
+        if self.appended is None or not (positions >= fitted).any():
+            return np.asarray(self.full_precision[positions], dtype=np.float32)
+        rows = np.empty((len(positions), self.codes.shape[1]), dtype=np.float32)
+        is_new = positions >= fitted
+        rows[~is_new] = self.full_precision[positions[~is_new]]
+        rows[is_new] = self.appended[positions[is_new] - fitted]
+        return rows
+
+    def extended(self, embeddings):
+        """Copy with unit-length rows appended, quantized with the existing scales"""
+        added = QuantizedEmbeddings.quantize(embeddings, scales=self.scales)
+        appended = embeddings if self.appended is None else np.vstack([self.appended, embeddings])
+        return QuantizedEmbeddings(np.vstack([self.codes, added.codes]), self.scales,
+                                   self.full_precision, appended.astype(np.float32, copy=False))
@@ -0,0 +1,109 @@
+import re
+from collections import Counter
+
+import numpy as np
+
+
+class QueryEmbedder:
+    """
+    Projects free-text queries into the reduced item space without scikit-learn.
+
+    Reproduces TfidfVectorizer's word analyzer (lowercasing, token pattern,
+    stop words, n-grams) and folds the idf weights into a per-term embedding
+    table, so a query vector is a weighted sum of a few table rows divided by
+    the query's TF-IDF norm. This matches vectorizer.transform followed by
+    svd.transform for the default smooth-idf, l2-normalized configuration.
+    """
+
+    def __init__(self, vocabulary, idf, components, stop_words=(), ngram_range=(1, 1),
+                 token_pattern=r"(?u)\b\w\w+\b", lowercase=True):
+        self.vocabulary = vocabulary
+        self.idf = np.asarray(idf, dtype=np.float64)
+        self.components = components
+        # Row t is the SVD projection of a unit count of term t, idf included
+        self.term_embeddings = np.ascontiguousarray(np.asarray(components).T * self.idf[:, np.newaxis])
+        self.stop_words = frozenset(stop_words)
+        self.ngram_range = tuple(ngram_range)
+        self.token_pattern = token_pattern
+        self.lowercase = lowercase
+        self._token_re = re.compile(token_pattern)
+
+    @property
+    def n_components(self):
+        return self.term_embeddings.shape[1]
+
+    @classmethod
+    def from_model(cls, vectorizer, svd):
+        """Export a fitted TfidfVectorizer and TruncatedSVD"""
+        return cls(
+            {term: int(i) for term, i in vectorizer.vocabulary_.items()},
+            vectorizer.idf_,
+            svd.components_,
+            stop_words=sorted(vectorizer.get_stop_words() or ()),
+            ngram_range=vectorizer.ngram_range,
+            token_pattern=vectorizer.token_pattern,
+            lowercase=vectorizer.lowercase
+        )
+
+    def to_arrays(self, prefix):
+        """Arrays needed to persist the embedder, keyed for the model snapshot"""
+        return {
+            f'{prefix}_idf': self.idf,
+            f'{prefix}_svd_components': self.components
+        }
+
+    def to_meta(self, prefix):
+        """JSON metadata needed to persist the embedder"""
+        return {
+            f'{prefix}_vocabulary': self.vocabulary,
+            f'{prefix}_analyzer': {
+                'stop_words': sorted(self.stop_words),
+                'ngram_range': list(self.ngram_range),
+                'token_pattern': self.token_pattern,
+                'lowercase': self.lowercase
+            }
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays, meta, prefix):
+        """Restore a persisted embedder"""
+        return cls(
+            meta[f'{prefix}_vocabulary'],
+            arrays[f'{prefix}_idf'],
+            arrays[f'{prefix}_svd_components'],
+            **meta[f'{prefix}_analyzer']
+        )
+
+    def analyze(self, text):
+        """Split text into the vocabulary's terms, as TfidfVectorizer does"""
+        if self.lowercase:
+            text = text.lower()
+        tokens = [token for token in self._token_re.findall(text) if token not in self.stop_words]
+        min_n, max_n = self.ngram_range
+        terms = tokens if min_n == 1 else []
+        for n in range(max(min_n, 2), max_n + 1):
+            terms.extend(' '.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return terms
+
+    def transform(self, text):
+        """Reduced embedding of a query string, shaped (1, n_components)"""
+        counts = Counter(term for term in self.analyze(text) if term in self.vocabulary)
+        if not counts:
+            return np.zeros((1, self.n_components), dtype=self.term_embeddings.dtype)
+        rows = np.fromiter((self.vocabulary[term] for term in counts), dtype=np.int64, count=len(counts))
+        weights = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        norm = np.linalg.norm(weights * self.idf[rows])
+        return ((weights / norm) @ self.term_embeddings[rows])[np.newaxis, :]
+
+    def transform_many(self, texts):
+        """Reduced embeddings of many documents, shaped (len(texts), n_components)"""
+        if not texts:
+            return np.zeros((0, self.n_components), dtype=self.term_embeddings.dtype)
+        return np.vstack([self.transform(text) for text in texts])
+
+    def coverage(self, text):
+        """Share of a document's analyzed terms found in the fitted vocabulary"""
+        terms = self.analyze(text)
+        if not terms:
+            return 1.0
+        return sum(term in self.vocabulary for term in terms) / len(terms)
@@ -0,0 +1,54 @@
+import numpy as np
+
+
+def l2_normalize_rows(matrix, dtype=np.float32):
+    """Return a contiguous copy of the matrix with unit-length rows"""
+    matrix = np.asarray(matrix, dtype=dtype)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    # Leave all-zero rows (empty content) at zero, as cosine_similarity does
+    norms[norms == 0] = 1
+    return np.ascontiguousarray(matrix / norms, dtype=dtype)
+
+
+def l2_normalize_vector(vector, dtype=np.float32):
+    """Return the vector scaled to unit length (zero vectors are unchanged)"""
+    vector = np.asarray(vector, dtype=dtype).ravel()
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+def cosine_scores(embeddings, positions, query_vector):
+    """
+    Cosine similarity of a query against the given rows of a pre-normalized
+    embedding matrix, computed as one matrix-vector product.
+    """
+    query = l2_normalize_vector(query_vector, dtype=embeddings.dtype)
+    # Scoring the whole matrix avoids gathering a copy of most of its rows
+    if len(positions) * 2 > len(embeddings):
+        return (embeddings @ query)[positions]
+    return embeddings[positions] @ query
+
+
+def top_k_indices(scores, k):
+    """Indices of the k highest scores in descending order, via partial selection"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(scores):
+        candidates = np.argpartition(scores, len(scores) - k)[-k:]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(scores[candidates], kind='stable')[::-1]]
+
+
+def cosine_scores_batch(embeddings, positions, query_matrix):
+    """
+    Cosine similarity of many queries against the given rows of a
+    pre-normalized embedding matrix, as one matrix-matrix product.
+
+    Returns an array of shape (n_queries, len(positions)).
+    """
+    queries = l2_normalize_rows(query_matrix, dtype=embeddings.dtype)
+    if len(positions) * 2 > len(embeddings):
+        return (queries @ embeddings.T)[:, positions]
+    return queries @ embeddings[positions].T
@@ -0,0 +1,227 @@
+import re
+import copy
+import logging
+from bisect import bisect_left
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from utils.scoring import top_k_indices
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_PATTERN = r'\w+'
+_TOKEN_RE = re.compile(_TOKEN_PATTERN)
+_PHRASE_RE = re.compile(r'"([^"]*)"')
+
+
+def tokenize(text):
+    """Lower-cased word tokens of a string"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class InvertedIndex:
+    """
+    Token-level inverted index over the text fields of one catalog, ranked with BM25.
+
+    Posting lists are stored in CSR layout (offsets, doc ids sorted within each
+    term) together with the precomputed BM25 impact of every posting, so
+    scoring a query is a gather and a sum. Field weights scale term
+    frequencies and lengths (BM25F-style). Query terms are intersected rarest
+    first; later terms are only probed at the surviving candidates by binary
+    search, and evaluation stops as soon as no candidate is left. The last
+    query word (or any word ending in '*') also matches as a prefix, and
+    quoted phrases are verified against the original field text.
+    """
+
+    MAX_PREFIX_EXPANSIONS = 64
+    PREFIX_WEIGHT = 0.8  # Completions score slightly below exact matches
+
+    def __init__(self, df, fields, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.size = len(df)
+        self.fields = {col: weight for col, weight in fields.items() if col in df.columns}
+        # References to the original strings, used only to verify phrases
+        self.texts = self._field_texts(df)
+
+        self.doc_lengths, tokens, docs, weights = self._analyze(self.texts, 0)
+        term_codes, vocabulary = pd.factorize(np.array(tokens, dtype=object), sort=True)
+        self.vocabulary = list(vocabulary)
+        self.term_ids = {term: i for i, term in enumerate(self.vocabulary)}
+        posting_terms, self.doc_ids, self.term_freqs = self._merge_occurrences(term_codes.astype(np.int64), docs, weights)
+        self.offsets = np.searchsorted(posting_terms, np.arange(len(self.vocabulary) + 1)).astype(np.int64)
+        self._compute_impacts(posting_terms)
+
+        logger.info(f"🔎 Search index built: {self.size} documents, {len(self.vocabulary)} terms")
+
+    def extended(self, df):
+        """
+        Copy of the index with the rows of df appended as new documents.
+
+        Only the new documents are tokenized; their postings are merged into
+        the existing lists and the BM25 statistics recomputed over the whole
+        index, so the result matches a full build.
+        """
+        start = self.size
+        index = copy.copy(self)
+        index.size = start + len(df)
+        new_texts = self._field_texts(df)
+        index.texts = {col: np.concatenate([self.texts[col], new_texts[col]]) for col in self.fields}
+        new_lengths, tokens, docs, weights = self._analyze(new_texts, start)
+        index.doc_lengths = np.concatenate([self.doc_lengths, new_lengths])
+
+        # Merge the sorted vocabularies; existing term ids shift past inserted terms
+        new_terms = sorted(set(tokens).difference(self.term_ids))
+        if new_terms:
+            index.vocabulary = sorted(self.vocabulary + new_terms)
+            index.term_ids = {term: i for i, term in enumerate(index.vocabulary)}
+        old_terms = np.repeat(np.arange(len(self.vocabulary), dtype=np.int64), np.diff(self.offsets))
+        if new_terms:
+            id_map = np.fromiter((index.term_ids[term] for term in self.vocabulary), dtype=np.int64,
+                                 count=len(self.vocabulary))
+            old_terms = id_map[old_terms]
+
+        term_codes = np.fromiter((index.term_ids[token] for token in tokens), dtype=np.int64, count=len(tokens))
+        new_terms_ids, new_docs, new_freqs = index._merge_occurrences(term_codes, docs, weights)
+        # New documents follow every existing one, so a stable sort by term keeps doc ids sorted
+        posting_terms = np.concatenate([old_terms, new_terms_ids])
+        order = np.argsort(posting_terms, kind='stable')
+        posting_terms = posting_terms[order]
+        index.doc_ids = np.concatenate([self.doc_ids, new_docs])[order]
+        index.term_freqs = np.concatenate([self.term_freqs, new_freqs])[order]
+        index.offsets = np.searchsorted(posting_terms, np.arange(len(index.vocabulary) + 1)).astype(np.int64)
+        index._compute_impacts(posting_terms)
+        return index
+
+    def _field_texts(self, df):
+        return {
+            col: df[col].fillna('').astype(str).to_numpy(dtype=object) if col in df.columns
+            else np.full(len(df), '', dtype=object)
+            for col in self.fields
+        }
+
+    def _analyze(self, texts, start):
+        """Weighted lengths and (token, doc, field weight) occurrences of documents numbered from start"""
+        count = len(next(iter(texts.values()))) if texts else 0
+        doc_lengths = np.zeros(count, dtype=np.float64)
+        token_lists, doc_lists, weight_lists = [], [], []
+        for col, weight in self.fields.items():
+            tokens = pd.Series(texts[col], dtype=object).str.lower().str.findall(_TOKEN_PATTERN)
+            counts = tokens.str.len().to_numpy(dtype=np.int64)
+            doc_lengths += counts * weight
+            token_lists.append(list(chain.from_iterable(tokens.tolist())))
+            doc_lists.append(np.repeat(np.arange(start, start + count, dtype=np.int64), counts))
+            weight_lists.append(np.full(int(counts.sum()), weight, dtype=np.float64))
+        return (doc_lengths, list(chain.from_iterable(token_lists)),
+                np.concatenate(doc_lists), np.concatenate(weight_lists))
+
+    def _merge_occurrences(self, term_codes, docs, weights):
+        """One weighted term frequency per (term, doc), sorted by term then doc"""
+        keys, inverse = np.unique(term_codes * self.size + docs, return_inverse=True)
+        term_freqs = np.bincount(inverse.ravel(), weights=weights).astype(np.float32)
+        return keys // max(self.size, 1), (keys % max(self.size, 1)).astype(np.int32), term_freqs
+
+    def _compute_impacts(self, posting_terms):
+        """BM25 impact of every posting from the current collection statistics"""
+        doc_freqs = np.diff(self.offsets)
+        self.idf = np.log1p((self.size - doc_freqs + 0.5) / (doc_freqs + 0.5))
+        avg_length = self.doc_lengths.mean() if self.size else 1.0
+        term_freqs = self.term_freqs.astype(np.float64)
+        norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[self.doc_ids] / (avg_length or 1.0))
+        self.impacts = (self.idf[posting_terms] * term_freqs * (self.k1 + 1) / (term_freqs + norm)).astype(np.float32)
+
+    def _postings(self, term_id):
+        start, stop = self.offsets[term_id], self.offsets[term_id + 1]
+        return self.doc_ids[start:stop], self.impacts[start:stop]
+
+    def _expand_prefix(self, prefix):
+        """Vocabulary terms starting with prefix, most frequent first"""
+        start = bisect_left(self.vocabulary, prefix)
+        stop = bisect_left(self.vocabulary, prefix + '\U0010ffff')
+        term_ids = np.arange(start, stop)
+        if len(term_ids) > self.MAX_PREFIX_EXPANSIONS:
+            doc_freqs = self.offsets[term_ids + 1] - self.offsets[term_ids]
+            term_ids = term_ids[top_k_indices(doc_freqs, self.MAX_PREFIX_EXPANSIONS)]
+        return term_ids.tolist()
+
+    def _parse(self, query):
+        """Split a query into phrases and term groups of (term_id, weight) alternatives"""
+        phrases = [tokenize(phrase) for phrase in _PHRASE_RE.findall(query)]
+        phrases = [phrase for phrase in phrases if phrase]
+        words = re.findall(r'\w+\*?', _PHRASE_RE.sub(' ', query).lower())
+        # Search-as-you-type: a last word not followed by a space or quote also matches as a prefix
+        open_ended = not query[-1:].isspace() and not query.endswith('"')
+
+        groups = [[(self.term_ids.get(term), 1.0)] for phrase in phrases for term in phrase]
+        for i, word in enumerate(words):
+            is_prefix = word.endswith('*') or (open_ended and i == len(words) - 1)
+            word = word.rstrip('*')
+            group = [(self.term_ids.get(word), 1.0)]
+            if is_prefix:
+                group += [(term_id, self.PREFIX_WEIGHT) for term_id in self._expand_prefix(word)
+                          if self.vocabulary[term_id] != word]
+            groups.append(group)
+        groups = [[(term_id, weight) for term_id, weight in group if term_id is not None] for group in groups]
+        return phrases, groups
+
+    def _group_size(self, group):
+        return sum(self.offsets[term_id + 1] - self.offsets[term_id] for term_id, _ in group)
+
+    def _score_group(self, group):
+        """Union of a group's posting lists with summed impacts"""
+        doc_lists, impact_lists = [], []
+        for term_id, weight in group:
+            docs, impacts = self._postings(term_id)
+            doc_lists.append(docs)
+            impact_lists.append(impacts * weight)
+        unique_docs, inverse = np.unique(np.concatenate(doc_lists), return_inverse=True)
+        scores = np.bincount(inverse.ravel(), weights=np.concatenate(impact_lists), minlength=len(unique_docs))
+        return unique_docs, scores
+
+    def _probe_group(self, group, candidates):
+        """Impacts of a group at the given sorted candidates, and which candidates matched"""
+        scores = np.zeros(len(candidates), dtype=np.float64)
+        matched = np.zeros(len(candidates), dtype=bool)
+        for term_id, weight in group:
+            docs, impacts = self._postings(term_id)
+            idx = np.minimum(np.searchsorted(docs, candidates), max(len(docs) - 1, 0))
+            hit = docs[idx] == candidates if len(docs) else np.zeros(len(candidates), dtype=bool)
+            scores[hit] += impacts[idx[hit]] * weight
+            matched |= hit
+        return scores, matched
+
+    def _matches_phrase(self, position, phrase):
+        pattern = r'\b' + r'\W+'.join(re.escape(token) for token in phrase) + r'\b'
+        return any(re.search(pattern, texts[position], flags=re.IGNORECASE) for texts in self.texts.values())
+
+    def search(self, query, k=20):
+        """Return (row positions, BM25 scores) of the k best documents matching every query term"""
+        phrases, groups = self._parse(query)
+        empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))
+        if not groups or any(not group for group in groups):
+            return empty
+
+        groups.sort(key=self._group_size)
+        candidates, scores = self._score_group(groups[0])
+        for group in groups[1:]:
+            group_scores, matched = self._probe_group(group, candidates)
+            candidates, scores = candidates[matched], scores[matched] + group_scores[matched]
+            if len(candidates) == 0:
+                return empty
+
+        if not phrases:
+            top = top_k_indices(scores, k)
+            return candidates[top].astype(np.int64), scores[top]
+
+        # Verify phrases in score order and stop once k documents are confirmed
+        order = top_k_indices(scores, len(scores))
+        confirmed = []
+        for i in order.tolist():
+            if all(self._matches_phrase(int(candidates[i]), phrase) for phrase in phrases):
+                confirmed.append(i)
+                if len(confirmed) == k:
+                    break
+        confirmed = np.asarray(confirmed, dtype=np.int64)
+        return candidates[confirmed].astype(np.int64), scores[confirmed]
@@ -0,0 +1,136 @@
+import json
+import time
+
+import numpy as np
+import pandas as pd
+from flask.json.provider import DefaultJSONProvider
+
+from utils.metrics import STAGE_SECONDS
+
+try:
+    import orjson
+except ImportError:  # Optional faster encoder
+    orjson = None
+
+
+def dumps(payload):
+    """Encode a payload as JSON text, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':'), default=_json_default)
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes responses with orjson when available"""
+
+    def dumps(self, obj, **kwargs):
+        start_time = time.perf_counter()
+        try:
+            if orjson is None:
+                kwargs.setdefault('default', _json_default)
+                return super().dumps(obj, **kwargs)
+            try:
+                return dumps(obj)
+            except TypeError:
+                # Fall back for types only Flask's provider knows how to encode
+                return super().dumps(obj, **kwargs)
+        finally:
+            STAGE_SECONDS.observe(time.perf_counter() - start_time, 'http', 'json')
+
+
+def string_values(df, columns, default=''):
+    """Object array of str() values from the first existing column"""
+    for col in columns:
+        if col in df.columns:
+            # str() keeps existing str objects shared and renders missing values as 'nan'
+            return np.array([str(value) for value in df[col].tolist()], dtype=object)
+    return np.full(len(df), default, dtype=object)
+
+
+def float_values(df, col):
+    """Contiguous float64 array of a numeric column (zeros when missing)"""
+    if col not in df.columns:
+        return np.zeros(len(df))
+    return pd.to_numeric(df[col], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+
+
+def nullable_int_list(values):
+    """Python ints for a float array, with None in place of NaN"""
+    values = np.asarray(values, dtype=np.float64)
+    missing = np.isnan(values)
+    result = np.where(missing, 0, values).astype(np.int64).tolist()
+    for i in np.flatnonzero(missing):
+        result[i] = None
+    return result
+
+
+def truncate_list(values, length, suffix=''):
+    """Truncate each string, appending suffix to the ones that were cut"""
+    return [value[:length] + suffix if len(value) > length else value for value in values]
+
+
+def catalog_ids(df):
+    """TMDB ids of a catalog as int64, 0 where missing"""
+    if 'id' not in df.columns:
+        return np.zeros(len(df), dtype=np.int64)
+    return pd.to_numeric(df['id'], errors='coerce').fillna(0).to_numpy(dtype=np.int64)
+
+
+def zip_records(columns):
+    """Build a list of row dicts from equally long column lists"""
+    keys = list(columns)
+    return [dict(zip(keys, row)) for row in zip(*columns.values())]
+
+
+class CatalogSerializer:
+    """
+    Column-wise serializer for one catalog.
+
+    Every response field is extracted once into a contiguous array, so turning
+    a set of row positions into response dicts is a gather per column rather
+    than per-cell lookups on DataFrame rows.
+    """
+
+    def __init__(self, df):
+        self.ids = catalog_ids(df)
+        self.titles = string_values(df, ['title', 'name'], default='Unknown')
+        self.overviews = string_values(df, ['overview'])
+        self.vote_averages = float_values(df, 'vote_average')
+        self.release_dates = string_values(df, ['release_date', 'first_air_date'])
+        self.poster_paths = string_values(df, ['poster_path'])
+        self.genres = string_values(df, ['genres'])
+        self.popularity = float_values(df, 'popularity')
+
+    def extended(self, df):
+        """Serializer for this catalog with the rows of df appended"""
+        added = CatalogSerializer(df)
+        combined = CatalogSerializer.__new__(CatalogSerializer)
+        for name, values in vars(self).items():
+            setattr(combined, name, np.concatenate([values, getattr(added, name)]))
+        return combined
+
+    def records(self, positions, overview_length=200, scores=None, detailed=False):
+        """Response dicts for the given catalog row positions, in order"""
+        positions = np.asarray(positions, dtype=np.int64)
+        columns = {
+            'id': self.ids[positions].tolist(),
+            'title': self.titles[positions].tolist(),
+            'overview': [text[:overview_length] for text in self.overviews[positions].tolist()],
+            'vote_average': self.vote_averages[positions].tolist(),
+            'release_date': self.release_dates[positions].tolist(),
+            'poster_path': self.poster_paths[positions].tolist()
+        }
+        if detailed:
+            columns['genres'] = self.genres[positions].tolist()
+            columns['popularity'] = self.popularity[positions].tolist()
+        if scores is not None:
+            columns['score'] = np.asarray(scores, dtype=np.float64).tolist()
+        return zip_records(columns)
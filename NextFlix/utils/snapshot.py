@@ -0,0 +1,205 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+from datetime import datetime
+
+import numpy as np
+
+from utils.columnar import ColumnarStore
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the on-disk layout changes so stale snapshots are rebuilt
+SNAPSHOT_FORMAT_VERSION = 3
+
+
+class ModelSnapshot:
+    """
+    Versioned on-disk snapshot of a fitted recommendation model.
+
+    Each build is written to its own directory, named by fingerprint and
+    build time, and published by atomically replacing the CURRENT pointer
+    file. A published directory is never rewritten in place, so workers that
+    are starting up never observe a half-written or missing snapshot, even
+    when a build republishes the same fingerprint. Catalog frames are
+    kept in a columnar store so callers read only the columns they serve, and
+    numeric arrays are stored as .npy files memory-mapped read-only on load.
+    """
+
+    def __init__(self, snapshot_dir):
+        self.snapshot_dir = snapshot_dir
+        self.pointer_path = os.path.join(snapshot_dir, 'CURRENT')
+        self.cold_start_path = os.path.join(snapshot_dir, 'cold_start.json')
+
+    @staticmethod
+    def hash_file(path, block_size=1 << 20):
+        """Compute the sha256 content hash of a file in fixed-size blocks"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def describe_sources(self, source_paths):
+        """Describe source files by size, mtime and content hash"""
+        # Reuse hashes recorded by the current snapshot when size and mtime
+        # are unchanged, so startup does not re-read multi-GB CSVs
+        known = {}
+        manifest = self.read_manifest()
+        if manifest:
+            known = {s['path']: s for s in manifest.get('sources', [])}
+
+        sources = []
+        for path in source_paths:
+            path = os.path.abspath(path)
+            stat = os.stat(path)
+            previous = known.get(path)
+            if previous and previous['size'] == stat.st_size and previous['mtime'] == stat.st_mtime:
+                content_hash = previous['sha256']
+            else:
+                content_hash = self.hash_file(path)
+            sources.append({
+                'path': path,
+                'size': stat.st_size,
+                'mtime': stat.st_mtime,
+                'sha256': content_hash
+            })
+        return sources
+
+    @staticmethod
+    def fingerprint(sources, params):
+        """Fingerprint the source contents together with the model parameters"""
+        payload = {
+            'format_version': SNAPSHOT_FORMAT_VERSION,
+            'sources': sorted(s['sha256'] for s in sources),
+            'params': params
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+
+    def current_name(self):
+        """Return the directory name CURRENT points at, if any"""
+        try:
+            with open(self.pointer_path, 'r', encoding='utf-8') as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def current_dir(self):
+        """Return the directory of the published snapshot, if any"""
+        name = self.current_name()
+        if name is None:
+            return None
+        path = os.path.join(self.snapshot_dir, name)
+        return path if os.path.isdir(path) else None
+
+    def read_manifest(self, path=None):
+        """Read the manifest of the published snapshot, or of the snapshot directory given"""
+        path = path or self.current_dir()
+        if path is None:
+            return None
+        try:
+            with open(os.path.join(path, 'manifest.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_valid(self, fingerprint):
+        """Check whether the published snapshot matches the given fingerprint"""
+        manifest = self.read_manifest()
+        return bool(
+            manifest and
+            manifest.get('format_version') == SNAPSHOT_FORMAT_VERSION and
+            manifest.get('fingerprint') == fingerprint
+        )
+
+    def save(self, fingerprint, sources, params, frames, arrays, meta=None):
+        """Write a new snapshot and publish it as current"""
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        previous = self.current_name()
+        name = f"{fingerprint[:16]}-{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+        final_dir = os.path.join(self.snapshot_dir, name)
+        build_dir = os.path.join(self.snapshot_dir, f'.build-{name}-{os.getpid()}')
+        shutil.rmtree(build_dir, ignore_errors=True)
+        os.makedirs(build_dir)
+
+        for frame_name, df in frames.items():
+            ColumnarStore(os.path.join(build_dir, frame_name)).write(df)
+
+        array_entries = {}
+        for array_name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            np.save(os.path.join(build_dir, f'{array_name}.npy'), array)
+            array_entries[array_name] = {'shape': list(array.shape), 'dtype': str(array.dtype)}
+
+        manifest = {
+            'format_version': SNAPSHOT_FORMAT_VERSION,
+            'fingerprint': fingerprint,
+            'created_at': datetime.now().isoformat(),
+            'sources': sources,
+            'params': params,
+            'frames': sorted(frames),
+            'arrays': array_entries,
+            'meta': meta or {}
+        }
+        with open(os.path.join(build_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, default=str)
+
+        os.replace(build_dir, final_dir)
+
+        # Atomically publish the new snapshot
+        pointer_tmp = f'{self.pointer_path}.{os.getpid()}.tmp'
+        with open(pointer_tmp, 'w', encoding='utf-8') as f:
+            f.write(name)
+        os.replace(pointer_tmp, self.pointer_path)
+
+        # The previous build stays for workers that resolved CURRENT just before the switch
+        self._prune(keep={name, previous})
+        logger.info(f"💾 Model snapshot {name} written to {self.snapshot_dir}")
+        return final_dir
+
+    def save_cold_start(self, payload):
+        """Atomically write the small real-data payload served while the model loads"""
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        tmp_path = f'{self.cold_start_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(',', ':'), default=str)
+        os.replace(tmp_path, self.cold_start_path)
+        return self.cold_start_path
+
+    def load_cold_start(self):
+        """Read the cold-start payload, or None if it has not been built"""
+        try:
+            with open(self.cold_start_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def load(self, mmap=True, columns=None):
+        """Load the published snapshot, memory-mapping its arrays and numeric catalog columns"""
+        # Resolve CURRENT once, so a publish in between cannot mix two snapshots
+        path = self.current_dir()
+        manifest = self.read_manifest(path) if path is not None else None
+        if manifest is None:
+            raise FileNotFoundError(f"No model snapshot found in {self.snapshot_dir}")
+
+        columns = columns or {}
+        frames = {
+            name: ColumnarStore(os.path.join(path, name)).read(columns.get(name), mmap=mmap)
+            for name in manifest['frames']
+        }
+        mmap_mode = 'r' if mmap else None
+        arrays = {
+            name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mmap_mode)
+            for name in manifest['arrays']
+        }
+        return {'manifest': manifest, 'frames': frames, 'arrays': arrays, 'meta': manifest.get('meta', {})}
+
+    def _prune(self, keep):
+        """Remove superseded snapshot directories"""
+        for entry in os.listdir(self.snapshot_dir):
+            path = os.path.join(self.snapshot_dir, entry)
+            if entry not in keep and not entry.startswith('.') and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,234 @@
+import os
+import json
+
+import numpy as np
+import pandas as pd
+
+# Genre frequencies roughly follow the TMDB dumps: a long tail behind drama and comedy
+MOVIE_GENRES = {
+    'Drama': 0.20, 'Comedy': 0.14, 'Documentary': 0.10, 'Thriller': 0.07, 'Action': 0.07,
+    'Horror': 0.07, 'Romance': 0.06, 'Crime': 0.04, 'Animation': 0.04, 'Adventure': 0.03,
+    'Family': 0.03, 'Science Fiction': 0.03, 'Fantasy': 0.03, 'Mystery': 0.02, 'Music': 0.02,
+    'History': 0.015, 'War': 0.01, 'TV Movie': 0.01, 'Western': 0.005
+}
+TV_GENRES = {
+    'Drama': 0.22, 'Comedy': 0.16, 'Documentary': 0.10, 'Animation': 0.08, 'Reality': 0.07,
+    'Crime': 0.06, 'Action & Adventure': 0.06, 'Sci-Fi & Fantasy': 0.05, 'Mystery': 0.04,
+    'Family': 0.04, 'Kids': 0.04, 'Talk': 0.03, 'News': 0.02, 'Soap': 0.015,
+    'War & Politics': 0.01, 'Western': 0.005
+}
+# original_language: (share, spoken language, production country)
+LANGUAGES = {
+    'en': (0.55, 'English', 'United States of America'), 'fr': (0.07, 'French', 'France'),
+    'es': (0.07, 'Spanish', 'Spain'), 'ja': (0.06, 'Japanese', 'Japan'),
+    'de': (0.05, 'German', 'Germany'), 'it': (0.04, 'Italian', 'Italy'),
+    'ko': (0.04, 'Korean', 'South Korea'), 'zh': (0.04, 'Mandarin', 'China'),
+    'hi': (0.03, 'Hindi', 'India'), 'ru': (0.03, 'Russian', 'Russia'),
+    'pt': (0.02, 'Portuguese', 'Brazil')
+}
+# Words every genre draws from, most frequent first (sampled with Zipf-like weights)
+COMMON_WORDS = (
+    'life world new young man woman family story love find home years day friends time must way '
+    'city back father mother son daughter journey school help past town secret night war team '
+    'after lives small house brother sister girl boy together own discover group fight death '
+    'first dream return mysterious old best local husband wife begins save power true real '
+    'future lost island career chance heart wild road summer truth trouble hidden final'
+).split()
+TOPIC_WORDS = {
+    'Drama': 'struggle grief marriage illness memory betrayal ambition poverty redemption loss',
+    'Comedy': 'hilarious wedding awkward misadventure roommate prank party chaos quirky blunder',
+    'Documentary': 'footage interviews archival history investigation nature filmmaker portrait real events',
+    'Thriller': 'conspiracy hostage stalker ransom suspect pursuit deadly paranoia kidnapping escape',
+    'Action': 'mercenary explosion heist commando chase assassin rescue mission weapons showdown',
+    'Horror': 'haunted demon possession curse slasher ritual zombie nightmare evil terror',
+    'Romance': 'romance lovers passion affair longing soulmate courtship kiss heartbreak wedding',
+    'Crime': 'detective gangster mafia robbery cartel murder police heist corruption investigation',
+    'Animation': 'animated talking creatures magical adventure kingdom cartoon friendship quest colorful',
+    'Adventure': 'expedition treasure jungle voyage explorer quest ancient map wilderness discovery',
+    'Family': 'kids parents holiday puppy grandparents siblings christmas camp pet adventure',
+    'Science Fiction': 'spaceship alien planet android galaxy future robots dystopia experiment clone',
+    'Fantasy': 'wizard dragon sorcery kingdom enchanted prophecy elves sword magic realm',
+    'Mystery': 'clues disappearance detective riddle suspect secret unsolved whodunit manor evidence',
+    'Music': 'band concert singer musician album tour rock jazz stage songwriter',
+    'History': 'empire revolution king queen dynasty century historical battle ancient reign',
+    'War': 'soldiers battle army trenches platoon invasion resistance wartime frontline general',
+    'TV Movie': 'holiday hometown bakery inn festival christmas romance small town reunion',
+    'Western': 'cowboy sheriff outlaw ranch frontier gunslinger saloon desert bounty cattle',
+    'Reality': 'contestants competition challenge elimination judges makeover cameras real lives',
+    'Action & Adventure': 'mission agents chase explosion rescue hero danger expedition villain team',
+    'Sci-Fi & Fantasy': 'alien spaceship magic portal dimension future superpowers galaxy realm clone',
+    'Kids': 'cartoon friends school puppy playground learning songs adventure animals toys',
+    'Talk': 'host guests celebrity interviews late night comedy topics panel audience',
+    'News': 'anchors headlines journalists reports politics breaking coverage current affairs',
+    'Soap': 'affair scandal dynasty betrayal rivalry wealthy twins amnesia secrets romance',
+    'War & Politics': 'president campaign government soldiers war election diplomacy power senate'
+}
+TOPIC_WORDS = {genre: words.split() for genre, words in TOPIC_WORDS.items()}
+FIRST_NAMES = ('James Maria Wei Aiko Carlos Fatima Olga Luca Priya Ji-woo Pierre Hannah Diego '
+               'Amara Kenji Sofia Ivan Chloe Rahul Elena').split()
+LAST_NAMES = ('Smith Garcia Chen Tanaka Silva Khan Ivanova Rossi Sharma Kim Dubois Muller Lopez '
+              'Okafor Sato Costa Petrov Martin Gupta Novak').split()
+TV_RUNTIMES = [22, 25, 30, 42, 45, 50, 60]
+
+
+class SyntheticCatalog:
+    """
+    Deterministic TMDB-like movie and TV datasets of any size.
+
+    Rows follow the schema of the TMDB dumps the app reads. Genres, languages
+    and release years are drawn from skewed real-world shares, vote counts are
+    heavy-tailed with many unrated titles, and overviews mix Zipf-weighted
+    common words with topic words of each title's main genre, so TF-IDF and
+    quality sampling behave much as on the real data. Rows are generated in
+    fixed-size chunks, each with its own seed, so the output depends only on
+    the row counts and seed and writing a million rows stays within a few
+    hundred MB.
+    """
+
+    MOVIE_FILE = 'TMDB_all_movies.csv'
+    TV_FILE = 'TMDB_tv_dataset_v3.csv'
+    MANIFEST_FILE = 'synthetic_catalog.json'
+    CHUNK_ROWS = 50000
+    MAX_OVERVIEW_WORDS = 80
+
+    def __init__(self, n_movies=10000, n_tv=5000, seed=42):
+        self.n_movies = n_movies
+        self.n_tv = n_tv
+        self.seed = seed
+
+    def params(self):
+        return {'n_movies': self.n_movies, 'n_tv': self.n_tv, 'seed': self.seed}
+
+    def write(self, data_dir):
+        """Write both datasets, unless data_dir already holds this exact catalog"""
+        os.makedirs(data_dir, exist_ok=True)
+        movies_path = os.path.join(data_dir, self.MOVIE_FILE)
+        tv_path = os.path.join(data_dir, self.TV_FILE)
+        manifest_path = os.path.join(data_dir, self.MANIFEST_FILE)
+        if os.path.exists(manifest_path) and os.path.exists(movies_path) and os.path.exists(tv_path):
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                if json.load(f) == self.params():
+                    return movies_path, tv_path
+            os.remove(manifest_path)
+
+        for content_type, path in (('movie', movies_path), ('tv', tv_path)):
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                for i, chunk in enumerate(self.chunks(content_type)):
+                    chunk.to_csv(f, header=i == 0, index=False)
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(self.params(), f)
+        return movies_path, tv_path
+
+    def chunks(self, content_type):
+        """Yield the rows of one dataset as DataFrames of at most CHUNK_ROWS rows"""
+        total = self.n_movies if content_type == 'movie' else self.n_tv
+        for index, start in enumerate(range(0, total, self.CHUNK_ROWS)):
+            rng = np.random.default_rng([self.seed, 0 if content_type == 'movie' else 1, index])
+            yield self._chunk(content_type, start, min(self.CHUNK_ROWS, total - start), rng)
+
+    def _chunk(self, content_type, start, n, rng):
+        is_movie = content_type == 'movie'
+        genre_shares = MOVIE_GENRES if is_movie else TV_GENRES
+        genre_names = np.array(list(genre_shares))
+        genre_weights = np.array(list(genre_shares.values()))
+        genre_weights = genre_weights / genre_weights.sum()
+
+        # One to four genres per title, the first being the main one
+        n_genres = rng.choice([1, 2, 3, 4], size=n, p=[0.35, 0.35, 0.2, 0.1])
+        genre_draws = rng.choice(len(genre_names), size=(n, 4), p=genre_weights)
+        genres = [', '.join(dict.fromkeys(genre_names[row[:k]])) for row, k in zip(genre_draws, n_genres)]
+        main_genres = genre_names[genre_draws[:, 0]]
+
+        codes = list(LANGUAGES)
+        language_weights = np.array([LANGUAGES[code][0] for code in codes])
+        languages = np.array(codes)[rng.choice(len(codes), size=n, p=language_weights / language_weights.sum())]
+
+        # Release years skew recent, like the catalogs
+        years = np.arange(1920, 2025)
+        year_weights = np.exp((years - years[-1]) / 25.0)
+        dates = pd.to_datetime({
+            'year': rng.choice(years, size=n, p=year_weights / year_weights.sum()),
+            'month': rng.integers(1, 13, size=n),
+            'day': rng.integers(1, 29, size=n)
+        }).dt.strftime('%Y-%m-%d').to_numpy(dtype=object)
+        dates[rng.random(n) < 0.02] = None
+
+        # Heavy-tailed votes: most titles have a handful, a few have thousands
+        vote_count = np.floor(rng.lognormal(2.5, 2.0, size=n)).astype(np.int64)
+        vote_count[rng.random(n) < 0.3] = 0
+        vote_average = np.clip(rng.normal(6.2, 1.3, size=n), 0, 10).round(1)
+        vote_average[vote_count == 0] = 0.0
+        popularity = (rng.lognormal(0.5, 1.2, size=n) + 0.01 * np.sqrt(vote_count)).round(3)
+
+        overviews = self._overviews(main_genres, n, rng)
+        overviews[rng.random(n) < 0.03] = None
+        titles = self._titles(main_genres, n, rng)
+
+        ids = np.arange(start + 1, start + n + 1) + (0 if is_movie else 10_000_000)
+        df = pd.DataFrame({'id': ids, 'title' if is_movie else 'name': titles})
+        df['vote_average'] = vote_average
+        df['vote_count'] = vote_count
+        df['release_date' if is_movie else 'first_air_date'] = dates
+        if is_movie:
+            runtime = np.clip(rng.normal(98, 22, size=n), 1, 300).round().astype(np.int64)
+            runtime[rng.random(n) < 0.05] = 0
+            df['runtime'] = runtime
+        else:
+            df['number_of_seasons'] = np.minimum(rng.geometric(0.45, size=n), 40)
+            df['number_of_episodes'] = df['number_of_seasons'] * rng.integers(4, 24, size=n)
+            df['episode_run_time'] = rng.choice(TV_RUNTIMES, size=n)
+        df['adult'] = rng.random(n) < 0.005
+        df['original_language'] = languages
+        df['overview'] = overviews
+        df['popularity'] = popularity
+        df['genres'] = genres
+        df['production_countries'] = [LANGUAGES[code][2] for code in languages]
+        df['spoken_languages'] = [LANGUAGES[code][1] for code in languages]
+        if is_movie:
+            df['cast'] = self._names(rng, n, per_row=5)
+            df['director'] = self._names(rng, n)
+            imdb_rating = np.clip(vote_average + rng.normal(0, 0.5, size=n), 1, 10).round(1)
+            imdb_rating[rng.random(n) < 0.3] = np.nan
+            df['imdb_rating'] = imdb_rating
+        posters = np.array([f'/synthetic{content_type}{i}.jpg' for i in ids], dtype=object)
+        posters[rng.random(n) < 0.1] = None
+        df['poster_path'] = posters
+        return df
+
+    def _overviews(self, main_genres, n, rng):
+        """Overviews mixing common words with topic words of the main genre"""
+        lengths = np.clip(rng.normal(35, 12, size=n), 5, self.MAX_OVERVIEW_WORDS).astype(int)
+        words = self._words(main_genres, self.MAX_OVERVIEW_WORDS, 0.35, rng)
+        overviews = np.empty(n, dtype=object)
+        overviews[:] = [' '.join(row[:length]).capitalize() + '.' for row, length in zip(words, lengths)]
+        return overviews
+
+    def _titles(self, main_genres, n, rng):
+        """One to four title-cased words, half of them genre topic words"""
+        lengths = rng.choice([1, 2, 3, 4], size=n, p=[0.2, 0.4, 0.3, 0.1])
+        words = self._words(main_genres, 4, 0.5, rng)
+        return [' '.join(row[:length]).title() for row, length in zip(words, lengths)]
+
+    def _words(self, main_genres, width, topic_share, rng):
+        """A (rows, width) array of Zipf-weighted common words, topic_share of them from the row's genre"""
+        common = np.array(COMMON_WORDS, dtype=object)
+        common_weights = 1.0 / np.arange(1, len(common) + 1)
+        words = common[rng.choice(len(common), size=(len(main_genres), width), p=common_weights / common_weights.sum())]
+        is_topic = rng.random(words.shape) < topic_share
+        for genre in np.unique(main_genres):
+            rows = np.flatnonzero(main_genres == genre)
+            topic = np.array(TOPIC_WORDS[genre], dtype=object)
+            block = words[rows]
+            mask = is_topic[rows]
+            block[mask] = topic[rng.integers(0, len(topic), size=int(mask.sum()))]
+            words[rows] = block
+        return words
+
+    def _names(self, rng, n, per_row=1):
+        """n random person names, or n comma-separated lists of one to per_row names"""
+        names = (np.array(FIRST_NAMES, dtype=object)[rng.integers(0, len(FIRST_NAMES), size=(n, per_row))] + ' ' +
+                 np.array(LAST_NAMES, dtype=object)[rng.integers(0, len(LAST_NAMES), size=(n, per_row))])
+        if per_row == 1:
+            return names[:, 0]
+        counts = rng.integers(2, per_row + 1, size=n)
+        return [', '.join(row[:count]) for row, count in zip(names, counts)]
@@ -0,0 +1,117 @@
+import numpy as np
+
+from utils.scoring import top_k_indices
+from utils.serialize import dumps
+
+
+class TrendingRankings:
+    """
+    Materialized trending rankings for one catalog.
+
+    The catalog never changes between reloads, so the trending order is
+    computed once, overall and per genre, as arrays of row positions. Response
+    records and their JSON encoding are built once per (genre, limit) and then
+    served by lookup. Only genres the catalog holds get memo entries; every
+    unknown genre shares one empty entry, so clients cannot grow the memo.
+    """
+
+    DEFAULT_LIMIT = 24
+    # Memo key shared by every genre the catalog does not hold
+    UNKNOWN_GENRE = object()
+
+    def __init__(self, order, genre_orders, serializer, max_items=200, min_vote_average=5.0, min_vote_count=100):
+        self.order = order
+        self.genre_orders = genre_orders
+        self.serializer = serializer
+        self.max_items = max_items
+        self.min_vote_average = min_vote_average
+        self.min_vote_count = min_vote_count
+        self._records = {}
+        self._payloads = {}
+
+    @classmethod
+    def build(cls, df, serializer, filter_index=None, max_items=200, min_vote_average=5.0, min_vote_count=100):
+        """Rank eligible rows by a blend of rating and log vote count"""
+        rankings = cls(None, {}, serializer, max_items, min_vote_average, min_vote_count)
+        ranked = rankings._rank(df, np.arange(len(df)))
+
+        if filter_index is not None:
+            for genre, bitset in filter_index.genre_bitsets.items():
+                in_genre = np.unpackbits(bitset, count=filter_index.size).astype(bool)
+                rankings.genre_orders[genre] = ranked[in_genre[ranked]][:max_items]
+
+        rankings.order = ranked[:max_items]
+        rankings._prebuild()
+        return rankings
+
+    def extended(self, df, serializer, filter_index, start):
+        """
+        Rankings after rows start, start + 1, ... were appended to the catalog.
+
+        Only the kept top items and the new rows can rank in the new top, so
+        they are the only ones re-ranked (in catalog order, so ties break as
+        in a full build).
+        """
+        new_rows = np.arange(start, len(df))
+        ranked_new = self._rank(df, new_rows)
+        rankings = TrendingRankings(
+            self._rank(df, np.sort(np.concatenate([self.order, ranked_new])))[:self.max_items], {}, serializer,
+            self.max_items, self.min_vote_average, self.min_vote_count
+        )
+        for genre, bitset in filter_index.genre_bitsets.items():
+            in_genre = np.unpackbits(bitset, count=filter_index.size).astype(bool)
+            candidates = np.concatenate([self.genre_orders.get(genre, new_rows[:0]), ranked_new[in_genre[ranked_new]]])
+            rankings.genre_orders[genre] = self._rank(df, np.sort(candidates))[:self.max_items]
+        rankings._prebuild()
+        return rankings
+
+    def _rank(self, df, positions):
+        """Eligible positions ordered by trending score"""
+        vote_average = df['vote_average'].to_numpy(dtype=np.float64)[positions]
+        vote_count = df['vote_count'].to_numpy(dtype=np.float64)[positions]
+        eligible = (vote_average >= self.min_vote_average) & (vote_count >= self.min_vote_count)
+        trending_score = vote_average[eligible] * 0.7 + np.log1p(vote_count[eligible]) * 0.3
+        return positions[eligible][top_k_indices(trending_score, int(eligible.sum()))]
+
+    def _prebuild(self):
+        """Encode the default payloads up front"""
+        for genre in [None, *self.genre_orders]:
+            self.payload(self.DEFAULT_LIMIT, genre)
+
+    @property
+    def genres(self):
+        return sorted(self.genre_orders)
+
+    def positions(self, limit, genre=None):
+        """Catalog row positions of the top trending items"""
+        if genre:
+            order = self.genre_orders.get(genre.strip().lower(), self.order[:0])
+        else:
+            order = self.order
+        return order[:max(0, min(int(limit), self.max_items))]
+
+    def _memo_key(self, limit, genre):
+        """Bounded memo key: a known genre (or '') and the limit capped at the ranking length"""
+        genre = (genre or '').strip().lower()
+        if genre and genre not in self.genre_orders:
+            return self.UNKNOWN_GENRE
+        return genre, max(0, min(int(limit), self.max_items))
+
+    def records(self, limit, genre=None):
+        """Response records of the top trending items"""
+        key = self._memo_key(limit, genre)
+        records = self._records.get(key)
+        if records is None:
+            records = self.serializer.records(self.positions(limit, genre))
+            self._records[key] = records
+        return records
+
+    def payload(self, limit, genre=None):
+        """JSON text of the trending records and their count"""
+        key = self._memo_key(limit, genre)
+        payload = self._payloads.get(key)
+        if payload is None:
+            records = self.records(limit, genre)
+            payload = (dumps(records), len(records))
+            self._payloads[key] = payload
+        return payload